@@ -0,0 +1,12 @@
+# benchmarks/__init__.py
+"""Offline benchmark suite running the sniper against a local WSP stand-in.
+
+Settings are validated on import, so placeholder credentials are provided
+here before any benchmark module pulls in ``config.settings``.
+"""
+
+import os
+
+os.environ.setdefault("WSP_BASE_URL", "http://127.0.0.1/api")
+os.environ.setdefault("WSP_USERNAME", "benchmark")
+os.environ.setdefault("WSP_PASSWORD", "benchmark")
@@ -0,0 +1,183 @@
+"""Effect of the critical section on wake-up jitter and attempt latency.
+
+Usage::
+
+    uv run python -m benchmarks.critical --cpu 2 --nice -5
+
+Keeps a large heap of long-lived objects alive and a background task
+producing cyclic garbage, as a loaded application would, then measures for
+each configuration (default, critical section, critical section on uvloop
+when installed):
+
+- the wake-up error of ``HybridWaiter.sleep_until`` on random deadlines;
+- the garbage collections that ran during those waits and their pauses;
+- per-attempt latency percentiles of a sniper run against the stand-in,
+  read from its request trace.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import importlib.util
+import os
+import random
+import tempfile
+import time
+from dataclasses import replace
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.sniper import SCENARIOS, run_benchmark
+from config.settings import settings
+from src.core.critical import CriticalSection, event_loop_factory
+from src.core.report import build_report, load_trace
+from src.core.waiter import HybridWaiter, OvershootStats
+from src.utils.logging import setup_logger
+
+console = Console()
+
+
+def _build_heap(size: int) -> list[dict]:
+    """Long-lived container objects the collector has to traverse."""
+    return [{"id": i, "tags": [i, str(i)]} for i in range(size)]
+
+
+async def _churn(cycles: int) -> None:
+    """Produce reference cycles every millisecond, like parsing and retries."""
+    while True:
+        for _ in range(cycles):
+            node: dict = {}
+            node["self"] = node
+        await asyncio.sleep(0.001)
+
+
+class _GCPauses:
+    """Durations of the garbage collections run while installed."""
+
+    def __init__(self):
+        self.pauses: list[float] = []
+        self._start = 0
+
+    def __enter__(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter_ns()
+        else:
+            self.pauses.append((time.perf_counter_ns() - self._start) / 1e6)
+
+    def __str__(self) -> str:
+        if not self.pauses:
+            return "none"
+        return (
+            f"{len(self.pauses)}, total {sum(self.pauses):.1f}ms, "
+            f"max {max(self.pauses):.2f}ms"
+        )
+
+
+async def measure_wakeups(runs: int) -> tuple[list[float], _GCPauses]:
+    """Collect wake-up errors, in seconds, and the collections during them.
+
+    The waits run inside the critical section if ``WSP_CRITICAL_SECTION``
+    is set.
+    """
+    rng = random.Random(runs)  # noqa: S311
+    waiter = HybridWaiter()
+    await waiter.calibrate()
+    section = CriticalSection.from_settings()
+    if section:
+        section.enter()
+    try:
+        errors = []
+        with _GCPauses() as pauses:
+            for _ in range(runs):
+                delay = rng.uniform(0.02, 0.15)
+                deadline = time.perf_counter_ns() + int(delay * 1e9)
+                errors.append(await waiter.sleep_until(deadline) / 1e9)
+    finally:
+        if section:
+            section.exit()
+    return errors, pauses
+
+
+async def measure(
+    args: argparse.Namespace, critical: bool, trace: str
+) -> tuple[list[float], _GCPauses, dict[str, float]]:
+    """Measure wake-ups and a sniper run with the garbage churn running."""
+    settings.critical_section = critical
+    settings.trace_file = trace
+    churn = asyncio.create_task(_churn(args.cycles))
+    try:
+        errors, pauses = await measure_wakeups(args.runs)
+        scenario = replace(SCENARIOS[args.scenario], subjects=args.subjects)
+        await run_benchmark(args.scenario, scenario, args.lead, args.timeout)
+    finally:
+        churn.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await churn
+    run = load_trace(trace)
+    return errors, pauses, build_report(run).latency_ms if run else {}
+
+
+def main() -> None:
+    """Command line entry point of the critical section benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=60, help="Wake-ups measured.")
+    parser.add_argument("--heap", type=int, default=500_000)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="storm")
+    parser.add_argument("--subjects", type=int, default=20)
+    parser.add_argument("--lead", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--cpu", type=int, help="WSP_CRITICAL_CPU to pin to.")
+    parser.add_argument("--nice", type=int, help="WSP_CRITICAL_NICE to apply.")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    setup_logger(level=args.log_level, log_file="")
+    settings.cache_dir = ""
+    settings.budget_rate = 0.0
+    settings.critical_cpu = args.cpu
+    settings.critical_nice = args.nice
+    heap = _build_heap(args.heap)
+
+    configurations = [("default", False, False), ("critical", True, False)]
+    if importlib.util.find_spec("uvloop"):
+        configurations.append(("critical + uvloop", True, True))
+    else:
+        console.print("[yellow]uvloop is not installed; skipping it.[/yellow]")
+
+    table = Table(
+        title=f"Heap of {len(heap)} objects, {args.cycles} cycles/ms of garbage",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Configuration", style="cyan")
+    table.add_column("Wake-up error")
+    table.add_column("GC pauses")
+    table.add_column("Attempt latency")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, critical, uvloop in configurations:
+            settings.uvloop = uvloop
+            trace = os.path.join(directory, f"{len(table.rows)}.jsonl")
+            errors, pauses, latency = asyncio.run(
+                measure(args, critical, trace), loop_factory=event_loop_factory()
+            )
+            table.add_row(
+                name,
+                str(OvershootStats.from_samples(errors)),
+                str(pauses),
+                ", ".join(f"{p} {v:.1f}ms" for p, v in latency.items()) or "-",
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
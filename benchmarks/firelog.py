@@ -0,0 +1,147 @@
+"""Cost of attempt logging during the fire window, verbose vs buffered.
+
+Usage::
+
+    uv run python -m benchmarks.firelog --scenario storm --runs 3
+
+Runs the sniper benchmark against the local stand-in once per
+``WSP_FIRE_LOG_MODE``, with loguru configured as the CLI does (colorized
+console at INFO, file at DEBUG), and compares dispatch lateness, time to
+success, CPU time and the number of console lines written.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+from dataclasses import replace
+from typing import Literal
+
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.sniper import SCENARIOS, BenchmarkResult, run_benchmark
+from config.settings import settings
+from src.utils.logging import setup_logger
+
+console = Console()
+
+_MODES: tuple[Literal["verbose", "buffered"], ...] = ("verbose", "buffered")
+
+
+class _LineCounter:
+    """Console stream counting the lines written, optionally echoing them."""
+
+    def __init__(self, echo: bool):
+        self.lines = 0
+        self._echo = echo
+
+    def write(self, text: str) -> None:
+        self.lines += text.count("\n")
+        if self._echo and sys.__stderr__:
+            sys.__stderr__.write(text)
+
+    def flush(self) -> None:
+        if self._echo and sys.__stderr__:
+            sys.__stderr__.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _setup_logging(stream: _LineCounter, log_file: str) -> None:
+    """Configure loguru like the CLI, with the console sink on ``stream``."""
+    stderr, sys.stderr = sys.stderr, stream
+    try:
+        setup_logger(level="INFO", log_file=log_file)
+    finally:
+        sys.stderr = stderr
+
+
+def _fmt(values: list[float], fmt: str = ".1f") -> str:
+    if not values:
+        return "-"
+    return f"{statistics.median(values):{fmt}} (max {max(values):{fmt}})"
+
+
+def _lateness_ms(result: BenchmarkResult) -> list[float]:
+    return [
+        s.fired_ms - s.planned_ms
+        for s in result.subjects
+        if s.fired_ms is not None and s.planned_ms is not None
+    ]
+
+
+def main() -> None:
+    """Command line entry point of the fire log benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="storm")
+    parser.add_argument("--subjects", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--lead", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--transport", choices=["aiohttp", "raw"], default="aiohttp")
+    parser.add_argument(
+        "--budget-rate",
+        type=float,
+        default=0.0,
+        help="Override WSP_BUDGET_RATE (0 disables the budget for a denser burst).",
+    )
+    parser.add_argument(
+        "--echo", action="store_true", help="Also print the console log."
+    )
+    args = parser.parse_args()
+
+    settings.transport = args.transport
+    settings.cache_dir = ""
+    settings.trace_file = ""
+    settings.budget_rate = args.budget_rate
+    scenario = replace(SCENARIOS[args.scenario], subjects=args.subjects)
+
+    table = Table(
+        title=(
+            f"Scenario: {args.scenario}, {args.subjects} subjects, {args.runs} run(s)"
+        ),
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Fire log", style="cyan")
+    table.add_column("Lateness (ms)", justify="right")
+    table.add_column("Time to success (ms)", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Client CPU (ms)", justify="right")
+    table.add_column("Process CPU (ms)", justify="right")
+    table.add_column("Console lines", justify="right")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in _MODES:
+            settings.fire_log_mode = mode
+            results: list[BenchmarkResult] = []
+            lines: list[float] = []
+            for run in range(args.runs):
+                stream = _LineCounter(args.echo)
+                _setup_logging(stream, os.path.join(directory, f"{mode}-{run}.log"))
+                results.append(
+                    asyncio.run(
+                        run_benchmark(args.scenario, scenario, args.lead, args.timeout)
+                    )
+                )
+                logger.remove()
+                lines.append(stream.lines)
+            table.add_row(
+                mode,
+                _fmt([t for r in results for t in _lateness_ms(r)], ".2f"),
+                _fmt([t for r in results for t in r.time_to_success_ms]),
+                _fmt([r.total_requests for r in results], ".0f"),
+                _fmt([r.client_cpu_ms for r in results]),
+                _fmt([r.process_cpu_ms for r in results]),
+                _fmt(lines, ".0f"),
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
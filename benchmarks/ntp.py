@@ -0,0 +1,63 @@
+"""Accuracy check of the NTP sampler against local UDP stand-ins.
+
+Usage::
+
+    uv run python -m benchmarks.ntp --offset 0.25
+
+Three stand-ins share the same "true" clock offset: a close, quiet server,
+a farther jittery one and one with a heavily asymmetric path. The report
+shows how far the estimate lands from the truth and whether the truth
+falls inside the reported confidence interval.
+"""
+
+import argparse
+import asyncio
+
+from rich.console import Console
+
+from benchmarks.ntp_stand_in import NTPStandInServer
+from src.core.ntp import AsyncNTPClient, NTPEstimate
+from src.utils.logging import setup_logger
+
+console = Console()
+
+
+async def run_check(offset: float, samples: int) -> NTPEstimate:
+    """Estimate ``offset`` through three stand-in servers."""
+    servers = [
+        await NTPStandInServer(offset, delay=0.002).start(),
+        await NTPStandInServer(offset, delay=0.015, jitter=0.02, seed=3).start(),
+        await NTPStandInServer(offset, delay=0.005, return_delay=0.06).start(),
+    ]
+    try:
+        client = AsyncNTPClient([s.address for s in servers], samples, timeout=1.0)
+        return await client.estimate()
+    finally:
+        for server in servers:
+            server.stop()
+
+
+def main() -> None:
+    """Command line entry point of the NTP accuracy check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offset", type=float, default=0.25)
+    parser.add_argument("--samples", type=int, default=4)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    setup_logger(level=args.log_level, log_file="")
+    estimate = asyncio.run(run_check(args.offset, args.samples))
+
+    deviation = estimate.offset - args.offset
+    inside = abs(deviation) <= estimate.error
+    console.print(
+        f"True offset: {args.offset * 1000:.2f} ms | "
+        f"Estimate: {estimate.offset * 1000:.2f} ± {estimate.error * 1000:.2f} ms | "
+        f"Deviation: [bold]{deviation * 1000:+.2f} ms[/bold] | "
+        f"Within interval: {'[green]yes' if inside else '[red]no'}[/] | "
+        f"Servers used: {len(estimate.servers)}/3 | Samples: {estimate.samples}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Local UDP NTP stand-in with a scriptable clock.
+
+This module provides:
+- NTPStandInServer: answers SNTP requests with a fixed clock offset and an
+  injected, optionally asymmetric, network delay.
+"""
+
+import asyncio
+import random
+import time
+
+from src.core.ntp import NTP_PACKET, to_ntp_timestamp
+
+
+class NTPStandInServer(asyncio.DatagramProtocol):
+    """A stratum-2 NTP server whose clock runs ``offset`` seconds ahead.
+
+    Attributes:
+        offset: Seconds added to the local clock in replies.
+        delay: One-way delay applied before reading the receive timestamp.
+        return_delay: One-way delay applied after the transmit timestamp.
+        jitter: Upper bound of extra random delay added on both legs.
+        port: UDP port the server is bound to, set by ``start()``.
+    """
+
+    def __init__(
+        self,
+        offset: float = 0.0,
+        delay: float = 0.0,
+        return_delay: float | None = None,
+        jitter: float = 0.0,
+        seed: int = 7,
+    ):
+        """Initialize the stand-in without binding a socket."""
+        self.offset = offset
+        self.delay = delay
+        self.return_delay = delay if return_delay is None else return_delay
+        self.jitter = jitter
+        self.port = 0
+        self._rng = random.Random(seed)  # noqa: S311
+        self._transport: asyncio.DatagramTransport | None = None
+
+    @property
+    def address(self) -> str:
+        """Server entry in the ``host:port`` form accepted by AsyncNTPClient."""
+        return f"127.0.0.1:{self.port}"
+
+    def connection_made(self, transport) -> None:
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        asyncio.get_running_loop().create_task(self._reply(data, addr))
+
+    async def _reply(self, data: bytes, addr) -> None:
+        if len(data) < NTP_PACKET.size or self._transport is None:
+            return
+        fields = NTP_PACKET.unpack(data[: NTP_PACKET.size])
+        await asyncio.sleep(self.delay + self._rng.uniform(0, self.jitter))
+        rx = to_ntp_timestamp(time.time() + self.offset)
+        tx = to_ntp_timestamp(time.time() + self.offset)
+        reply = NTP_PACKET.pack(
+            0x24, 2, 6, -20, 0, 0, 0x7F000001, *rx, fields[13], fields[14], *rx, *tx
+        )
+        await asyncio.sleep(self.return_delay + self._rng.uniform(0, self.jitter))
+        self._transport.sendto(reply, addr)
+
+    async def start(self) -> "NTPStandInServer":
+        """Bind to an ephemeral localhost UDP port."""
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=("127.0.0.1", 0))
+        if self._transport is not None:
+            self.port = self._transport.get_extra_info("sockname")[1]
+        return self
+
+    def stop(self) -> None:
+        """Close the socket."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
@@ -0,0 +1,372 @@
+"""End-to-end latency benchmark of the sniper against the local stand-in.
+
+Usage::
+
+    uv run python -m benchmarks.sniper --scenario storm --json bench.json
+
+This module provides:
+- SCENARIOS: named stand-in presets.
+- SubjectResult / BenchmarkResult: measurements of a single run.
+- run_benchmark: arms the client, waits for the target and fires the plan.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field, replace
+
+from loguru import logger
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.stand_in import StandInScenario, WSPStandInServer
+from config.settings import settings
+from src.api.client import WSPAsyncClient
+from src.core.arming import WarmPool
+from src.core.critical import CriticalSection
+from src.core.latency import plan_launch
+from src.core.plan import compile_plan
+from src.core.priority import prioritize
+from src.core.registration import RegistrationLogic
+from src.core.scheduler import TimeScheduler
+from src.utils.logging import setup_logger
+
+SCENARIOS: dict[str, StandInScenario] = {
+    "calm": StandInScenario(),
+    "early": StandInScenario(),
+    "storm": StandInScenario(storm_duration=3.0, storm_ratio=0.7, latency=0.02),
+    "scarce": StandInScenario(capacity=12, prefill=0.75, competitor_rate=2.0),
+    "remote": StandInScenario(network_delay=0.04, clock_offset=0.3),
+}
+
+# Seconds between the target instant and the moment the stand-in opens.
+_OPEN_DELAY = {"early": 1.5}
+
+console = Console()
+
+
+@dataclass
+class SubjectResult:
+    """Per-subject measurements, in milliseconds relative to the target."""
+
+    subject_id: int
+    planned_ms: float | None = None
+    fired_ms: float | None = None
+    alternative: int = 1
+    attempts: int = 0
+    first_request_ms: float | None = None
+    success_ms: float | None = None
+    statuses: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class BenchmarkResult:
+    """Aggregated measurements of a single benchmark run."""
+
+    scenario: str
+    transport: str
+    retry_policy: str
+    dispatch: str
+    budget_rate: float
+    target: float
+    first_byte_ms: float | None
+    total_requests: int
+    peak_rate: int
+    new_connections: int
+    compile_us: float
+    client_cpu_ms: float
+    process_cpu_ms: float
+    queue_wait_max_ms: float | None
+    subjects: list[SubjectResult]
+
+    @property
+    def succeeded(self) -> int:
+        """Number of subjects that got a 200 before the timeout."""
+        return sum(1 for s in self.subjects if s.success_ms is not None)
+
+    @property
+    def time_to_success_ms(self) -> list[float]:
+        """Per subject, milliseconds from its first request to its success."""
+        return [
+            s.success_ms - s.first_request_ms
+            for s in self.subjects
+            if s.success_ms is not None and s.first_request_ms is not None
+        ]
+
+
+def _collect(
+    server: WSPStandInServer, target: float, plan: dict[int, list]
+) -> tuple[int, float | None, list[SubjectResult]]:
+    results = {sid: SubjectResult(sid) for sid in plan}
+    first_byte: float | None = None
+    total = 0
+    for record in server.records:
+        if not record.path.endswith("/save") or record.subject_id not in results:
+            continue
+        total += 1
+        offset_ms = (record.arrived_at - target) * 1000
+        if first_byte is None:
+            first_byte = offset_ms
+        result = results[record.subject_id]
+        result.attempts += 1
+        result.statuses[record.status] = result.statuses.get(record.status, 0) + 1
+        if result.first_request_ms is None:
+            result.first_request_ms = offset_ms
+        if record.status == 200 and result.success_ms is None:
+            result.success_ms = (record.answered_at - target) * 1000
+    return total, first_byte, list(results.values())
+
+
+def _peak_rate(server: WSPStandInServer) -> int:
+    """Most save requests the stand-in received within any one second."""
+    arrivals = [r.arrived_at for r in server.records if r.path.endswith("/save")]
+    peak = start = 0
+    for end, arrived in enumerate(arrivals):
+        while arrived - arrivals[start] >= 1.0:
+            start += 1
+        peak = max(peak, end - start + 1)
+    return peak
+
+
+async def run_benchmark(
+    scenario_name: str,
+    scenario: StandInScenario,
+    lead: float = 5.0,
+    timeout: float = 10.0,
+    warm: bool = True,
+    arrival: bool = True,
+    alternatives: int = 1,
+) -> BenchmarkResult:
+    """Run the sniper once against a fresh stand-in server.
+
+    Parameters:
+        scenario_name: Label stored in the result.
+        scenario: Stand-in behaviour; ``opens_at`` is derived from the target.
+        lead: Seconds between arming and the target instant.
+        timeout: Seconds the attack may run before it is cancelled.
+        warm: Arm a ``WarmPool`` before the target instead of firing cold.
+        arrival: Shift the launch so requests arrive at the target; needs
+            ``warm``.
+        alternatives: Streams planned per subject, the extra ones as
+            fallbacks.
+
+    Returns:
+        The collected measurements.
+    """
+    with WSPStandInServer(replace(scenario)) as server:
+        settings.base_url = server.base_url
+        plan = server.default_plan(alternatives)
+        scheduler = TimeScheduler()
+
+        async with WSPAsyncClient() as client:
+            await client.login()
+
+            priorities = await prioritize(client, plan)
+            fire_plan = compile_plan(client, plan, priorities)
+            target = time.time() + lead
+            server.scenario.opens_at = target + _OPEN_DELAY.get(scenario_name, 0.0)
+
+            critical = CriticalSection.from_settings()
+            if warm:
+                async with WarmPool(client, len(plan)) as pool:
+                    settings.arrival_targeting = arrival
+                    launch = await plan_launch(client, scheduler, target)
+                    await pool.hold(scheduler, launch, critical)
+            else:
+                if critical:
+                    critical.enter()
+                await scheduler.wait_until_target(target)
+            if not client.transport:
+                raise Exception("Client transport is not initialized.")
+            stats = client.transport.stats
+            opened_before = stats.opened
+            cpu_start = time.thread_time()
+            process_cpu_start = time.process_time()
+            records = []
+            try:
+                records = await asyncio.wait_for(
+                    RegistrationLogic.execute_sniper_attack(client, fire_plan), timeout
+                )
+            except TimeoutError:
+                logger.warning(f"Benchmark timed out after {timeout:.1f}s.")
+            finally:
+                if critical:
+                    critical.exit()
+            client_cpu = time.thread_time() - cpu_start
+            process_cpu = time.process_time() - process_cpu_start
+            new_connections = stats.opened - opened_before
+            waits = client.budget.stats.waits if client.budget else []
+
+    total, first_byte, subjects = _collect(server, target, plan)
+    dispatched = {r.subject_id: r for r in records}
+    for subject in subjects:
+        if record := dispatched.get(subject.subject_id):
+            subject.planned_ms = record.planned * 1000
+            subject.fired_ms = record.actual * 1000
+            subject.alternative = record.alternative
+    return BenchmarkResult(
+        scenario=scenario_name,
+        transport=settings.transport,
+        retry_policy=settings.retry_policy,
+        dispatch=fire_plan.strategy,
+        budget_rate=settings.budget_rate,
+        target=target,
+        first_byte_ms=first_byte,
+        total_requests=total,
+        peak_rate=_peak_rate(server),
+        new_connections=new_connections,
+        compile_us=fire_plan.compile_seconds * 1e6,
+        client_cpu_ms=client_cpu * 1000,
+        process_cpu_ms=process_cpu * 1000,
+        queue_wait_max_ms=max(waits) * 1000 if waits else None,
+        subjects=subjects,
+    )
+
+
+def _fmt_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def print_result(result: BenchmarkResult) -> None:
+    """Render a benchmark result as a rich table."""
+    table = Table(
+        title=(
+            f"Scenario: {result.scenario} "
+            f"({result.transport}, {result.dispatch} dispatch, "
+            f"{result.retry_policy} retries)"
+        ),
+        show_header=True,
+        header_style="bold magenta",
+    )
+    table.add_column("Subject", style="cyan")
+    table.add_column("Planned (ms)", justify="right")
+    table.add_column("Fired (ms)", justify="right")
+    table.add_column("First req (ms)", justify="right")
+    table.add_column("Success (ms)", justify="right")
+    table.add_column("Attempts", justify="right")
+    table.add_column("Alt", justify="right")
+    table.add_column("Statuses")
+    for s in result.subjects:
+        statuses = " ".join(f"{k}x{v}" for k, v in sorted(s.statuses.items()))
+        table.add_row(
+            str(s.subject_id),
+            _fmt_ms(s.planned_ms),
+            _fmt_ms(s.fired_ms),
+            _fmt_ms(s.first_request_ms),
+            _fmt_ms(s.success_ms),
+            str(s.attempts),
+            str(s.alternative),
+            statuses,
+        )
+    console.print(table)
+    console.print(
+        f"First byte on wire: [bold]{_fmt_ms(result.first_byte_ms)} ms[/bold] | "
+        f"Succeeded: {result.succeeded}/{len(result.subjects)} | "
+        f"Requests: {result.total_requests} (peak {result.peak_rate}/s) | "
+        f"New connections: {result.new_connections} | "
+        f"Plan compile: {result.compile_us:.0f} µs | "
+        f"Client CPU: {result.client_cpu_ms:.1f} ms | "
+        f"Process CPU: {result.process_cpu_ms:.1f} ms | "
+        f"Max queue wait: {_fmt_ms(result.queue_wait_max_ms)} ms"
+    )
+
+
+def print_summary(results: list[BenchmarkResult]) -> None:
+    """Print averages over several runs of the same configuration."""
+    times = sorted(t for r in results for t in r.time_to_success_ms)
+    subjects = sum(len(r.subjects) for r in results)
+    requests = sum(r.total_requests for r in results)
+    median = times[len(times) // 2] if times else None
+    console.print(
+        f"[bold]{len(results)} run(s):[/bold] "
+        f"Succeeded: {len(times)}/{subjects} | "
+        f"Time to success: median {_fmt_ms(median)} ms, "
+        f"max {_fmt_ms(times[-1] if times else None)} ms | "
+        f"Requests per subject: {requests / max(1, subjects):.2f}"
+    )
+
+
+def main() -> None:
+    """Command line entry point of the sniper benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="calm")
+    parser.add_argument("--subjects", type=int, help="Override subject count.")
+    parser.add_argument("--latency", type=float, help="Override save latency (s).")
+    parser.add_argument("--lead", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--transport", choices=["aiohttp", "raw"], default="aiohttp")
+    parser.add_argument(
+        "--cold", action="store_true", help="Skip arming the connection pool."
+    )
+    parser.add_argument(
+        "--no-arrival", action="store_true", help="Fire at the target instant."
+    )
+    parser.add_argument(
+        "--retry-policy", choices=["adaptive", "legacy"], default="adaptive"
+    )
+    parser.add_argument(
+        "--dispatch", choices=["stagger", "burst", "spread", "priority"]
+    )
+    parser.add_argument(
+        "--budget-rate",
+        type=float,
+        help="Override WSP_BUDGET_RATE (requests/s, 0 disables the budget).",
+    )
+    parser.add_argument(
+        "--alternatives",
+        type=int,
+        default=1,
+        help="Streams planned per subject; extra ones are fallbacks.",
+    )
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", help="Write machine-readable results here.")
+    parser.add_argument(
+        "--trace", default="", help="Append per-request traces (JSONL) here."
+    )
+    args = parser.parse_args()
+
+    setup_logger(level=args.log_level, log_file="")
+    settings.transport = args.transport
+    # Every run generates a fresh catalogue, so cached schedules would be wrong.
+    settings.cache_dir = ""
+    settings.trace_file = args.trace
+    settings.retry_policy = args.retry_policy
+    if args.dispatch:
+        settings.dispatch_strategy = args.dispatch
+    if args.budget_rate is not None:
+        settings.budget_rate = args.budget_rate
+
+    scenario = SCENARIOS[args.scenario]
+    if args.subjects is not None:
+        scenario = replace(scenario, subjects=args.subjects)
+    if args.latency is not None:
+        scenario = replace(scenario, latency=args.latency)
+
+    results = []
+    for _ in range(args.runs):
+        result = asyncio.run(
+            run_benchmark(
+                args.scenario,
+                scenario,
+                args.lead,
+                args.timeout,
+                not args.cold,
+                not args.no_arrival,
+                args.alternatives,
+            )
+        )
+        print_result(result)
+        results.append(result)
+    if len(results) > 1:
+        print_summary(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=4)
+        console.print(f"[green]Results written to '{args.json}'.[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""Local stand-in for the WSP API used by the benchmark suite.
+
+This module provides:
+- StandInScenario: scriptable server behaviour (opening, storms, latency, seats).
+- RequestRecord: a single request observed by the stand-in.
+- WSPStandInServer: aiohttp application imitating the WSP endpoints.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Any
+
+from aiohttp import web
+
+NOT_STARTED_TEXT = "Регистрация не началась"
+GROUP_FULL_TEXT = "Группа заполнена"
+INVALID_SELECTION_TEXT = "Некорректный выбор занятий"
+SESSION_COOKIE = "JSESSIONID"
+
+_GATEWAY_PAGES = {
+    502: "<html><body><h1>502 Bad Gateway</h1></body></html>",
+    504: "<html><body><h1>504 Gateway Time-out</h1></body></html>",
+}
+_WEEK_DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+
+
+@dataclass
+class StandInScenario:
+    """Scriptable behaviour of the stand-in server.
+
+    Timestamps are wall-clock UNIX seconds so they can be compared with the
+    target produced by ``TimeScheduler``.
+
+    Attributes:
+        subjects: Number of subjects returned by the accruals endpoint.
+        streams_per_subject: Streams generated for every subject.
+        opens_at: Instant registration opens; ``None`` means always open.
+        storm_duration: Seconds after ``opens_at`` with gateway errors.
+        storm_ratio: Share of save requests answered 502/504 during the storm.
+        latency: Fixed delay injected before answering a save request.
+        latency_jitter: Upper bound of an extra random save delay.
+        network_delay: One-way delay applied to every request in both
+            directions, imitating the path to a remote host.
+        clock_offset: Seconds added to the server clock in ``Date`` headers.
+        capacity: Seats per lesson.
+        prefill: Share of seats already taken when the schedule is generated.
+        competitor_rate: Seats per second taken by other students after opening.
+        seed: Seed for the generated catalogue and the storm dice.
+    """
+
+    subjects: int = 8
+    streams_per_subject: int = 2
+    opens_at: float | None = None
+    storm_duration: float = 0.0
+    storm_ratio: float = 0.0
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    network_delay: float = 0.0
+    clock_offset: float = 0.0
+    capacity: int = 30
+    prefill: float = 0.5
+    competitor_rate: float = 0.0
+    seed: int = 42
+
+
+@dataclass
+class RequestRecord:
+    """A single request observed by the stand-in."""
+
+    method: str
+    path: str
+    arrived_at: float
+    subject_id: int | None = None
+    status: int = 0
+    answered_at: float = 0.0
+
+
+@dataclass
+class _Lesson:
+    data: dict[str, Any]
+    taken: int = 0
+
+
+@dataclass
+class _Subject:
+    subject_id: int
+    name: str
+    code: str
+    formula: str
+    lessons: dict[int, _Lesson] = field(default_factory=dict)
+
+
+class WSPStandInServer:
+    """aiohttp application imitating the WSP registration API.
+
+    The server runs on its own event loop in a background thread, so the
+    client under test keeps its loop (and its CPU accounting) to itself.
+
+    Attributes:
+        scenario: Behaviour currently applied to incoming requests.
+        user_id: ID returned by the login endpoint.
+        records: Every request seen since start, in arrival order.
+        registered: Lesson IDs saved per subject.
+    """
+
+    def __init__(self, scenario: StandInScenario | None = None, user_id: int = 7001):
+        """Initialize the stand-in and generate its subject catalogue."""
+        self.scenario = scenario or StandInScenario()
+        self.user_id = user_id
+        self.records: list[RequestRecord] = []
+        self.registered: dict[int, list[int]] = {}
+        self.port = 0
+        self._rng = random.Random(self.scenario.seed)  # noqa: S311
+        self._subjects = self._generate_catalogue()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._runner: web.AppRunner | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to put into ``settings.base_url``.
+
+        A host name is used on purpose: aiohttp's cookie jar ignores cookies
+        set by bare IP addresses, which would drop the session cookie.
+        """
+        return f"http://localhost:{self.port}/api"
+
+    def default_plan(self, alternatives: int = 1) -> dict[int, list]:
+        """Build a valid registration plan: the first stream of every subject.
+
+        Parameters:
+            alternatives: Streams to plan per subject, in stream order; more
+                than one yields ranked fallback alternatives.
+
+        Returns:
+            Mapping of subject IDs to plan entries satisfying each formula.
+        """
+        plan = {}
+        for subject in self._subjects.values():
+            lessons = [lesson.data for lesson in subject.lessons.values()]
+            streams = sorted({lesson["stream"] for lesson in lessons})
+            payloads = []
+            for stream in streams[: max(1, alternatives)]:
+                picked: dict[int, int] = {}
+                for lesson in lessons:
+                    if lesson["stream"] == stream:
+                        picked.setdefault(lesson["lessonTypeId"], lesson["id"])
+                payloads.append(sorted(picked.values()))
+            plan[subject.subject_id] = payloads if len(payloads) > 1 else payloads[0]
+        return plan
+
+    def _generate_catalogue(self) -> dict[int, _Subject]:
+        subjects = {}
+        next_lesson_id = 50_000
+        for index in range(self.scenario.subjects):
+            subject_id = 1000 + index
+            subject = _Subject(
+                subject_id=subject_id,
+                name=f"Benchmark Discipline {index + 1}",
+                code=f"BNC{index + 1:03d}",
+                formula="1/0/1",
+            )
+            for stream in range(1, self.scenario.streams_per_subject + 1):
+                for lesson_type, group in ((1, 1), (3, 1), (3, 2)):
+                    begin = float(self._rng.choice([8, 10, 12, 14, 16]))
+                    taken = int(self.scenario.capacity * self.scenario.prefill)
+                    subject.lessons[next_lesson_id] = _Lesson(
+                        data={
+                            "id": next_lesson_id,
+                            "stream": stream,
+                            "group": group,
+                            "lessonTypeId": lesson_type,
+                            "teacher": f"Teacher {self._rng.randint(1, 20)}",
+                            "room": f"{self._rng.randint(100, 599)}",
+                            "weekDay": self._rng.choice(_WEEK_DAYS),
+                            "beginTime": begin,
+                            "endTime": begin + 1.83,
+                            "studentCountMax": self.scenario.capacity,
+                            "studentRegistered": False,
+                        },
+                        taken=taken,
+                    )
+                    next_lesson_id += 1
+            subjects[subject_id] = subject
+        return subjects
+
+    def _seats_taken(self, lesson: _Lesson, now: float) -> int:
+        scenario = self.scenario
+        taken = lesson.taken
+        if scenario.competitor_rate and scenario.opens_at is not None:
+            elapsed = now - scenario.opens_at
+            if elapsed > 0:
+                taken += int(elapsed * scenario.competitor_rate)
+        return min(taken, scenario.capacity)
+
+    def _record(self, request: web.Request, subject_id: int | None = None):
+        record = RequestRecord(
+            method=request.method,
+            path=request.path,
+            arrived_at=time.time(),
+            subject_id=subject_id,
+        )
+        self.records.append(record)
+        return record
+
+    def _authorized(self, request: web.Request) -> bool:
+        return SESSION_COOKIE in request.cookies
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        record = self._record(request)
+        form = await request.post()
+        if not form.get("username") or not form.get("password"):
+            record.status = 401
+            return web.Response(status=401, text="Bad credentials")
+        response = web.json_response({"id": self.user_id})
+        response.set_cookie(SESSION_COOKIE, f"stand-in-{self.user_id}")
+        record.status = 200
+        return response
+
+    async def _handle_accruals(self, request: web.Request) -> web.Response:
+        record = self._record(request)
+        if not self._authorized(request):
+            record.status = 401
+            return web.Response(status=401)
+        accruals = [
+            {
+                "id": subject.subject_id,
+                "disciplineName": subject.name,
+                "disciplineCode": subject.code,
+            }
+            for subject in self._subjects.values()
+        ]
+        record.status = 200
+        return web.json_response({"ACCRUALS": accruals})
+
+    async def _handle_schedule(self, request: web.Request) -> web.Response:
+        subject_id = int(request.match_info["subject_id"])
+        record = self._record(request, subject_id)
+        subject = self._subjects.get(subject_id)
+        if not self._authorized(request) or subject is None:
+            record.status = 401 if subject else 404
+            return web.Response(status=record.status)
+
+        now = time.time()
+        registered = set(self.registered.get(subject_id, []))
+        schedules = []
+        for lesson_id, lesson in subject.lessons.items():
+            schedules.append(
+                {
+                    **lesson.data,
+                    "studentCount": self._seats_taken(lesson, now),
+                    "studentRegistered": lesson_id in registered,
+                }
+            )
+        record.status = 200
+        return web.json_response(
+            {
+                "SEMESTER_SUBJECT": {
+                    "id": subject.subject_id,
+                    "name": subject.name,
+                    "code": subject.code,
+                    "formula": subject.formula,
+                },
+                "SCHEDULES": schedules,
+            }
+        )
+
+    async def _handle_save(self, request: web.Request) -> web.Response:
+        subject_id = int(request.match_info["subject_id"])
+        record = self._record(request, subject_id)
+        status, text = await self._save(request, subject_id)
+        record.status = status
+        record.answered_at = time.time()
+        if status in _GATEWAY_PAGES:
+            return web.Response(status=status, text=text, content_type="text/html")
+        return web.Response(status=status, text=text)
+
+    async def _save(self, request: web.Request, subject_id: int) -> tuple[int, str]:
+        scenario = self.scenario
+        payload = await request.read()
+
+        delay = scenario.latency + self._rng.uniform(0, scenario.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        subject = self._subjects.get(subject_id)
+        if not self._authorized(request) or subject is None:
+            return (401 if subject else 404), ""
+
+        now = time.time()
+        if scenario.opens_at is not None and now < scenario.opens_at:
+            return 500, json.dumps({"message": NOT_STARTED_TEXT}, ensure_ascii=False)
+
+        in_storm = (
+            scenario.opens_at is not None
+            and now < scenario.opens_at + scenario.storm_duration
+        )
+        if in_storm and self._rng.random() < scenario.storm_ratio:
+            status = self._rng.choice(list(_GATEWAY_PAGES))
+            return status, _GATEWAY_PAGES[status]
+
+        try:
+            lesson_ids = [int(x) for x in json.loads(payload)]
+        except (ValueError, TypeError):
+            return 400, INVALID_SELECTION_TEXT
+        if not lesson_ids or any(i not in subject.lessons for i in lesson_ids):
+            return 400, INVALID_SELECTION_TEXT
+
+        if sorted(lesson_ids) == self.registered.get(subject_id):
+            return 200, "OK"
+
+        lessons = [subject.lessons[i] for i in lesson_ids]
+        if any(
+            self._seats_taken(lesson, now) >= scenario.capacity for lesson in lessons
+        ):
+            return 400, GROUP_FULL_TEXT
+
+        for lesson in lessons:
+            lesson.taken += 1
+        self.registered[subject_id] = sorted(lesson_ids)
+        return 200, "OK"
+
+    @web.middleware
+    async def _network(self, request: web.Request, handler):
+        delay = self.scenario.network_delay
+        if delay:
+            await asyncio.sleep(delay)
+        response = await handler(request)
+        date = time.time() + self.scenario.clock_offset
+        response.headers["Date"] = formatdate(date, usegmt=True)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+    async def _handle_root(self, request: web.Request) -> web.Response:
+        # Without an explicit length aiohttp clients drop the socket after HEAD.
+        return web.Response(headers={"Content-Length": "0"})
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._network])
+        app.router.add_route("HEAD", "/api", self._handle_root)
+        app.router.add_post("/api/login", self._handle_login)
+        app.router.add_get("/api/finance/accruals/{user_id}", self._handle_accruals)
+        schedule = "/api/registration/student/{user_id}/schedule/{subject_id}"
+        app.router.add_get(schedule, self._handle_schedule)
+        app.router.add_post(f"{schedule}/save", self._handle_save)
+        return app
+
+    async def _serve(self, ready: threading.Event):
+        self._runner = web.AppRunner(self._build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        ready.set()
+
+    def start(self) -> "WSPStandInServer":
+        """Start serving on an ephemeral localhost port in a background thread."""
+        ready = threading.Event()
+        loop = self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.create_task(self._serve(ready))
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="wsp-stand-in", daemon=True)
+        self._thread.start()
+        if not ready.wait(timeout=10):
+            raise Exception("Stand-in server failed to start.")
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down and join its thread."""
+        if not self._loop or not self._thread:
+            return
+        if self._runner:
+            future = asyncio.run_coroutine_threadsafe(
+                self._runner.cleanup(), self._loop
+            )
+            future.result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+    def __enter__(self) -> "WSPStandInServer":
+        """Start the server for the duration of a ``with`` block."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the server when leaving the ``with`` block."""
+        self.stop()
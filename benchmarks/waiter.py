@@ -0,0 +1,99 @@
+"""Wake-up accuracy of the final-approach waiters.
+
+Usage::
+
+    uv run python -m benchmarks.waiter --runs 50
+
+Compares the legacy ``asyncio.sleep(0.001)`` polling loop with the calibrated
+``HybridWaiter`` on an idle event loop and on one kept busy by a task doing
+CPU work in short slices, as a retry storm or keep-alive traffic would.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from src.core.waiter import HybridWaiter, OvershootStats
+from src.utils.logging import setup_logger
+
+console = Console()
+
+
+async def _legacy_wait(deadline_ns: int) -> int:
+    """The pre-calibration loop of ``TimeScheduler.wait_until_target``."""
+    while True:
+        remaining = (deadline_ns - time.perf_counter_ns()) / 1e9
+        if remaining <= 0:
+            break
+        if remaining > 0.1:
+            await asyncio.sleep(0.05)
+        else:
+            await asyncio.sleep(0.001)
+    return time.perf_counter_ns() - deadline_ns
+
+
+async def _hog(slice_seconds: float) -> None:
+    """Keep the loop busy with CPU slices separated by bare yields."""
+    while True:
+        until = time.perf_counter() + slice_seconds
+        while time.perf_counter() < until:
+            pass
+        await asyncio.sleep(0)
+
+
+async def measure(strategy: str, busy: bool, runs: int, slice_ms: float) -> list[float]:
+    """Collect wake-up errors (seconds) for one strategy and load."""
+    rng = random.Random(runs)  # noqa: S311
+    hog = asyncio.create_task(_hog(slice_ms / 1000)) if busy else None
+    waiter = HybridWaiter()
+    try:
+        if strategy == "hybrid":
+            await waiter.calibrate()
+        errors = []
+        for _ in range(runs):
+            deadline = time.perf_counter_ns() + int(rng.uniform(0.02, 0.15) * 1e9)
+            if strategy == "hybrid":
+                error = await waiter.sleep_until(deadline)
+            else:
+                error = await _legacy_wait(deadline)
+            errors.append(error / 1e9)
+        return errors
+    finally:
+        if hog:
+            hog.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await hog
+
+
+def main() -> None:
+    """Command line entry point of the waiter benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=40)
+    parser.add_argument("--slice-ms", type=float, default=2.0)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    setup_logger(level=args.log_level, log_file="")
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Loop")
+    table.add_column("Waiter", style="cyan")
+    table.add_column("Wake-up error")
+    for busy in (False, True):
+        for strategy in ("legacy", "hybrid"):
+            errors = asyncio.run(measure(strategy, busy, args.runs, args.slice_ms))
+            table.add_row(
+                "busy" if busy else "idle",
+                strategy,
+                str(OvershootStats.from_samples(errors)),
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -9,10 +11,97 @@ class Settings(BaseSettings):
     desired_time_local: str = Field("10:00:00.000000", alias="WSP_DESIRED_TIME_LOCAL")
 
     request_delay: float = Field(0.5, alias="WSP_REQUEST_DELAY")
+    dispatch_strategy: Literal["stagger", "burst", "spread", "priority"] = Field(
+        "priority", alias="WSP_DISPATCH_STRATEGY"
+    )
+    dispatch_window: float = Field(1.0, alias="WSP_DISPATCH_WINDOW")
 
     retry_delay: float = Field(0.5, alias="WSP_RETRY_DELAY")
+    retry_policy: Literal["adaptive", "legacy"] = Field(
+        "adaptive", alias="WSP_RETRY_POLICY"
+    )
+    retry_backoff_base: float = Field(0.2, alias="WSP_RETRY_BACKOFF_BASE")
+    retry_backoff_factor: float = Field(2.0, alias="WSP_RETRY_BACKOFF_FACTOR")
+    retry_backoff_cap: float = Field(1.5, alias="WSP_RETRY_BACKOFF_CAP")
+    retry_jitter: float = Field(0.2, alias="WSP_RETRY_JITTER")
+    retry_max_attempts: int = Field(0, alias="WSP_RETRY_MAX_ATTEMPTS")
+    retry_deadline: float = Field(300.0, alias="WSP_RETRY_DEADLINE")
+    retry_after_cap: float = Field(2.0, alias="WSP_RETRY_AFTER_CAP")
+    retry_terminal_markers: list[str] = Field([], alias="WSP_RETRY_TERMINAL_MARKERS")
+    already_registered_markers: list[str] = Field(
+        ["уже зарегистрирован", "already registered"],
+        alias="WSP_ALREADY_REGISTERED_MARKERS",
+    )
+    group_full_markers: list[str] = Field(
+        ["Группа заполнена", "group is full"], alias="WSP_GROUP_FULL_MARKERS"
+    )
+    seat_poll_interval: float = Field(2.0, alias="WSP_SEAT_POLL_INTERVAL")
 
     max_retries: int = 3
+    prefetch_concurrency: int = Field(4, alias="WSP_PREFETCH_CONCURRENCY")
+
+    cache_dir: str = Field(".wsp_cache", alias="WSP_CACHE_DIR")
+    cache_max_bytes: int = Field(5_000_000, alias="WSP_CACHE_MAX_BYTES")
+    cache_accruals_ttl: float = Field(3600.0, alias="WSP_CACHE_ACCRUALS_TTL")
+    cache_schedule_ttl: float = Field(1800.0, alias="WSP_CACHE_SCHEDULE_TTL")
+    cache_seats_ttl: float = Field(30.0, alias="WSP_CACHE_SEATS_TTL")
+
+    trace_file: str = Field("logs/trace.jsonl", alias="WSP_TRACE_FILE")
+    trace_buffer: int = Field(10_000, alias="WSP_TRACE_BUFFER")
+
+    fire_log_mode: Literal["verbose", "buffered"] = Field(
+        "buffered", alias="WSP_FIRE_LOG_MODE"
+    )
+    fire_log_interval: float = Field(1.0, alias="WSP_FIRE_LOG_INTERVAL")
+    fire_log_buffer: int = Field(4096, alias="WSP_FIRE_LOG_BUFFER")
+
+    web_log_capacity: int = Field(2000, alias="WSP_WEB_LOG_CAPACITY")
+    web_log_visible: int = Field(200, alias="WSP_WEB_LOG_VISIBLE")
+
+    solver_top_k: int = Field(5, alias="WSP_SOLVER_TOP_K")
+    solver_alternatives: int = Field(3, alias="WSP_SOLVER_ALTERNATIVES")
+    solver_node_limit: int = Field(200_000, alias="WSP_SOLVER_NODE_LIMIT")
+    solver_preferred_teachers: list[str] = Field(
+        [], alias="WSP_SOLVER_PREFERRED_TEACHERS"
+    )
+    solver_avoided_teachers: list[str] = Field([], alias="WSP_SOLVER_AVOIDED_TEACHERS")
+    solver_earliest: float | None = Field(None, alias="WSP_SOLVER_EARLIEST")
+    solver_latest: float | None = Field(None, alias="WSP_SOLVER_LATEST")
+
+    budget_rate: float = Field(15.0, alias="WSP_BUDGET_RATE")
+    budget_burst: int = Field(10, alias="WSP_BUDGET_BURST")
+    budget_min_rate: float = Field(3.0, alias="WSP_BUDGET_MIN_RATE")
+    budget_adaptive: bool = Field(True, alias="WSP_BUDGET_ADAPTIVE")
+
+    warm_connections: int = Field(0, alias="WSP_WARM_CONNECTIONS")
+    keepalive_interval: float = Field(15.0, alias="WSP_KEEPALIVE_INTERVAL")
+    pool_verify_lead: float = Field(1.0, alias="WSP_POOL_VERIFY_LEAD")
+
+    ntp_servers: list[str] = Field(
+        ["pool.ntp.org", "time.google.com", "time.cloudflare.com"],
+        alias="WSP_NTP_SERVERS",
+    )
+    ntp_samples: int = Field(4, alias="WSP_NTP_SAMPLES")
+    ntp_timeout: float = Field(1.0, alias="WSP_NTP_TIMEOUT")
+    ntp_resync_interval: float = Field(300.0, alias="WSP_NTP_RESYNC_INTERVAL")
+    ntp_resync_guard: float = Field(30.0, alias="WSP_NTP_RESYNC_GUARD")
+
+    waiter_samples: int = Field(100, alias="WSP_WAITER_SAMPLES")
+    waiter_margin: float = Field(0.0005, alias="WSP_WAITER_MARGIN")
+
+    critical_section: bool = Field(False, alias="WSP_CRITICAL_SECTION")
+    critical_cpu: int | None = Field(None, alias="WSP_CRITICAL_CPU")
+    critical_nice: int | None = Field(None, alias="WSP_CRITICAL_NICE")
+    uvloop: bool = Field(False, alias="WSP_UVLOOP")
+
+    arrival_targeting: bool = Field(True, alias="WSP_ARRIVAL_TARGETING")
+    arrival_percentile: float = Field(50.0, alias="WSP_ARRIVAL_PERCENTILE")
+    arrival_server_clock: bool = Field(False, alias="WSP_ARRIVAL_SERVER_CLOCK")
+    latency_samples: int = Field(20, alias="WSP_LATENCY_SAMPLES")
+    latency_probe_spacing: float = Field(0.137, alias="WSP_LATENCY_PROBE_SPACING")
+
+    transport: Literal["aiohttp", "raw"] = Field("aiohttp", alias="WSP_TRANSPORT")
+    raw_body_limit: int = Field(4096, alias="WSP_RAW_BODY_LIMIT")
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -18,9 +18,18 @@ async def main():
 
     try:
         from src.api.client import WSPAsyncClient
+        from src.core.arming import WarmPool
+        from src.core.critical import CriticalSection
+        from src.core.intervals import IntervalIndex, lessons_by_id
+        from src.core.latency import plan_launch
+        from src.core.plan import compile_plan
+        from src.core.prefetch import SchedulePrefetcher
+        from src.core.priority import prioritize
         from src.core.registration import RegistrationLogic
         from src.core.scheduler import TimeScheduler
+        from src.core.solver import TimetableSolver
         from src.ui.cli.menu import CLI
+        from src.utils.storage import make_plan_entry
     except Exception as e:
         logger.critical(f"Configuration Error: {e}")
         return
@@ -40,38 +49,78 @@ async def main():
             subjects_ids = [s["id"] for s in subjects_data]
             logger.info(f"Found {len(subjects_ids)} subjects.")
 
-            loaded_plan = cli.ask_to_load_plan()
-            if loaded_plan:
-                valid_plan = {k: v for k, v in loaded_plan.items() if k in subjects_ids}
-                registration_plan = valid_plan
-
-            if not registration_plan:
-                for sub_id in subjects_ids:
-                    try:
-                        schedule = await client.get_schedule(sub_id)
-                        ids = cli.interactive_subject_selection(schedule)
-                        if ids:
-                            registration_plan[sub_id] = ids
-                    except Exception:
-                        logger.exception(f"Error processing subject {sub_id}")
-
-                if registration_plan:
-                    cli.save_plan(registration_plan)
+            # Prompts run in a worker thread so the schedules keep downloading
+            # in the background while the operator is answering them.
+            async with SchedulePrefetcher(client, subjects_ids) as prefetcher:
+                loaded_plan = await asyncio.to_thread(cli.ask_to_load_plan)
+                if loaded_plan:
+                    registration_plan = {
+                        k: v for k, v in loaded_plan.items() if k in subjects_ids
+                    }
+                    # Schedules may have changed since the plan was saved.
+                    registration_plan = RegistrationLogic.validate_plan(
+                        registration_plan, await prefetcher.gather()
+                    )
+
+                if not registration_plan and await asyncio.to_thread(
+                    cli.ask_to_use_solver
+                ):
+                    schedules = await prefetcher.gather()
+                    # The solver skips full groups, so seat counts must be recent.
+                    schedules = await client.refresh_seats(list(schedules))
+                    timetables = TimetableSolver(schedules).solve()
+                    registration_plan = await asyncio.to_thread(
+                        cli.choose_timetable, timetables, schedules
+                    )
+                    if registration_plan:
+                        cli.save_plan(registration_plan)
+
+                if not registration_plan:
+                    index = IntervalIndex()
+                    async for sub_id, schedule in prefetcher.ready():
+                        try:
+                            alternatives = await asyncio.to_thread(
+                                cli.interactive_subject_selection,
+                                schedule,
+                                index,
+                                sub_id,
+                            )
+                            if alternatives:
+                                registration_plan[sub_id] = make_plan_entry(
+                                    alternatives
+                                )
+                                index.replace_subject(
+                                    sub_id, lessons_by_id(schedule, alternatives[0])
+                                )
+                        except Exception:
+                            logger.exception(f"Error processing subject {sub_id}")
+
+                    if registration_plan:
+                        cli.save_plan(registration_plan)
 
             if not registration_plan:
                 logger.warning("No lessons selected. Exiting.")
                 return
 
-            if not cli.get_user_confirmation(registration_plan):
+            priorities = await prioritize(client, registration_plan)
+            if not cli.get_user_confirmation(registration_plan, priorities):
                 logger.info("Cancelled by user.")
                 return
 
-            scheduler.sync_ntp()
-            target_ts = scheduler.get_target_timestamp()
-            await scheduler.wait_until_target(target_ts)
-
-            logger.warning(">>> LAUNCHING REGISTRATION REQUESTS <<<")
-            await RegistrationLogic.execute_sniper_attack(client, registration_plan)
+            critical = CriticalSection.from_settings()
+            try:
+                async with WarmPool(client, len(registration_plan)) as pool:
+                    fire_plan = compile_plan(client, registration_plan, priorities)
+                    await scheduler.sync_ntp()
+                    target_ts = scheduler.get_target_timestamp()
+                    launch_ts = await plan_launch(client, scheduler, target_ts)
+                    await pool.hold(scheduler, launch_ts, critical)
+
+                logger.warning(">>> LAUNCHING REGISTRATION REQUESTS <<<")
+                await RegistrationLogic.execute_sniper_attack(client, fire_plan)
+            finally:
+                if critical:
+                    critical.exit()
             logger.success("All tasks dispatched.")
 
         except Exception as e:
@@ -79,7 +128,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    loop_factory = None
+    # Settings can only be read once the first launch setup wrote .env.
+    if os.path.exists(".env"):
+        from src.core.critical import event_loop_factory
+
+        loop_factory = event_loop_factory()
     try:
-        asyncio.run(main())
+        asyncio.run(main(), loop_factory=loop_factory)
     except KeyboardInterrupt:
         print("\nGoodbye.")
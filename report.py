@@ -0,0 +1,109 @@
+"""Post-run report of a sniper attack.
+
+Usage::
+
+    uv run python report.py --json run.json
+
+Reads the request trace (``WSP_TRACE_FILE``) of the last run, or the text
+log if no trace is available, and prints per-subject timings, latency
+percentiles and the request rate over time.
+"""
+
+import argparse
+import json
+
+from config.settings import settings
+from src.core.report import RunReport, build_report, load_trace, parse_log
+from src.ui.cli.formatting import console, create_rate_table, create_report_table
+
+# Width of the widest bar of the rate table, in characters.
+_BAR_WIDTH = 40
+
+
+def _fmt_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _fmt_percentiles(values: dict[str, float]) -> str:
+    if not values:
+        return "-"
+    return ", ".join(f"{name} {value:.1f} ms" for name, value in values.items())
+
+
+def print_report(report: RunReport, show_rate: bool) -> None:
+    """Render a run report with rich tables."""
+    origin = "target" if report.target is not None else "first request"
+    table = create_report_table(f"Run from {report.source} (times after {origin})")
+    for s in report.subjects:
+        outcomes = " ".join(f"{k}={v}" for k, v in sorted(s.classes.items()))
+        table.add_row(
+            str(s.subject_id),
+            _fmt_ms(s.first_request_ms),
+            _fmt_ms(s.success_ms),
+            str(s.attempts),
+            outcomes,
+        )
+    console.print(table)
+
+    if show_rate:
+        rate_table = create_rate_table()
+        busiest = max((b["requests"] for b in report.rate), default=0)
+        for b in report.rate:
+            bar = "█" * round(_BAR_WIDTH * b["requests"] / busiest) if busiest else ""
+            rate_table.add_row(
+                f"{b['t']:+.1f}",
+                str(b["requests"]),
+                f"{b['requests'] / report.bin_s:.1f}",
+                bar,
+            )
+        console.print(rate_table)
+
+    reused = "-" if report.reused is None else f"{report.reused:.0%}"
+    console.print(
+        f"Succeeded: {report.succeeded}/{len(report.subjects)} | "
+        f"Requests: {report.requests} in {report.duration_s:.2f}s "
+        f"(peak {report.peak_rate:.1f}/s) | Reused connections: {reused}"
+    )
+    console.print(f"Latency: {_fmt_percentiles(report.latency_ms)}")
+    if report.ttfb_ms:
+        console.print(f"Time to first byte: {_fmt_percentiles(report.ttfb_ms)}")
+
+
+def main() -> None:
+    """Command line entry point of the run report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--trace", default=settings.trace_file, help="JSONL request trace."
+    )
+    parser.add_argument(
+        "--log", default="logs/wsp_sniper.log", help="Text log used as fallback."
+    )
+    parser.add_argument("--source", choices=["auto", "trace", "log"], default="auto")
+    parser.add_argument(
+        "--bin", type=float, default=1.0, help="Rate bin width in seconds."
+    )
+    parser.add_argument(
+        "--no-rate", action="store_true", help="Skip the request rate table."
+    )
+    parser.add_argument("--json", help="Write the machine-readable summary here.")
+    args = parser.parse_args()
+
+    run = None
+    if args.source in ("auto", "trace") and args.trace:
+        run = load_trace(args.trace)
+    if run is None and args.source in ("auto", "log"):
+        run = parse_log(args.log)
+    if run is None:
+        console.print("[red]No registration attempts found.[/red]")
+        raise SystemExit(1)
+
+    report = build_report(run, args.bin)
+    print_report(report, show_rate=not args.no_rate)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        console.print(f"Summary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
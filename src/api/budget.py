@@ -0,0 +1,212 @@
+"""Process-wide rate limiting of registration requests.
+
+This module provides:
+- BudgetStats: queue wait and rate adaptation counters.
+- RequestBudget: token bucket with a burst size, fair per-subject ordering
+  of waiting requests and AIMD adaptation of the rate to the error ratio.
+"""
+
+import asyncio
+import collections
+import heapq
+import itertools
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from config.settings import settings
+
+# Statuses counted as errors when adapting the rate: network failures and
+# answers of an overloaded server or gateway.
+_ERROR_STATUSES = frozenset({0, 429, 502, 503, 504})
+_EWMA_ALPHA = 0.2
+_ERROR_THRESHOLD = 0.3
+_DECREASE_FACTOR = 0.7
+_DECREASE_COOLDOWN = 0.5
+_INCREASE_SHARE = 0.05
+
+
+@dataclass
+class BudgetStats:
+    """Counters collected by a RequestBudget.
+
+    Attributes:
+        waits: Queue wait of every granted request, in seconds.
+        max_queue: Longest queue of waiting requests observed.
+        decreases: Number of multiplicative rate decreases.
+        min_rate: Lowest rate reached, in requests per second.
+    """
+
+    waits: list[float] = field(default_factory=list)
+    max_queue: int = 0
+    decreases: int = 0
+    min_rate: float = 0.0
+
+    def __str__(self) -> str:
+        """Format the queue wait percentiles in milliseconds."""
+        if not self.waits:
+            return "no requests"
+        if len(self.waits) < 2:
+            p50 = p99 = self.waits[0]
+        else:
+            cuts = statistics.quantiles(self.waits, n=100, method="inclusive")
+            p50, p99 = cuts[49], cuts[98]
+        return (
+            f"{len(self.waits)} granted, queue wait p50 {p50 * 1000:.1f}ms, "
+            f"p99 {p99 * 1000:.1f}ms, max {max(self.waits) * 1000:.1f}ms, "
+            f"longest queue {self.max_queue}, rate cut {self.decreases}x "
+            f"(min {self.min_rate:.1f}/s)"
+        )
+
+
+class RequestBudget:
+    """Token bucket shared by every registration request of a client.
+
+    Waiting requests are granted in order of priority, then of how many
+    tokens their subject already received relative to its weight, then of
+    arrival, so a subject stuck in a retry loop cannot starve another
+    subject's first attempt, and heavier subjects get a larger share.
+
+    Attributes:
+        rate (float): Current refill rate, in requests per second.
+        max_rate (float): Configured rate the adaptation climbs back to.
+        min_rate (float): Floor of the adapted rate.
+        burst (int): Bucket capacity, i.e. requests that may leave at once.
+        adaptive (bool): Whether record() adapts the rate.
+        weights (dict[int, float]): Budget share per subject, 1.0 if absent.
+        stats (BudgetStats): Queue wait and adaptation counters.
+
+    Methods:
+        acquire(subject_id, priority) -> float: Waits for a token and returns
+            the time spent queued.
+        record(status) -> None: Feeds a response status into the adaptation.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float | None = None,
+        adaptive: bool = True,
+    ):
+        """Initialize a full bucket."""
+        self.rate = self.max_rate = rate
+        self.min_rate = min(rate, rate / 10 if min_rate is None else min_rate)
+        self.burst = max(1, burst)
+        self.adaptive = adaptive
+        self.weights: dict[int, float] = {}
+        self.stats = BudgetStats(min_rate=rate)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._granted: collections.Counter[int] = collections.Counter()
+        self._waiters: list[tuple[int, float, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._error_ratio = 0.0
+        self._last_decrease = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "RequestBudget | None":
+        """Build the budget configured by ``WSP_BUDGET_*``, None if disabled."""
+        if settings.budget_rate <= 0:
+            return None
+        return cls(
+            settings.budget_rate,
+            settings.budget_burst,
+            settings.budget_min_rate,
+            settings.budget_adaptive,
+        )
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _grant(self, subject_id: int) -> None:
+        self._tokens -= 1
+        self._granted[subject_id] += 1
+
+    def _refund(self, subject_id: int) -> None:
+        """Return the token of a cancelled grant and pass it on."""
+        self._refill(time.monotonic())
+        self._tokens = min(self.burst, self._tokens + 1)
+        self._granted[subject_id] -= 1
+        if self._timer is not None:
+            self._timer.cancel()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        self._refill(time.monotonic())
+        while self._waiters and self._tokens >= 1:
+            *_, subject_id, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._grant(subject_id)
+            waiter.set_result(None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        while self._waiters and self._waiters[0][-1].done():
+            heapq.heappop(self._waiters)
+        if not self._waiters or self._timer is not None:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    async def acquire(self, subject_id: int, priority: int = 0) -> float:
+        """Wait for a token.
+
+        Parameters:
+            subject_id: Subject the request belongs to, used for fairness.
+            priority: Higher values are granted first.
+
+        Returns:
+            Seconds spent waiting in the queue.
+
+        A request cancelled after its token was granted, e.g. an attempt
+        stopped by a failover, gives the token back to the next waiter.
+        """
+        started = time.monotonic()
+        self._refill(started)
+        if not self._waiters and self._tokens >= 1:
+            self._grant(subject_id)
+            self.stats.waits.append(0.0)
+            return 0.0
+
+        waiter = asyncio.get_running_loop().create_future()
+        share = self._granted[subject_id] / self.weights.get(subject_id, 1.0)
+        entry = (-priority, share, next(self._sequence))
+        heapq.heappush(self._waiters, (*entry, subject_id, waiter))
+        self.stats.max_queue = max(self.stats.max_queue, len(self._waiters))
+        self._schedule()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._refund(subject_id)
+            raise
+        wait = time.monotonic() - started
+        self.stats.waits.append(wait)
+        return wait
+
+    def record(self, status: int) -> None:
+        """Adapt the rate to a response status.
+
+        The error ratio is tracked as a moving average. Above the threshold
+        the rate is cut multiplicatively (at most every half second), below
+        it every successful answer raises it by a small step.
+        """
+        if not self.adaptive:
+            return
+        error = status in _ERROR_STATUSES
+        self._error_ratio += _EWMA_ALPHA * (error - self._error_ratio)
+        now = time.monotonic()
+        self._refill(now)
+        if self._error_ratio > _ERROR_THRESHOLD:
+            if now - self._last_decrease >= _DECREASE_COOLDOWN:
+                self.rate = max(self.min_rate, self.rate * _DECREASE_FACTOR)
+                self._last_decrease = now
+                self.stats.decreases += 1
+                self.stats.min_rate = min(self.stats.min_rate, self.rate)
+        elif not error:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * _INCREASE_SHARE)
@@ -4,6 +4,8 @@ This module provides:
 - WSPAsyncClient: async context manager for authentication and API requests.
 """
 
+import asyncio
+import time
 from typing import Any
 
 import aiohttp
@@ -14,8 +16,20 @@ from tenacity import (
     stop_after_attempt,
     wait_exponential,
 )
+from yarl import URL
 
 from config.settings import settings
+from src.api.budget import RequestBudget
+from src.api.prepared import PreparedRequest
+from src.api.tracing import RequestTracer
+from src.api.transport import (
+    AiohttpTransport,
+    ConnectionStats,
+    RawHTTPTransport,
+    RegistrationResponse,
+    RegistrationTransport,
+)
+from src.utils.cache import CacheEntry, ResponseCache
 
 
 class WSPAsyncClient:
@@ -25,40 +39,99 @@ class WSPAsyncClient:
     ----------
     base_url : str
         The base URL for API requests.
+    username : str
+        WSP login used by login().
     session : aiohttp.ClientSession | None
         The aiohttp session for making requests.
     user_id : int | None
         The authenticated user's ID.
+    stats : ConnectionStats
+        Connections opened and reused by the aiohttp session.
+    transport : RegistrationTransport | None
+        Transport used by register_lessons(), chosen by ``WSP_TRANSPORT``.
+    budget : RequestBudget | None
+        Rate limiter every register_lessons() call goes through.
+    cache : ResponseCache | None
+        On-disk cache of accruals and schedules, chosen by ``WSP_CACHE_*``.
+    tracer : RequestTracer | None
+        Phase timings of every register_lessons() call, chosen by
+        ``WSP_TRACE_*``.
 
     Methods:
     -------
     login() -> int
         Authenticates and returns the User ID.
-    get_accruals() -> list[dict[str, Any]]
+    get_accruals(max_age: float | None) -> list[dict[str, Any]]
         Fetches list of available subjects with metadata.
-    get_schedule(subject_id: int) -> dict[str, Any]
+    get_schedule(subject_id: int, max_age: float | None) -> dict[str, Any]
         Fetches the schedule for a given subject.
-    register_lessons(subject_id: int, payload: list[int]) -> tuple[int, str]
-        Sends the final registration payload.
+    refresh_seats(subject_ids: list[int]) -> dict[int, dict[str, Any]]
+        Revalidates cached schedules to pick up current seat counts.
+    poll_schedule(subject_id: int) -> dict[str, Any]
+        Fetches a fresh schedule through the request budget, uncached.
+    prepare_registration(subject_id: int, payload: list[int]) -> PreparedRequest
+        Builds the save request for a subject ahead of time.
+    register_lessons(request: PreparedRequest, attempt: int) -> RegistrationResponse
+        Sends the final registration payload through the transport.
     """
 
-    def __init__(self):
-        """Initialize the WSP async client with default settings."""
+    def __init__(self, username: str | None = None, password: str | None = None):
+        """Initialize the WSP async client.
+
+        Parameters:
+            username: WSP login, ``WSP_USERNAME`` if omitted.
+            password: WSP password, ``WSP_PASSWORD`` if omitted.
+        """
         self.base_url = settings.base_url
+        self.username = username or settings.username
+        self._password = password or settings.password
         self.session: aiohttp.ClientSession | None = None
         self.user_id: int | None = None
+        self.stats = ConnectionStats()
+        self.transport: RegistrationTransport | None = None
+        self.budget: RequestBudget | None = None
+        self.cache = ResponseCache.from_settings()
+        self.tracer = RequestTracer.from_settings()
 
     async def __aenter__(self):
         """Enter the async context manager and initialize the HTTP session."""
-        connector = aiohttp.TCPConnector(ssl=False, limit=100)
-        self.session = aiohttp.ClientSession(connector=connector)
+        connector = aiohttp.TCPConnector(
+            ssl=False,
+            limit=100,
+            keepalive_timeout=max(60.0, settings.keepalive_interval * 2),
+        )
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        if self.tracer:
+            self.tracer.install(trace_config)
+        self.session = aiohttp.ClientSession(
+            connector=connector, trace_configs=[trace_config]
+        )
+        if settings.transport == "raw":
+            self.transport = RawHTTPTransport(
+                URL(self.base_url), settings.raw_body_limit
+            )
+        else:
+            self.transport = AiohttpTransport(self.session, self.base_url, self.stats)
+        self.budget = RequestBudget.from_settings()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit the async context manager and close the HTTP session."""
+        if self.tracer:
+            self.tracer.flush()
+        if self.transport:
+            await self.transport.close()
         if self.session:
             await self.session.close()
 
+    async def _on_connection_created(self, session, ctx, params):
+        self.stats.opened += 1
+
+    async def _on_connection_reused(self, session, ctx, params):
+        self.stats.reused += 1
+
     @retry(
         stop=stop_after_attempt(settings.max_retries),
         wait=wait_exponential(multiplier=1, min=1, max=5),
@@ -73,11 +146,11 @@ class WSPAsyncClient:
         url = f"{self.base_url}/login?remember-me=1"
         data = {
             "remember-me": "1",
-            "username": settings.username,
-            "password": settings.password,
+            "username": self.username,
+            "password": self._password,
         }
 
-        logger.debug(f"Attempting login for user: {settings.username}")
+        logger.debug(f"Attempting login for user: {self.username}")
         async with self.session.post(url, data=data) as response:
             if response.status != 200:
                 text = await response.text()
@@ -93,37 +166,126 @@ class WSPAsyncClient:
             logger.info(f"Login successful. User ID: {self.user_id}")
             return self.user_id
 
+    async def _cached_get(self, kind: str, key: Any, url: str, max_age: float) -> Any:
+        """GET a JSON payload through the on-disk cache.
+
+        Entries younger than ``max_age`` are served without a request. Older
+        ones are revalidated with their ``ETag``/``Last-Modified``, so a 304
+        only refreshes their age.
+        """
+        if not self.session:
+            raise Exception("Session not initialized. Use async context manager.")
+        entry = self.cache.get(self.user_id, kind, key) if self.cache else None
+        if entry and entry.age < max_age:
+            return entry.data
+
+        headers = entry.validators() if entry else {}
+        async with self.session.get(url, headers=headers) as response:
+            if response.status == 304 and entry and self.cache:
+                self.cache.touch(self.user_id, kind, key, entry)
+                return entry.data
+            response.raise_for_status()
+            data = await response.json()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        if self.cache:
+            self.cache.put(
+                self.user_id,
+                kind,
+                key,
+                CacheEntry(data, time.time(), etag, last_modified),
+            )
+        return data
+
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=2)
     )
-    async def get_accruals(self) -> list[dict[str, Any]]:
+    async def get_accruals(self, max_age: float | None = None) -> list[dict[str, Any]]:
         """Fetches list of available subjects with metadata.
 
+        Parameters:
+            max_age: Oldest cached copy to accept, in seconds;
+                ``WSP_CACHE_ACCRUALS_TTL`` if omitted, 0 to revalidate.
+
         Returns: List of dictionary objects (containing 'id', 'disciplineName', etc.).
         """
-        if not self.session:
-            raise Exception("Session not initialized. Use async context manager.")
         if not self.user_id:
             raise Exception("User ID not set. Call login() first.")
 
         url = f"{self.base_url}/finance/accruals/{self.user_id}"
-        async with self.session.get(url) as response:
-            response.raise_for_status()
-            data = await response.json()
-            return data.get("ACCRUALS", [])
+        if max_age is None:
+            max_age = settings.cache_accruals_ttl
+        data = await self._cached_get("accruals", "all", url, max_age)
+        return data.get("ACCRUALS", [])
 
-    @retry(stop=stop_after_attempt(3))
-    async def get_schedule(self, subject_id: int) -> dict[str, Any]:
+    @retry(
+        stop=stop_after_attempt(settings.max_retries),
+        wait=wait_exponential(multiplier=0.5, max=2),
+        reraise=True,
+    )
+    async def get_schedule(
+        self, subject_id: int, max_age: float | None = None
+    ) -> dict[str, Any]:
         """Fetch the schedule for a given subject.
 
         Parameters:
             subject_id: The ID of the subject to fetch the schedule for.
+            max_age: Oldest cached copy to accept, in seconds;
+                ``WSP_CACHE_SCHEDULE_TTL`` if omitted, 0 to revalidate.
+
+        Returns:
+            The schedule data for the specified subject.
+        """
+        url = (
+            f"{self.base_url}/registration/student/{self.user_id}/schedule/{subject_id}"
+        )
+        if max_age is None:
+            max_age = settings.cache_schedule_ttl
+        return await self._cached_get("schedule", subject_id, url, max_age)
+
+    async def refresh_seats(
+        self, subject_ids: list[int], max_age: float | None = None
+    ) -> dict[int, dict[str, Any]]:
+        """Refresh only what goes stale quickly: the seat counts.
+
+        Lesson times, teachers and streams rarely change, so planning reads
+        schedules with the long ``WSP_CACHE_SCHEDULE_TTL``. Callers that rank
+        or watch seats use this instead, which revalidates every schedule
+        older than ``max_age`` (``WSP_CACHE_SEATS_TTL`` if omitted)
+        concurrently.
+
+        Returns:
+            Schedules per subject ID; subjects whose fetch failed are missing.
+        """
+        if max_age is None:
+            max_age = settings.cache_seats_ttl
+        results = await asyncio.gather(
+            *(self.get_schedule(sid, max_age) for sid in subject_ids),
+            return_exceptions=True,
+        )
+        schedules = {}
+        for subject_id, result in zip(subject_ids, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"Subj {subject_id}: seat refresh failed: {result}")
+            else:
+                schedules[subject_id] = result
+        return schedules
+
+    async def poll_schedule(self, subject_id: int) -> dict[str, Any]:
+        """Fetch a fresh schedule while registration requests are in flight.
+
+        Unlike get_schedule(), the request waits for the request budget,
+        behind any waiting registration attempt, and bypasses the on-disk
+        cache, so polling during the fire window adds no unbudgeted load and
+        no blocking file I/O to the event loop.
 
         Returns:
             The schedule data for the specified subject.
         """
         if not self.session:
             raise Exception("Session not initialized. Use async context manager.")
+        if self.budget is not None:
+            await self.budget.acquire(subject_id, priority=-1)
         url = (
             f"{self.base_url}/registration/student/{self.user_id}/schedule/{subject_id}"
         )
@@ -131,22 +293,55 @@ class WSPAsyncClient:
             response.raise_for_status()
             return await response.json()
 
-    async def register_lessons(
+    def prepare_registration(
         self, subject_id: int, payload: list[int]
-    ) -> tuple[int, str]:
-        """Sends the final registration payload.
+    ) -> PreparedRequest:
+        """Builds the save request for a subject ahead of time.
 
-        Returns: (HTTP_STATUS_CODE, RESPONSE_TEXT).
+        Returns: PreparedRequest ready to be passed to register_lessons().
         """
         if not self.session:
             raise Exception("Session not initialized. Use async context manager.")
-        url = (
-            f"{self.base_url}/registration/student/{self.user_id}"
-            f"/schedule/{subject_id}/save"
+        if not self.user_id:
+            raise Exception("User ID not set. Call login() first.")
+        base = URL(self.base_url)
+        cookie = "; ".join(
+            f"{name}={morsel.value}"
+            for name, morsel in self.session.cookie_jar.filter_cookies(base).items()
         )
-        try:
-            async with self.session.post(url, json=payload) as response:
-                text = await response.text()
-                return response.status, text.strip()
-        except Exception as e:
-            return 0, str(e)
+        return PreparedRequest.build(
+            self.base_url, self.user_id, subject_id, payload, cookie
+        )
+
+    async def register_lessons(
+        self, request: PreparedRequest, attempt: int = 1
+    ) -> RegistrationResponse:
+        """Sends the final registration payload.
+
+        Waits for the request budget first, if one is configured, and records
+        the phase timings of the request if tracing is enabled.
+
+        Parameters:
+            request: Request built by prepare_registration().
+            attempt: 1-based attempt number, recorded in the trace.
+
+        Returns: RegistrationResponse with the status, text and Retry-After.
+        """
+        if not self.transport:
+            raise Exception("Session not initialized. Use async context manager.")
+        tracer = self.tracer
+        trace = None
+        if tracer:
+            trace = tracer.start(request.subject_id, attempt, settings.transport)
+        if self.budget is not None:
+            await self.budget.acquire(request.subject_id)
+            if trace:
+                trace.budget_ns = time.perf_counter_ns()
+        response = await self.transport.send(request, trace)
+        if self.budget is not None:
+            self.budget.record(response.status)
+        if tracer and trace:
+            tracer.finish(
+                trace, response.status, response.text if not response.status else None
+            )
+        return response
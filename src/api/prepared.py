@@ -0,0 +1,74 @@
+"""Prebuilt registration requests for the fire path.
+
+This module provides:
+- PreparedRequest: immutable save request with its final URL, body and headers,
+  plus the same request serialized to HTTP/1.1 wire bytes.
+- JSON_HEADERS: headers shared by every prepared JSON request.
+"""
+
+import json
+from dataclasses import dataclass
+
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+JSON_HEADERS = CIMultiDictProxy(CIMultiDict({"Content-Type": "application/json"}))
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedRequest:
+    """A registration request built once, before the target instant.
+
+    Attributes:
+        subject_id: Subject the request registers for.
+        payload: Lesson IDs sent in the body.
+        url: Parsed, final ``.../schedule/{id}/save`` URL.
+        body: JSON-encoded payload.
+        headers: Request headers.
+        wire: The complete HTTP/1.1 request (including the session cookie)
+            for transports that write straight to a socket.
+    """
+
+    subject_id: int
+    payload: tuple[int, ...]
+    url: URL
+    body: bytes
+    headers: CIMultiDictProxy[str]
+    wire: bytes
+
+    @classmethod
+    def build(
+        cls,
+        base_url: str,
+        user_id: int,
+        subject_id: int,
+        payload: list[int],
+        cookie: str = "",
+    ) -> "PreparedRequest":
+        """Format the URL and encode the body of a save request.
+
+        Parameters:
+            base_url: API base URL.
+            user_id: Authenticated user's ID.
+            subject_id: Subject to register for.
+            payload: Lesson IDs to register.
+            cookie: ``Cookie`` header value of the logged-in session.
+
+        Returns:
+            The prepared request.
+        """
+        url = URL(
+            f"{base_url}/registration/student/{user_id}/schedule/{subject_id}/save"
+        )
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        head = (
+            f"POST {url.raw_path_qs} HTTP/1.1\r\n"
+            f"Host: {url.raw_authority}\r\n"
+            "Accept: */*\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            + (f"Cookie: {cookie}\r\n" if cookie else "")
+            + "Connection: keep-alive\r\n\r\n"
+        )
+        wire = head.encode("latin-1") + body
+        return cls(subject_id, tuple(payload), url, body, JSON_HEADERS, wire)
@@ -0,0 +1,238 @@
+"""Per-request latency tracing of registration attempts.
+
+This module provides:
+- RequestTrace: monotonic phase timestamps of one registration attempt.
+- RequestTracer: buffers traces in memory, fills the aiohttp phases through
+  ``aiohttp.TraceConfig`` hooks and flushes them to a JSONL timeline.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from loguru import logger
+
+from config.settings import settings
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """Phase timestamps of one registration attempt.
+
+    Every timestamp is a ``perf_counter_ns`` value, or None if the phase did
+    not happen (e.g. no DNS lookup or connect on a reused connection).
+
+    Attributes:
+        subject_id: Subject the request belongs to.
+        attempt: 1-based attempt number of the subject.
+        transport: Name of the transport that sent the request.
+        start_ns: The attempt was handed to the client.
+        budget_ns: The request budget granted the request.
+        queued_ns: A free connection slot was obtained from the pool.
+        dns_start_ns, dns_end_ns: Host name resolution.
+        connect_start_ns, connect_end_ns: New connection, including TLS.
+        sent_ns: The request was written to the socket.
+        first_byte_ns: The response head was received.
+        end_ns: The response body was read.
+        reused: Whether a pooled keep-alive connection was used.
+        status: HTTP status code, 0 on a network error.
+        error: Error message of a failed request.
+    """
+
+    subject_id: int
+    attempt: int
+    transport: str
+    start_ns: int
+    budget_ns: int | None = None
+    queued_ns: int | None = None
+    dns_start_ns: int | None = None
+    dns_end_ns: int | None = None
+    connect_start_ns: int | None = None
+    connect_end_ns: int | None = None
+    sent_ns: int | None = None
+    first_byte_ns: int | None = None
+    end_ns: int | None = None
+    reused: bool | None = None
+    status: int = 0
+    error: str | None = None
+
+
+def _span_ms(start: int | None, end: int | None) -> float | None:
+    if start is None or end is None:
+        return None
+    return round((end - start) / 1e6, 3)
+
+
+class RequestTracer:
+    """In-memory buffer of registration traces with a JSONL flush.
+
+    Recording a trace is a list append; timestamps are only converted to
+    phase durations and serialized when ``flush`` runs, after the fire
+    window. Once ``capacity`` traces are buffered, further ones are counted
+    as dropped instead of growing the buffer.
+
+    Attributes:
+        path (str): JSONL file the timeline is appended to.
+        capacity (int): Maximum number of buffered traces.
+        dropped (int): Traces discarded because the buffer was full.
+
+    Methods:
+        from_settings() -> RequestTracer | None: Tracer configured by
+            ``WSP_TRACE_*``, None if disabled.
+        install(trace_config) -> None: Registers the aiohttp phase hooks.
+        begin_run(target, launch, time_offset) -> None: Records the target
+            of the attempts that follow.
+        start(subject_id, attempt, transport) -> RequestTrace: Opens a trace.
+        finish(trace, status, error) -> None: Closes and buffers a trace.
+        flush() -> int: Appends the buffered traces to ``path``.
+    """
+
+    def __init__(self, path: str, capacity: int):
+        """Initialize an empty tracer."""
+        self.path = path
+        self.capacity = max(1, capacity)
+        self.dropped = 0
+        self._buffer: list[RequestTrace] = []
+        self._run: dict[str, Any] | None = None
+        self._origin_ns = time.perf_counter_ns()
+        self._origin_wall = time.time()
+
+    @classmethod
+    def from_settings(cls) -> "RequestTracer | None":
+        """Build the tracer configured by ``WSP_TRACE_*``, None if disabled."""
+        if not settings.trace_file:
+            return None
+        return cls(settings.trace_file, settings.trace_buffer)
+
+    def begin_run(self, target: float, launch: float, time_offset: float) -> None:
+        """Record the target of the attempts that follow.
+
+        Written as an ``"event": "run"`` header before the next flushed
+        traces, so timelines can be related to the target time.
+
+        Parameters:
+            target: NTP-corrected target timestamp.
+            launch: NTP-corrected instant the first request is fired at.
+            time_offset: NTP offset to add to the local ``time`` of traces.
+        """
+        self._run = {
+            "event": "run",
+            "target": target,
+            "launch": launch,
+            "time_offset": time_offset,
+            "transport": settings.transport,
+            "dispatch": settings.dispatch_strategy,
+        }
+
+    def start(self, subject_id: int, attempt: int, transport: str) -> RequestTrace:
+        """Open the trace of an attempt handed to the client now."""
+        return RequestTrace(subject_id, attempt, transport, time.perf_counter_ns())
+
+    def finish(
+        self, trace: RequestTrace, status: int, error: str | None = None
+    ) -> None:
+        """Close a trace once its response was read and buffer it."""
+        if trace.end_ns is None:
+            trace.end_ns = time.perf_counter_ns()
+        trace.status = status
+        trace.error = error
+        if len(self._buffer) < self.capacity:
+            self._buffer.append(trace)
+        else:
+            self.dropped += 1
+
+    def install(self, trace_config: aiohttp.TraceConfig) -> None:
+        """Register hooks filling the phases of traced aiohttp requests.
+
+        A request is traced when its ``RequestTrace`` is passed as
+        ``trace_request_ctx``; other requests of the session are ignored.
+        """
+        phases = (
+            (trace_config.on_connection_queued_end, "queued_ns"),
+            (trace_config.on_dns_resolvehost_start, "dns_start_ns"),
+            (trace_config.on_dns_resolvehost_end, "dns_end_ns"),
+            (trace_config.on_connection_create_start, "connect_start_ns"),
+            (trace_config.on_connection_create_end, "connect_end_ns"),
+            (trace_config.on_request_headers_sent, "sent_ns"),
+            (trace_config.on_request_end, "first_byte_ns"),
+        )
+        for signal, field in phases:
+            signal.append(self._stamp(field))
+        trace_config.on_connection_reuseconn.append(self._on_reuse)
+        trace_config.on_connection_create_end.append(self._on_new_connection)
+
+    @staticmethod
+    def _stamp(field: str):
+        async def hook(session, ctx: SimpleNamespace, params) -> None:
+            trace = ctx.trace_request_ctx
+            if isinstance(trace, RequestTrace):
+                setattr(trace, field, time.perf_counter_ns())
+
+        return hook
+
+    @staticmethod
+    async def _on_reuse(session, ctx: SimpleNamespace, params) -> None:
+        if isinstance(ctx.trace_request_ctx, RequestTrace):
+            ctx.trace_request_ctx.reused = True
+
+    @staticmethod
+    async def _on_new_connection(session, ctx: SimpleNamespace, params) -> None:
+        if isinstance(ctx.trace_request_ctx, RequestTrace):
+            ctx.trace_request_ctx.reused = False
+
+    def _record(self, trace: RequestTrace) -> dict[str, Any]:
+        start = trace.start_ns
+        ready = trace.budget_ns or start
+        connected = trace.connect_end_ns or trace.queued_ns or ready
+        return {
+            "event": "attempt",
+            "time": self._origin_wall + (start - self._origin_ns) / 1e9,
+            "subject_id": trace.subject_id,
+            "attempt": trace.attempt,
+            "transport": trace.transport,
+            "status": trace.status,
+            "reused": trace.reused,
+            "budget_ms": _span_ms(start, trace.budget_ns),
+            "queue_ms": _span_ms(ready, trace.queued_ns),
+            "dns_ms": _span_ms(trace.dns_start_ns, trace.dns_end_ns),
+            "connect_ms": _span_ms(trace.connect_start_ns, trace.connect_end_ns),
+            "send_ms": _span_ms(connected, trace.sent_ns),
+            "ttfb_ms": _span_ms(trace.sent_ns, trace.first_byte_ns),
+            "read_ms": _span_ms(trace.first_byte_ns, trace.end_ns),
+            "total_ms": _span_ms(start, trace.end_ns),
+            "error": trace.error,
+        }
+
+    def flush(self) -> int:
+        """Append the buffered traces to the JSONL timeline and clear them.
+
+        Returns:
+            Number of traces written.
+        """
+        if not self._buffer:
+            return 0
+        traces, self._buffer = self._buffer, []
+        run, self._run = self._run, None
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if run is not None:
+                    f.write(json.dumps(run) + "\n")
+                for trace in traces:
+                    f.write(json.dumps(self._record(trace), ensure_ascii=False))
+                    f.write("\n")
+        except OSError as e:
+            logger.warning(f"Failed to write request trace: {e}")
+            return 0
+        message = f"Traced {len(traces)} request(s) to {self.path}"
+        if self.dropped:
+            message += f" ({self.dropped} dropped, buffer full)"
+            self.dropped = 0
+        logger.info(message)
+        return len(traces)
@@ -0,0 +1,408 @@
+"""Pluggable transports for sending prepared registration requests.
+
+This module provides:
+- ConnectionStats: counters of opened and reused connections.
+- Probe: timing and ``Date`` header of a lightweight request.
+- RegistrationResponse: status, text and ``Retry-After`` of a registration.
+- RegistrationTransport: interface used by ``WSPAsyncClient.register_lessons``.
+- AiohttpTransport: default transport on top of the client's aiohttp session.
+- RawHTTPTransport: minimal HTTP/1.1 client on asyncio streams that writes
+  prebuilt request bytes to warm keep-alive sockets.
+"""
+
+import asyncio
+import collections
+import ssl
+import time
+from dataclasses import dataclass
+from typing import NamedTuple, Protocol
+
+import aiohttp
+from loguru import logger
+from yarl import URL
+
+from src.api.prepared import PreparedRequest
+from src.api.tracing import RequestTrace
+
+_READ_TIMEOUT = 30.0
+
+
+@dataclass
+class ConnectionStats:
+    """Counters of connections opened and reused by a transport."""
+
+    opened: int = 0
+    reused: int = 0
+
+
+class Probe(NamedTuple):
+    """Result of a lightweight HEAD request.
+
+    Attributes:
+        status: HTTP status code, 0 on a network error.
+        sent_ns: ``perf_counter_ns`` right before the request was written.
+        received_ns: ``perf_counter_ns`` once the response head was read.
+        date: Raw ``Date`` response header, if any.
+    """
+
+    status: int
+    sent_ns: int
+    received_ns: int
+    date: str | None
+
+    @property
+    def rtt(self) -> float:
+        """Round-trip time in seconds."""
+        return (self.received_ns - self.sent_ns) / 1e9
+
+
+class RegistrationResponse(NamedTuple):
+    """Answer to a registration request.
+
+    Attributes:
+        status: HTTP status code, 0 on a network error.
+        text: Response body (or the error message), stripped.
+        retry_after: Raw ``Retry-After`` response header, if any.
+    """
+
+    status: int
+    text: str
+    retry_after: str | None = None
+
+
+class _Response(NamedTuple):
+    status: int
+    body: bytes
+    keep_alive: bool
+    date: str | None
+    retry_after: str | None
+
+
+class RegistrationTransport(Protocol):
+    """Interface of a transport able to fire prepared requests."""
+
+    stats: ConnectionStats
+
+    async def warm(self, connections: int) -> tuple[int, int]:
+        """Open or refresh keep-alive connections.
+
+        Returns: (reused, opened) connection counts.
+        """
+        ...
+
+    async def probe(self) -> Probe:
+        """Send a lightweight request over a pooled connection."""
+        ...
+
+    async def send(
+        self, request: PreparedRequest, trace: RequestTrace | None = None
+    ) -> RegistrationResponse:
+        """Send a prepared request, stamping the phases of ``trace`` if given.
+
+        Returns: RegistrationResponse, status 0 on network errors.
+        """
+        ...
+
+    async def close(self) -> None:
+        """Release every connection owned by the transport."""
+        ...
+
+
+class AiohttpTransport:
+    """Default transport sharing the client's aiohttp session and pool."""
+
+    def __init__(
+        self, session: aiohttp.ClientSession, base_url: str, stats: ConnectionStats
+    ):
+        """Initialize the transport.
+
+        Parameters:
+            session: Session of the owning ``WSPAsyncClient``.
+            base_url: API base URL, pinged to open connections.
+            stats: Counters updated by the session's trace hooks.
+        """
+        self.session = session
+        self.base_url = base_url
+        self.stats = stats
+
+    async def probe(self) -> Probe:
+        """Send a HEAD request to the API base URL."""
+        sent = time.perf_counter_ns()
+        try:
+            async with self.session.head(self.base_url) as response:
+                return Probe(
+                    response.status,
+                    sent,
+                    time.perf_counter_ns(),
+                    response.headers.get("Date"),
+                )
+        except (aiohttp.ClientError, TimeoutError) as e:
+            logger.debug(f"Ping failed: {e}")
+            return Probe(0, sent, time.perf_counter_ns(), None)
+
+    async def warm(self, connections: int) -> tuple[int, int]:
+        """Send concurrent HEAD pings so each one occupies its own socket."""
+        reused_before = self.stats.reused
+        opened_before = self.stats.opened
+        await asyncio.gather(*(self.probe() for _ in range(connections)))
+        return (
+            self.stats.reused - reused_before,
+            self.stats.opened - opened_before,
+        )
+
+    async def send(
+        self, request: PreparedRequest, trace: RequestTrace | None = None
+    ) -> RegistrationResponse:
+        """Send a prepared request through the aiohttp session.
+
+        The trace is handed to the session's trace hooks, which stamp the
+        connection and request phases.
+        """
+        try:
+            async with self.session.post(
+                request.url,
+                data=request.body,
+                headers=request.headers,
+                trace_request_ctx=trace,
+            ) as response:
+                text = await response.text()
+                return RegistrationResponse(
+                    response.status,
+                    text.strip(),
+                    response.headers.get("Retry-After"),
+                )
+        except Exception as e:
+            return RegistrationResponse(0, str(e))
+
+    async def close(self) -> None:
+        """Nothing to release: the session is closed by the client."""
+
+
+class _RawConnection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def alive(self) -> bool:
+        return not self.reader.at_eof() and not self.writer.is_closing()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RawHTTPTransport:
+    """Minimal HTTP/1.1 client for the fire window.
+
+    Requests are written as the ``PreparedRequest.wire`` bytes built during
+    arming. Only the status line, the framing headers and at most
+    ``body_limit`` bytes of the body are parsed; the rest is discarded.
+    Connections are kept in a LIFO pool so the most recently used socket
+    goes out first.
+
+    Attributes:
+        url (URL): API base URL; only its scheme, host and port are used.
+        body_limit (int): Maximum number of body bytes kept per response.
+        stats (ConnectionStats): Opened and reused connection counters.
+    """
+
+    def __init__(self, url: URL, body_limit: int = 4096):
+        """Initialize the transport without opening any connection."""
+        self.url = url
+        self.body_limit = body_limit
+        self.stats = ConnectionStats()
+        self._idle: collections.deque[_RawConnection] = collections.deque()
+        self._ssl: ssl.SSLContext | None = None
+        if url.scheme == "https":
+            # Mirrors ``TCPConnector(ssl=False)`` of the aiohttp transport.
+            self._ssl = ssl.create_default_context()
+            self._ssl.check_hostname = False
+            self._ssl.verify_mode = ssl.CERT_NONE
+        self._ping_wire = (
+            f"HEAD {url.raw_path or '/'} HTTP/1.1\r\n"
+            f"Host: {url.raw_authority}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode()
+
+    async def _open(self) -> _RawConnection:
+        reader, writer = await asyncio.open_connection(
+            self.url.host,
+            self.url.port,
+            ssl=self._ssl,
+            server_hostname=self.url.host if self._ssl else None,
+        )
+        self.stats.opened += 1
+        return _RawConnection(reader, writer)
+
+    async def _acquire(self, trace: RequestTrace | None = None) -> _RawConnection:
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.alive:
+                self.stats.reused += 1
+                if trace is not None:
+                    trace.reused = True
+                return conn
+            conn.close()
+        if trace is None:
+            return await self._open()
+        trace.reused = False
+        trace.connect_start_ns = time.perf_counter_ns()
+        conn = await self._open()
+        trace.connect_end_ns = time.perf_counter_ns()
+        return conn
+
+    async def _exchange(
+        self,
+        conn: _RawConnection,
+        wire: bytes,
+        head: bool = False,
+        trace: RequestTrace | None = None,
+    ) -> _Response:
+        conn.writer.write(wire)
+        if trace is not None:
+            trace.sent_ns = time.perf_counter_ns()
+        response = await asyncio.wait_for(
+            _read_response(conn.reader, head, self.body_limit, trace), _READ_TIMEOUT
+        )
+        if response.keep_alive:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        return response
+
+    async def _refresh(self, conn: _RawConnection) -> bool:
+        try:
+            await self._exchange(conn, self._ping_wire, head=True)
+            return True
+        except (OSError, asyncio.IncompleteReadError, TimeoutError, ValueError):
+            conn.close()
+            return False
+
+    async def warm(self, connections: int) -> tuple[int, int]:
+        """Ping every idle socket and open new ones up to ``connections``."""
+        alive = []
+        while self._idle:
+            idle = self._idle.pop()
+            if idle.alive:
+                alive.append(idle)
+            else:
+                idle.close()
+        results = await asyncio.gather(*(self._refresh(c) for c in alive))
+        reused = sum(results)
+
+        missing = max(0, connections - len(self._idle))
+        opened = await asyncio.gather(
+            *(self._open() for _ in range(missing)), return_exceptions=True
+        )
+        for conn in opened:
+            if isinstance(conn, _RawConnection):
+                self._idle.append(conn)
+            else:
+                logger.debug(f"Raw transport: failed to open a connection: {conn}")
+        return reused, sum(isinstance(c, _RawConnection) for c in opened)
+
+    async def probe(self) -> Probe:
+        """Send a HEAD request over a pooled socket."""
+        conn = None
+        sent = time.perf_counter_ns()
+        try:
+            conn = await self._acquire()
+            sent = time.perf_counter_ns()
+            response = await self._exchange(conn, self._ping_wire, head=True)
+            return Probe(response.status, sent, time.perf_counter_ns(), response.date)
+        except (OSError, asyncio.IncompleteReadError, TimeoutError, ValueError) as e:
+            if conn is not None:
+                conn.close()
+            logger.debug(f"Ping failed: {e}")
+            return Probe(0, sent, time.perf_counter_ns(), None)
+
+    async def send(
+        self, request: PreparedRequest, trace: RequestTrace | None = None
+    ) -> RegistrationResponse:
+        """Write the prebuilt request bytes and parse the response prefix.
+
+        The trace, if given, is stamped when the connection is ready, the
+        bytes are written and the status line arrives.
+        """
+        conn = None
+        try:
+            conn = await self._acquire(trace)
+            response = await self._exchange(conn, request.wire, trace=trace)
+            return RegistrationResponse(
+                response.status,
+                response.body.decode("utf-8", "replace").strip(),
+                response.retry_after,
+            )
+        except (OSError, asyncio.IncompleteReadError, TimeoutError, ValueError) as e:
+            if conn is not None:
+                conn.close()
+            return RegistrationResponse(0, str(e) or type(e).__name__)
+        except BaseException:
+            # Cancelled mid-exchange (e.g. failover to another alternative):
+            # the socket is in an unknown state and must not be pooled.
+            if conn is not None:
+                conn.close()
+            raise
+
+    async def close(self) -> None:
+        """Close every pooled socket."""
+        while self._idle:
+            self._idle.pop().close()
+
+
+async def _read_response(
+    reader: asyncio.StreamReader,
+    head: bool,
+    limit: int,
+    trace: RequestTrace | None = None,
+) -> _Response:
+    """Read one HTTP/1.1 response, keeping at most ``limit`` body bytes."""
+    status_line = await reader.readuntil(b"\r\n")
+    if trace is not None:
+        trace.first_byte_ns = time.perf_counter_ns()
+    status = int(status_line[9:12])
+    keep_alive = status_line.startswith(b"HTTP/1.1")
+    length = None
+    chunked = False
+    date = retry_after = None
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            break
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"transfer-encoding":
+            chunked = b"chunked" in value.lower()
+        elif name == b"connection":
+            keep_alive = value.strip().lower() == b"keep-alive"
+        elif name == b"date":
+            date = value.strip().decode("latin-1")
+        elif name == b"retry-after":
+            retry_after = value.strip().decode("latin-1")
+
+    if head or status in (204, 304) or 100 <= status < 200:
+        return _Response(status, b"", keep_alive, date, retry_after)
+
+    if chunked:
+        buf = bytearray()
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                break
+            chunk = await reader.readexactly(size + 2)
+            if len(buf) < limit:
+                buf += chunk[: min(size, limit - len(buf))]
+        return _Response(status, bytes(buf), keep_alive, date, retry_after)
+
+    if length is not None:
+        body = await reader.readexactly(length)
+        return _Response(status, body[:limit], keep_alive, date, retry_after)
+
+    # No framing: the body runs until the server closes the connection.
+    return _Response(status, await reader.read(limit), False, date, retry_after)
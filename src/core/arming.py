@@ -0,0 +1,129 @@
+"""Arming phase executed before the target instant.
+
+This module provides:
+- WarmPool: logs in early and keeps a set of keep-alive connections open
+  so the first registration request of every subject reuses a warm socket.
+"""
+
+import asyncio
+import contextlib
+
+from loguru import logger
+
+from config.settings import settings
+from src.api.client import WSPAsyncClient
+from src.core.critical import CriticalSection
+from src.core.scheduler import TimeScheduler
+
+
+class WarmPool:
+    """Keeps pooled connections to the WSP host open until launch.
+
+    Attributes:
+        client (WSPAsyncClient): Client whose connection pool is warmed.
+        size (int): Number of keep-alive connections to hold open.
+        interval (float): Seconds between keep-alive bursts.
+
+    Methods:
+        arm() -> None: Logs in if needed, opens the connections and starts
+            the keep-alive loop.
+        verify() -> bool: Stops the keep-alive loop and checks that the
+            connections are still open, reopening any that were dropped.
+        hold(scheduler, target_timestamp, critical) -> None: Waits for the
+            target, verifying the pool ``settings.pool_verify_lead`` seconds
+            before it.
+        close() -> None: Stops the keep-alive loop.
+    """
+
+    def __init__(self, client: WSPAsyncClient, subjects: int = 1):
+        """Initialize the pool.
+
+        Parameters:
+            client: An entered ``WSPAsyncClient``.
+            subjects: Number of subjects in the plan. Used as the pool size
+                unless ``WSP_WARM_CONNECTIONS`` overrides it.
+        """
+        self.client = client
+        self.size = max(1, settings.warm_connections or subjects)
+        self.interval = settings.keepalive_interval
+        self._keepalive_task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        """Arm the pool for the duration of an ``async with`` block."""
+        await self.arm()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Stop the keep-alive loop."""
+        await self.close()
+
+    async def _burst(self) -> tuple[int, int]:
+        """Open or refresh ``size`` connections of the client's transport.
+
+        Returns:
+            A tuple of (reused, opened) connection counts.
+        """
+        if not self.client.transport:
+            raise Exception("Session not initialized. Use async context manager.")
+        return await self.client.transport.warm(self.size)
+
+    async def _keepalive_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            reused, opened = await self._burst()
+            if opened:
+                logger.debug(f"Keep-alive: reopened {opened} dropped connection(s).")
+
+    async def arm(self) -> None:
+        """Log in and open the keep-alive connections ahead of the target."""
+        if not self.client.user_id:
+            await self.client.login()
+        _, opened = await self._burst()
+        logger.info(f"Connection pool armed: {opened} new of {self.size} sockets.")
+        if self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def verify(self) -> bool:
+        """Check the pool right before firing.
+
+        Returns:
+            True if every connection was still open and got reused.
+        """
+        await self.close()
+        reused, opened = await self._burst()
+        if opened:
+            logger.warning(
+                f"Connection pool: {opened} socket(s) had been dropped and were "
+                f"reopened ({reused} reused)."
+            )
+        else:
+            logger.info(f"Connection pool verified: {reused}/{self.size} warm.")
+        return opened == 0
+
+    async def hold(
+        self,
+        scheduler: TimeScheduler,
+        target_timestamp: float,
+        critical: CriticalSection | None = None,
+    ) -> None:
+        """Wait for the target, verifying the pool just before it.
+
+        ``critical`` is entered once the pool is verified; the caller exits
+        it after the attack.
+        """
+        verify_at = target_timestamp - settings.pool_verify_lead
+        if scheduler.get_corrected_time() < verify_at:
+            await scheduler.wait_until_target(verify_at)
+        await self.verify()
+        if critical:
+            critical.enter()
+        await scheduler.wait_until_target(target_timestamp)
+
+    async def close(self) -> None:
+        """Stop the keep-alive loop."""
+        if self._keepalive_task is None:
+            return
+        self._keepalive_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._keepalive_task
+        self._keepalive_task = None
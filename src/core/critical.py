@@ -0,0 +1,150 @@
+"""Runtime tuning of the process around the target instant.
+
+This module provides:
+- CriticalSection: freezes the garbage collector and optionally pins the
+  event loop thread to a CPU and raises its priority, restoring everything
+  afterwards.
+- event_loop_factory: ``asyncio.run`` loop factory selecting uvloop when
+  ``WSP_UVLOOP`` is set and uvloop is installed.
+"""
+
+import asyncio
+import gc
+import os
+import time
+from collections.abc import Callable
+
+from loguru import logger
+
+from config.settings import settings
+
+
+class CriticalSection:
+    """Keeps the process quiet while requests are being fired.
+
+    ``enter`` moves every tracked object into the permanent generation with
+    ``gc.freeze`` and disables the collector, so no collection pause can land
+    in the fire window. It deliberately skips a full collection first: on a
+    large heap that would itself stall the loop right before launch. On Linux
+    it also pins the calling thread, the one running the event loop, to
+    ``cpu`` and sets its nice value to ``priority``. ``exit`` undoes every
+    step that succeeded; both calls are idempotent.
+
+    Attributes:
+        cpu (int | None): CPU to pin the loop thread to, None to leave it.
+        priority (int | None): Nice value to apply (negative raises the
+            priority and needs ``CAP_SYS_NICE``), None to leave it.
+        active (bool): Whether the section is entered.
+
+    Methods:
+        from_settings() -> CriticalSection | None: Section configured by
+            ``WSP_CRITICAL_*``, None if disabled.
+        enter() -> None: Applies the tuning.
+        exit() -> None: Restores the previous state.
+    """
+
+    def __init__(self, cpu: int | None = None, priority: int | None = None):
+        """Initialize a section that is not entered yet."""
+        self.cpu = cpu
+        self.priority = priority
+        self.active = False
+        self._gc_enabled = False
+        self._affinity: set[int] | None = None
+        self._nice: int | None = None
+        self._entered_ns = 0
+
+    @classmethod
+    def from_settings(cls) -> "CriticalSection | None":
+        """Build the section configured by ``WSP_CRITICAL_*``, None if disabled."""
+        if not settings.critical_section:
+            return None
+        return cls(settings.critical_cpu, settings.critical_nice)
+
+    def __enter__(self):
+        """Enter the section for the duration of a ``with`` block."""
+        self.enter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Restore the previous state."""
+        self.exit()
+
+    def enter(self) -> None:
+        """Freeze the collector, then pin and prioritize the loop thread."""
+        if self.active:
+            return
+        self.active = True
+        gc.freeze()
+        self._gc_enabled = gc.isenabled()
+        gc.disable()
+        applied = [f"GC frozen ({gc.get_freeze_count()} objects)"]
+        if self.cpu is not None and self._pin(self.cpu):
+            applied.append(f"pinned to CPU {self.cpu}")
+        if self.priority is not None and self._prioritize(self.priority):
+            applied.append(f"nice {self.priority}")
+        self._entered_ns = time.perf_counter_ns()
+        logger.info(f"Critical section entered: {', '.join(applied)}.")
+
+    def exit(self) -> None:
+        """Restore the collector, CPU affinity and priority."""
+        if not self.active:
+            return
+        self.active = False
+        if self._nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, self._nice)
+            except PermissionError:
+                logger.warning(f"Could not restore nice {self._nice}.")
+            self._nice = None
+        if self._affinity is not None:
+            os.sched_setaffinity(0, self._affinity)
+            self._affinity = None
+        gc.unfreeze()
+        if self._gc_enabled:
+            gc.enable()
+        held = (time.perf_counter_ns() - self._entered_ns) / 1e9
+        logger.info(f"Critical section left after {held:.2f}s.")
+
+    def _pin(self, cpu: int) -> bool:
+        if not hasattr(os, "sched_setaffinity"):
+            logger.warning("CPU pinning is not supported on this platform.")
+            return False
+        allowed = os.sched_getaffinity(0)
+        if cpu not in allowed:
+            logger.warning(f"CPU {cpu} is not available (allowed: {sorted(allowed)}).")
+            return False
+        os.sched_setaffinity(0, {cpu})
+        self._affinity = allowed
+        return True
+
+    def _prioritize(self, nice: int) -> bool:
+        if not hasattr(os, "setpriority"):
+            logger.warning("Priority changes are not supported on this platform.")
+            return False
+        current = os.getpriority(os.PRIO_PROCESS, 0)
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+        except PermissionError:
+            logger.warning(
+                f"Could not set nice {nice} (current {current}): raising the "
+                "priority needs root or CAP_SYS_NICE."
+            )
+            return False
+        self._nice = current
+        return True
+
+
+def event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Loop factory for ``asyncio.run``, None for the default loop.
+
+    The loop of a running program cannot be replaced, so uvloop is chosen
+    here, at startup, rather than when the critical section is entered.
+    """
+    if not settings.uvloop:
+        return None
+    try:
+        import uvloop  # type: ignore[import-not-found]
+    except ImportError:
+        logger.warning("WSP_UVLOOP is set but uvloop is not installed.")
+        return None
+    return uvloop.new_event_loop
@@ -0,0 +1,84 @@
+"""Dispatch schedule of the first registration attempts.
+
+This module provides:
+- DISPATCH_STRATEGIES: names accepted by ``WSP_DISPATCH_STRATEGY``.
+- fire_offsets: per-subject fire offsets for a strategy.
+- DispatchRecord: planned and actual fire offset of one subject.
+- log_dispatch_report: logs planned vs actual offsets after an attack.
+"""
+
+from dataclasses import dataclass
+
+from loguru import logger
+
+DISPATCH_STRATEGIES = ("stagger", "burst", "spread", "priority")
+
+
+def fire_offsets(
+    count: int, strategy: str, delay: float, window: float
+) -> tuple[float, ...]:
+    """Compute fire offsets, in seconds after launch, for ``count`` subjects.
+
+    Parameters:
+        count: Number of subjects, already in firing order.
+        strategy: ``stagger`` spaces subjects by ``delay``, ``burst`` fires
+            everything at once, ``spread`` and ``priority`` distribute
+            subjects evenly over ``window`` (``priority`` only differs in the
+            order the caller sorted the subjects in).
+        delay: Spacing used by ``stagger``.
+        window: Width of the ``spread`` and ``priority`` window.
+
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    if strategy == "stagger":
+        return tuple(i * delay for i in range(count))
+    if strategy == "burst":
+        return (0.0,) * count
+    if strategy in ("spread", "priority"):
+        step = window / (count - 1) if count > 1 else 0.0
+        return tuple(i * step for i in range(count))
+    raise ValueError(f"Unknown dispatch strategy: {strategy}")
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchRecord:
+    """First attempt of one subject.
+
+    Attributes:
+        subject_id: Subject the request belongs to.
+        planned: Planned fire offset, in seconds after launch.
+        actual: Offset at which the first request was handed to the client.
+        outcome: Outcome of the subject's last attempt.
+        alternative: 1-based rank of the payload the last attempt used.
+    """
+
+    subject_id: int
+    planned: float
+    actual: float
+    outcome: str
+    alternative: int = 1
+
+    @property
+    def lateness(self) -> float:
+        """Seconds the subject fired after its planned offset."""
+        return self.actual - self.planned
+
+
+def log_dispatch_report(strategy: str, records: list[DispatchRecord]) -> None:
+    """Log planned vs actual fire offsets, in firing order."""
+    if not records:
+        return
+    logger.info(f"Dispatch report ({strategy}):")
+    for record in sorted(records, key=lambda r: r.planned):
+        logger.info(
+            f"  Subj {record.subject_id}: planned +{record.planned * 1000:.1f}ms, "
+            f"fired +{record.actual * 1000:.1f}ms "
+            f"(late {record.lateness * 1000:.2f}ms) -> {record.outcome}"
+            + (f" [alt #{record.alternative}]" if record.alternative > 1 else "")
+        )
+    worst = max(records, key=lambda r: r.lateness)
+    logger.info(
+        f"Worst dispatch lateness: {worst.lateness * 1000:.2f}ms "
+        f"(Subj {worst.subject_id})"
+    )
@@ -0,0 +1,144 @@
+"""Fire-window logging of registration attempts.
+
+This module provides:
+- AttemptLog: preallocated buffer of compact attempt records with
+  rate-limited console summaries, written out in full after the burst.
+"""
+
+import time
+from array import array
+from collections import Counter
+
+from loguru import logger
+
+from config.settings import settings
+from src.core.retry import Outcome
+
+_OUTCOMES = tuple(Outcome)
+_OUTCOME_CODES = {outcome: code for code, outcome in enumerate(_OUTCOMES)}
+
+
+def _breakdown(counts: Counter) -> str:
+    return ", ".join(f"{outcome.value} {n}" for outcome, n in counts.most_common())
+
+
+class AttemptLog:
+    """Attempt records kept off the console while requests are being fired.
+
+    ``record`` only stores integers into arrays sized up front, so an attempt
+    costs no string formatting and no sink I/O. At most one summary line per
+    ``interval`` is logged during the burst; ``flush`` then logs every
+    stored attempt with the same structured fields as the verbose mode.
+
+    Attributes:
+        capacity (int): Number of attempts stored; later ones are only
+            counted.
+        interval (float): Minimum seconds between two summary lines.
+        count (int): Attempts recorded since the last flush.
+
+    Methods:
+        from_settings() -> AttemptLog | None: Buffer configured by
+            ``WSP_FIRE_LOG_*``, None in verbose mode.
+        record(subject_id, attempt, status, outcome, sent_ns, done_ns) -> None:
+            Stores one attempt.
+        flush() -> None: Logs the stored attempts and a final summary.
+    """
+
+    def __init__(self, capacity: int, interval: float):
+        """Preallocate the buffer."""
+        self.capacity = max(1, capacity)
+        self.interval = interval
+        self.count = 0
+        self._subject = array("q", [0]) * self.capacity
+        self._attempt = array("l", [0]) * self.capacity
+        self._status = array("l", [0]) * self.capacity
+        self._outcome = array("b", [0]) * self.capacity
+        self._sent = array("q", [0]) * self.capacity
+        self._latency = array("q", [0]) * self.capacity
+        self._totals: Counter[Outcome] = Counter()
+        self._window: Counter[Outcome] = Counter()
+        self._origin_ns = time.perf_counter_ns()
+        self._origin_wall = time.time()
+        self._interval_ns = int(interval * 1e9)
+        self._next_summary_ns = self._origin_ns + self._interval_ns
+
+    @classmethod
+    def from_settings(cls) -> "AttemptLog | None":
+        """Build the buffer configured by ``WSP_FIRE_LOG_*``, None if verbose."""
+        if settings.fire_log_mode != "buffered":
+            return None
+        return cls(settings.fire_log_buffer, settings.fire_log_interval)
+
+    def record(
+        self,
+        subject_id: int,
+        attempt: int,
+        status: int,
+        outcome: Outcome,
+        sent_ns: int,
+        done_ns: int,
+    ) -> None:
+        """Store one attempt; logs a summary if ``interval`` has elapsed.
+
+        Parameters:
+            subject_id: Subject the request belongs to.
+            attempt: 1-based attempt number of the subject.
+            status: HTTP status code, 0 on a network error.
+            outcome: Classification of the response.
+            sent_ns: ``perf_counter_ns`` before the request was handed over.
+            done_ns: ``perf_counter_ns`` once the response was read.
+        """
+        i = self.count
+        self.count = i + 1
+        self._window[outcome] += 1
+        if i < self.capacity:
+            self._subject[i] = subject_id
+            self._attempt[i] = attempt
+            self._status[i] = status
+            self._outcome[i] = _OUTCOME_CODES[outcome]
+            self._sent[i] = sent_ns
+            self._latency[i] = done_ns - sent_ns
+        if self.interval > 0 and done_ns >= self._next_summary_ns:
+            self._summarize(done_ns)
+
+    def _summarize(self, now_ns: int) -> None:
+        logger.info(
+            f"🔥 {self._window.total()} attempt(s) in the last "
+            f"{self.interval:.1f}s: {_breakdown(self._window)} "
+            f"({self.count} total)"
+        )
+        self._totals.update(self._window)
+        self._window.clear()
+        self._next_summary_ns = now_ns + self._interval_ns
+
+    def flush(self) -> None:
+        """Log every stored attempt, then a summary of the whole burst."""
+        if not self.count:
+            return
+        for i in range(min(self.count, self.capacity)):
+            subject_id = self._subject[i]
+            attempt = self._attempt[i]
+            status = self._status[i]
+            outcome = _OUTCOMES[self._outcome[i]].value
+            latency_ms = self._latency[i] / 1e6
+            sent = self._origin_wall + (self._sent[i] - self._origin_ns) / 1e9
+            logger.bind(
+                event="attempt",
+                subject_id=subject_id,
+                attempt=attempt,
+                status=status,
+                outcome=outcome,
+                latency_ms=latency_ms,
+            ).debug(
+                f"Subj {subject_id}: attempt #{attempt} -> {status} ({outcome}) "
+                f"in {latency_ms:.1f}ms @ {sent:.6f}"
+            )
+        self._totals.update(self._window)
+        dropped = self.count - self.capacity
+        logger.info(
+            f"Fire window: {self.count} attempt(s): {_breakdown(self._totals)}"
+            + (f" ({dropped} not stored, buffer full)" if dropped > 0 else "")
+        )
+        self.count = 0
+        self._totals.clear()
+        self._window.clear()
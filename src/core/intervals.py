@@ -0,0 +1,178 @@
+"""Time-clash index of the lessons selected in a plan.
+
+This module provides:
+- LessonSlot: a selected lesson placed on its day.
+- IntervalIndex: per-``weekDay`` sorted intervals with incremental insert,
+  remove and conflict queries.
+- lessons_by_id: picks lessons out of a ``get_schedule`` payload.
+"""
+
+import bisect
+from typing import Any, NamedTuple
+
+from src.utils.storage import plan_alternatives
+
+
+class LessonSlot(NamedTuple):
+    """A selected lesson, ordered by its begin time within a day."""
+
+    begin: float
+    end: float
+    lesson_id: int
+    subject_id: int
+    day: str
+
+
+class IntervalIndex:
+    """Selected lessons of a plan, indexed by day and begin time.
+
+    Each day keeps its slots sorted by begin time together with the longest
+    slot ever inserted, so a conflict query only bisects to the window of
+    slots starting less than that length before the queried lesson instead
+    of scanning the plan.
+
+    Attributes:
+        subjects (dict[int, list[LessonSlot]]): Slots indexed per subject.
+
+    Methods:
+        from_plan(plan, schedules) -> IntervalIndex: Indexes the preferred
+            alternative of every planned subject whose schedule is known.
+        insert(subject_id, lesson) -> LessonSlot | None: Indexes a lesson.
+        remove(lesson_id) -> None: Drops a lesson from the index.
+        replace_subject(subject_id, lessons) -> None: Re-indexes a subject.
+        conflicts(lesson, exclude_subject) -> list[LessonSlot]: Indexed slots
+            overlapping a lesson.
+        clashes() -> list[tuple[LessonSlot, LessonSlot]]: Every overlapping
+            pair of slots belonging to different subjects.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.subjects: dict[int, list[LessonSlot]] = {}
+        self._days: dict[str, list[LessonSlot]] = {}
+        self._longest: dict[str, float] = {}
+        self._lessons: dict[int, LessonSlot] = {}
+
+    @classmethod
+    def from_plan(
+        cls, plan: dict[int, list], schedules: dict[int, dict[str, Any]]
+    ) -> "IntervalIndex":
+        """Index the preferred alternative of every planned subject.
+
+        Parameters:
+            plan: Registration plan, as stored by ``save_plan_to_disk``.
+            schedules: ``get_schedule`` payloads; subjects without one are
+                skipped.
+        """
+        index = cls()
+        for subject_id, entry in plan.items():
+            alternatives = plan_alternatives(entry)
+            if subject_id in schedules and alternatives:
+                index.replace_subject(
+                    subject_id,
+                    lessons_by_id(schedules[subject_id], alternatives[0]),
+                )
+        return index
+
+    def __contains__(self, lesson_id: int) -> bool:
+        return lesson_id in self._lessons
+
+    def __len__(self) -> int:
+        return len(self._lessons)
+
+    @staticmethod
+    def _slot(subject_id: int, lesson: dict[str, Any]) -> LessonSlot | None:
+        begin, end = lesson.get("beginTime"), lesson.get("endTime")
+        if begin is None or end is None:
+            return None
+        return LessonSlot(
+            float(begin),
+            float(end),
+            lesson["id"],
+            subject_id,
+            str(lesson.get("weekDay")),
+        )
+
+    def insert(self, subject_id: int, lesson: dict[str, Any]) -> LessonSlot | None:
+        """Index a lesson, replacing a previous entry with the same ID.
+
+        Returns:
+            The indexed slot, or None if the lesson has no time.
+        """
+        self.remove(lesson["id"])
+        slot = self._slot(subject_id, lesson)
+        if slot is None:
+            return None
+        bisect.insort(self._days.setdefault(slot.day, []), slot)
+        self._longest[slot.day] = max(
+            self._longest.get(slot.day, 0.0), slot.end - slot.begin
+        )
+        self._lessons[slot.lesson_id] = slot
+        self.subjects.setdefault(subject_id, []).append(slot)
+        return slot
+
+    def remove(self, lesson_id: int) -> None:
+        """Drop a lesson from the index; unknown IDs are ignored."""
+        slot = self._lessons.pop(lesson_id, None)
+        if slot is None:
+            return
+        day = self._days[slot.day]
+        del day[bisect.bisect_left(day, slot)]
+        subject = self.subjects[slot.subject_id]
+        subject.remove(slot)
+        if not subject:
+            del self.subjects[slot.subject_id]
+
+    def replace_subject(self, subject_id: int, lessons: list[dict[str, Any]]) -> None:
+        """Replace the indexed lessons of a subject."""
+        for slot in list(self.subjects.get(subject_id, [])):
+            self.remove(slot.lesson_id)
+        for lesson in lessons:
+            self.insert(subject_id, lesson)
+
+    def _overlapping(self, day: str, begin: float, end: float) -> list[LessonSlot]:
+        slots = self._days.get(day)
+        if not slots:
+            return []
+        low = bisect.bisect_left(slots, (begin - self._longest[day],))
+        high = bisect.bisect_left(slots, (end,))
+        return [s for s in slots[low:high] if s.end > begin]
+
+    def conflicts(
+        self, lesson: dict[str, Any], exclude_subject: int | None = None
+    ) -> list[LessonSlot]:
+        """Return the indexed slots overlapping a lesson.
+
+        Parameters:
+            lesson: Lesson from a ``get_schedule`` payload.
+            exclude_subject: Ignore slots of this subject, typically the one
+                being edited.
+        """
+        slot = self._slot(-1, lesson)
+        if slot is None:
+            return []
+        return [
+            s
+            for s in self._overlapping(slot.day, slot.begin, slot.end)
+            if s.lesson_id != slot.lesson_id and s.subject_id != exclude_subject
+        ]
+
+    def clashes(self) -> list[tuple[LessonSlot, LessonSlot]]:
+        """Return every overlapping pair of slots of different subjects."""
+        pairs = []
+        for slots in self._days.values():
+            for i, slot in enumerate(slots):
+                for other in slots[i + 1 :]:
+                    if other.begin >= slot.end:
+                        break
+                    if other.subject_id != slot.subject_id:
+                        pairs.append((slot, other))
+        return pairs
+
+
+def lessons_by_id(
+    schedule_data: dict[str, Any], lesson_ids: list[int]
+) -> list[dict[str, Any]]:
+    """Return the lessons of a ``get_schedule`` payload with the given IDs."""
+    wanted = set(lesson_ids)
+    return [s for s in schedule_data.get("SCHEDULES", []) if s.get("id") in wanted]
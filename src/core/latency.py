@@ -0,0 +1,181 @@
+"""Network-latency-aware launch timing.
+
+This module provides:
+- LatencyProfile: measured round-trip times, the launch lead derived from
+  them and the server clock offset estimated from ``Date`` headers.
+- ArrivalCalibrator: probes the WSP host over the warm pool and builds a
+  LatencyProfile.
+- plan_launch: shifts a target instant so requests *arrive* at it.
+"""
+
+import asyncio
+import statistics
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+from loguru import logger
+
+from config.settings import settings
+from src.api.client import WSPAsyncClient
+from src.core.scheduler import TimeScheduler
+
+_MAX_LEAD = 1.0
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Result of an arrival calibration.
+
+    Attributes:
+        rtts: Round-trip times of the successful probes, in seconds.
+        lead: Seconds to fire before the target so the request arrives on it.
+        percentile: Percentile of the one-way latency used as the lead.
+        server_offset: Server clock minus corrected local clock, in seconds,
+            or None if no usable ``Date`` header was seen.
+        server_offset_error: Half-width of the server offset interval.
+    """
+
+    rtts: tuple[float, ...]
+    lead: float
+    percentile: float
+    server_offset: float | None
+    server_offset_error: float
+
+    def launch_time(self, target_timestamp: float, server_clock: bool = False) -> float:
+        """Return the corrected local instant at which to fire.
+
+        Parameters:
+            target_timestamp: Instant the requests should reach the server.
+            server_clock: Interpret the target on the server's clock.
+        """
+        launch = target_timestamp - self.lead
+        if server_clock and self.server_offset is not None:
+            launch -= self.server_offset
+        return launch
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    if len(samples) < 2:
+        return samples[0]
+    cuts = statistics.quantiles(samples, n=1000, method="inclusive")
+    index = min(len(cuts) - 1, max(0, round(percentile * 10) - 1))
+    return cuts[index]
+
+
+def _parse_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class ArrivalCalibrator:
+    """Measures the path to the WSP host right before launch.
+
+    Probes are spaced by a non-integer fraction of a second so their
+    ``Date`` headers, which only have one-second resolution, sample
+    different phases of the server clock and narrow its offset down.
+
+    Attributes:
+        client (WSPAsyncClient): Client with an armed connection pool.
+        scheduler (TimeScheduler): Source of corrected local time.
+        samples (int): Number of probes to send.
+        spacing (float): Seconds between probes.
+        percentile (float): Percentile of the one-way latency to lead by.
+
+    Methods:
+        calibrate() -> LatencyProfile: Sends the probes and logs the result.
+    """
+
+    def __init__(self, client: WSPAsyncClient, scheduler: TimeScheduler):
+        """Initialize the calibrator with values from settings."""
+        self.client = client
+        self.scheduler = scheduler
+        self.samples = max(1, settings.latency_samples)
+        self.spacing = settings.latency_probe_spacing
+        self.percentile = min(100.0, max(0.0, settings.arrival_percentile))
+
+    async def calibrate(self) -> LatencyProfile:
+        """Probe the host and derive the launch lead.
+
+        Raises:
+            Exception: If the client is not entered or every probe failed.
+        """
+        if not self.client.transport:
+            raise Exception("Session not initialized. Use async context manager.")
+
+        rtts = []
+        low, high = float("-inf"), float("inf")
+        for i in range(self.samples):
+            if i:
+                await asyncio.sleep(self.spacing)
+            probe = await self.client.transport.probe()
+            if not probe.status:
+                continue
+            rtts.append(probe.rtt)
+            date = _parse_date(probe.date)
+            if date is None:
+                continue
+            # The server stamped the response somewhere between our send and
+            # receive instants, at a clock reading within [date, date + 1).
+            low = max(low, date - self.scheduler.time_at(probe.received_ns))
+            high = min(high, date + 1 - self.scheduler.time_at(probe.sent_ns))
+
+        if not rtts:
+            raise Exception("Latency calibration failed: no probe succeeded.")
+
+        if low <= high:
+            server_offset, offset_error = (low + high) / 2, (high - low) / 2
+        else:
+            server_offset, offset_error = None, 0.0
+
+        lead = min(_MAX_LEAD, _percentile(rtts, self.percentile) / 2)
+        profile = LatencyProfile(
+            tuple(rtts), lead, self.percentile, server_offset, offset_error
+        )
+        self._log(profile)
+        return profile
+
+    def _log(self, profile: LatencyProfile) -> None:
+        rtts = sorted(profile.rtts)
+        logger.info(
+            f"RTT over {len(rtts)} probe(s): min {rtts[0] * 1000:.2f}ms, "
+            f"median {statistics.median(rtts) * 1000:.2f}ms, "
+            f"max {rtts[-1] * 1000:.2f}ms"
+        )
+        if profile.server_offset is None:
+            logger.info("Server clock: no usable Date headers.")
+        else:
+            logger.info(
+                f"Server clock offset: {profile.server_offset * 1000:+.0f}ms "
+                f"± {profile.server_offset_error * 1000:.0f}ms"
+            )
+        logger.info(
+            f"Launch lead: {profile.lead * 1000:.2f}ms "
+            f"(p{profile.percentile:g} of one-way latency)"
+        )
+
+
+async def plan_launch(
+    client: WSPAsyncClient, scheduler: TimeScheduler, target_timestamp: float
+) -> float:
+    """Return the instant to fire at so requests arrive at the target.
+
+    Returns ``target_timestamp`` unchanged when arrival targeting is disabled
+    or the calibration fails. The target is also recorded in the client's
+    request trace, if tracing is enabled.
+    """
+    launch = target_timestamp
+    if settings.arrival_targeting:
+        try:
+            profile = await ArrivalCalibrator(client, scheduler).calibrate()
+            launch = profile.launch_time(
+                target_timestamp, settings.arrival_server_clock
+            )
+        except Exception as e:
+            logger.warning(f"{e} Firing at the local target.")
+    if client.tracer:
+        client.tracer.begin_run(target_timestamp, launch, scheduler.time_offset)
+    return launch
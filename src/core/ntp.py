@@ -0,0 +1,226 @@
+"""Asynchronous multi-server NTP sampling.
+
+This module provides:
+- NTPSample: offset and round-trip delay of a single NTP exchange.
+- NTPEstimate: combined clock offset with its confidence interval.
+- NTP_PACKET, to_ntp_timestamp, from_ntp_timestamp: SNTP wire format helpers.
+- AsyncNTPClient: queries several servers in parallel over UDP and filters
+  samples by round-trip delay.
+"""
+
+import asyncio
+import socket
+import statistics
+import struct
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+
+from config.settings import settings
+
+NTP_EPOCH_DELTA = 2_208_988_800  # Seconds between 1900-01-01 and 1970-01-01.
+# LI/VN/Mode, stratum, poll, precision, then eleven 32-bit words: root delay,
+# root dispersion, reference ID and the reference, originate, receive and
+# transmit timestamps as (seconds, fraction) pairs.
+NTP_PACKET = struct.Struct("!B B b b 11I")
+
+
+def to_ntp_timestamp(timestamp: float) -> tuple[int, int]:
+    """Convert a UNIX timestamp into NTP (seconds, fraction) words."""
+    ntp = timestamp + NTP_EPOCH_DELTA
+    seconds = int(ntp)
+    return seconds, int((ntp - seconds) * 2**32) & 0xFFFFFFFF
+
+
+def from_ntp_timestamp(seconds: int, fraction: int) -> float:
+    """Convert NTP (seconds, fraction) words into a UNIX timestamp."""
+    return seconds - NTP_EPOCH_DELTA + fraction / 2**32
+
+
+@dataclass(frozen=True)
+class NTPSample:
+    """Result of one client/server exchange.
+
+    Attributes:
+        server: Server that answered.
+        offset: Server clock minus local clock, in seconds.
+        delay: Round-trip delay minus server processing time, in seconds.
+    """
+
+    server: str
+    offset: float
+    delay: float
+
+
+@dataclass(frozen=True)
+class NTPEstimate:
+    """Combined offset of the local clock.
+
+    The true offset lies within ``offset ± error`` assuming symmetric paths.
+
+    Attributes:
+        offset: Estimated server clock minus local clock, in seconds.
+        error: Half-width of the confidence interval, in seconds.
+        delay: Round-trip delay of the best sample, in seconds.
+        servers: Servers whose samples survived filtering.
+        samples: Total number of valid samples collected.
+    """
+
+    offset: float
+    error: float
+    delay: float
+    servers: tuple[str, ...]
+    samples: int
+
+
+class _ExchangeProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.reply: asyncio.Future[tuple[bytes, int]] = (
+            asyncio.get_running_loop().create_future()
+        )
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        if not self.reply.done():
+            self.reply.set_result((data, time.perf_counter_ns()))
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.reply.done():
+            self.reply.set_exception(exc)
+
+
+class AsyncNTPClient:
+    """Parallel SNTP client with a minimum-delay clock filter.
+
+    Attributes:
+        servers (list[str]): ``host`` or ``host:port`` entries to query.
+        samples (int): Exchanges performed per server.
+        timeout (float): Seconds to wait for each reply.
+
+    Methods:
+        query(server) -> NTPSample: Performs a single exchange.
+        estimate() -> NTPEstimate: Samples every server and combines them.
+    """
+
+    def __init__(
+        self,
+        servers: list[str] | None = None,
+        samples: int | None = None,
+        timeout: float | None = None,
+    ):
+        """Initialize the client, defaulting to the values from settings."""
+        self.servers = servers or settings.ntp_servers
+        self.samples = max(1, samples or settings.ntp_samples)
+        self.timeout = timeout or settings.ntp_timeout
+
+    @staticmethod
+    def _address(server: str) -> tuple[str, int]:
+        host, sep, port = server.rpartition(":")
+        if sep and port.isdigit() and ":" not in host:
+            return host, int(port)
+        return server, 123
+
+    async def _resolve(self, server: str) -> tuple[str, int]:
+        host, port = self._address(server)
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM
+        )
+        # AF_INET socket addresses are (host, port) pairs.
+        address, resolved_port = infos[0][4][:2]
+        return str(address), int(resolved_port)
+
+    async def query(
+        self, server: str, address: tuple[str, int] | None = None
+    ) -> NTPSample:
+        """Perform a single NTP exchange with ``server``.
+
+        Parameters:
+            server: Server name used in the sample and in log messages.
+            address: Already resolved ``(ip, port)``; resolved when omitted.
+
+        Raises:
+            TimeoutError: If no reply arrives within ``timeout``.
+            ValueError: If the reply is malformed or a kiss-of-death.
+        """
+        loop = asyncio.get_running_loop()
+        address = address or await self._resolve(server)
+        transport, protocol = await loop.create_datagram_endpoint(
+            _ExchangeProtocol, remote_addr=address
+        )
+        try:
+            sent_wall = time.time()
+            sent_ns = time.perf_counter_ns()
+            tx_sec, tx_frac = to_ntp_timestamp(sent_wall)
+            request = NTP_PACKET.pack(0x23, 0, 0, 0, *([0] * 9), tx_sec, tx_frac)
+            transport.sendto(request)
+            data, received_ns = await asyncio.wait_for(protocol.reply, self.timeout)
+        finally:
+            transport.close()
+
+        if len(data) < NTP_PACKET.size:
+            raise ValueError(f"Short NTP reply from {server}.")
+        fields = NTP_PACKET.unpack(data[: NTP_PACKET.size])
+        mode, stratum = fields[0] & 0x7, fields[1]
+        orig_sec, orig_frac = fields[9], fields[10]
+        if mode != 4 or stratum == 0 or (orig_sec, orig_frac) != (tx_sec, tx_frac):
+            raise ValueError(f"Rejected NTP reply from {server}.")
+
+        # Local receive time is derived from the monotonic clock so a wall
+        # clock step during the exchange cannot corrupt the sample.
+        t1 = sent_wall
+        t4 = sent_wall + (received_ns - sent_ns) / 1e9
+        t2 = from_ntp_timestamp(fields[11], fields[12])
+        t3 = from_ntp_timestamp(fields[13], fields[14])
+        offset = ((t2 - t1) + (t3 - t4)) / 2
+        delay = max(0.0, (t4 - t1) - (t3 - t2))
+        return NTPSample(server, offset, delay)
+
+    async def _sample_server(self, server: str) -> list[NTPSample]:
+        # Resolve once so pool names do not spread samples across hosts.
+        try:
+            address = await self._resolve(server)
+        except OSError as e:
+            logger.debug(f"NTP server {server} did not resolve: {e}")
+            return []
+        samples = []
+        for _ in range(self.samples):
+            try:
+                samples.append(await self.query(server, address))
+            except (OSError, TimeoutError, ValueError) as e:
+                logger.debug(f"NTP query to {server} failed: {e}")
+        return samples
+
+    async def estimate(self) -> NTPEstimate:
+        """Sample every server in parallel and combine the results.
+
+        Each server is represented by its lowest-delay sample. Servers whose
+        best delay is far above the best overall are dropped, and the
+        remaining ``offset ± delay / 2`` intervals are intersected.
+
+        Raises:
+            TimeoutError: If no server produced a valid sample.
+        """
+        results = await asyncio.gather(*(self._sample_server(s) for s in self.servers))
+        total = sum(len(r) for r in results)
+        best = [min(r, key=lambda s: s.delay) for r in results if r]
+        if not best:
+            raise TimeoutError("No NTP server answered")
+
+        min_delay = min(s.delay for s in best)
+        survivors = [s for s in best if s.delay <= 2 * min_delay + 0.005]
+
+        low = max(s.offset - s.delay / 2 for s in survivors)
+        high = min(s.offset + s.delay / 2 for s in survivors)
+        if low <= high:
+            offset, error = (low + high) / 2, (high - low) / 2
+        else:
+            offset = statistics.median(s.offset for s in survivors)
+            error = max(abs(s.offset - offset) + s.delay / 2 for s in survivors)
+
+        return NTPEstimate(
+            offset=offset,
+            error=error,
+            delay=min_delay,
+            servers=tuple(s.server for s in survivors),
+            samples=total,
+        )
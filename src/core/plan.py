@@ -0,0 +1,92 @@
+"""Compilation of a registration plan into a fire plan.
+
+This module provides:
+- CompiledPlan: immutable per-subject requests and their fire offsets,
+  built during arming.
+- compile_plan: turns ``saved_plan.json`` data into a CompiledPlan.
+"""
+
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+
+from config.settings import settings
+from src.api.client import WSPAsyncClient
+from src.api.prepared import PreparedRequest
+from src.core.dispatch import fire_offsets
+from src.core.priority import SubjectPriority
+from src.utils.storage import plan_alternatives
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPlan:
+    """Registration requests ready to be sent as-is at fire time.
+
+    Attributes:
+        requests: Preferred request of each subject, in firing order.
+        fallbacks: Ranked alternative requests of each subject, tried in
+            order when the previous choice turns out to be full.
+        offsets: Fire offset of each request, in seconds after launch.
+        strategy: Dispatch strategy the offsets were computed with.
+        weights: Request budget weight of each request.
+        compile_seconds: Time spent building the requests.
+    """
+
+    requests: tuple[PreparedRequest, ...]
+    fallbacks: tuple[tuple[PreparedRequest, ...], ...]
+    offsets: tuple[float, ...]
+    strategy: str
+    weights: tuple[float, ...]
+    compile_seconds: float
+
+    def __len__(self) -> int:
+        """Return the number of subjects in the plan."""
+        return len(self.requests)
+
+
+def compile_plan(
+    client: WSPAsyncClient,
+    registration_plan: dict[int, list],
+    priorities: list[SubjectPriority] | None = None,
+) -> CompiledPlan:
+    """Build every save request of the plan and its dispatch schedule.
+
+    Parameters:
+        client: A logged-in client; its base URL and user ID are baked in.
+        registration_plan: Mapping from subject IDs to lesson IDs or to a
+            ranked list of alternative lesson ID lists.
+        priorities: Scarcity scores from ``prioritize``. The ``priority``
+            strategy fires higher scores first and the scores weight each
+            subject's share of the request budget.
+
+    Returns:
+        The compiled plan.
+    """
+    started = time.perf_counter()
+    strategy = settings.dispatch_strategy
+    ranked = {p.subject_id: p for p in priorities or []}
+    subject_ids = list(registration_plan)
+    if strategy == "priority":
+        subject_ids.sort(key=lambda sid: -ranked[sid].score if sid in ranked else 0.0)
+    compiled = [
+        tuple(
+            client.prepare_registration(subject_id, payload)
+            for payload in plan_alternatives(registration_plan[subject_id])
+        )
+        for subject_id in subject_ids
+    ]
+    requests = tuple(alternatives[0] for alternatives in compiled)
+    fallbacks = tuple(alternatives[1:] for alternatives in compiled)
+    offsets = fire_offsets(
+        len(requests), strategy, settings.request_delay, settings.dispatch_window
+    )
+    weights = tuple(ranked[sid].weight if sid in ranked else 1.0 for sid in subject_ids)
+    elapsed = time.perf_counter() - started
+    spare = sum(len(f) for f in fallbacks)
+    logger.info(
+        f"Fire plan compiled: {len(requests)} request(s) + {spare} fallback(s) in "
+        f"{elapsed * 1e6:.0f} µs, {strategy} dispatch over "
+        f"{offsets[-1] if offsets else 0:.2f}s."
+    )
+    return CompiledPlan(requests, fallbacks, offsets, strategy, weights, elapsed)
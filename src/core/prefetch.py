@@ -0,0 +1,107 @@
+"""Background schedule prefetch for interactive planning.
+
+This module provides:
+- SchedulePrefetcher: fetches the schedules of all subjects concurrently,
+  with bounded concurrency, and hands them out as they become ready.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from loguru import logger
+
+from config.settings import settings
+from src.api.client import WSPAsyncClient
+
+
+class SchedulePrefetcher:
+    """Fetches ``get_schedule`` for many subjects in the background.
+
+    At most ``concurrency`` requests are in flight. Every fetch retries on
+    its own (see ``WSPAsyncClient.get_schedule``), so a slow or failing
+    subject never holds back the others. Results are pushed onto a ready
+    queue in completion order.
+
+    Attributes:
+        client (WSPAsyncClient): Logged-in client used for the requests.
+        subject_ids (list[int]): Subjects to fetch.
+        concurrency (int): Maximum number of requests in flight.
+        schedules (dict[int, dict[str, Any]]): Schedules fetched so far.
+        failed (dict[int, Exception]): Subjects whose fetch gave up.
+
+    Methods:
+        ready() -> AsyncIterator[tuple[int, dict[str, Any]]]: Yields every
+            fetched schedule once, in completion order.
+        gather() -> dict[int, dict[str, Any]]: Waits for every fetch.
+    """
+
+    def __init__(
+        self,
+        client: WSPAsyncClient,
+        subject_ids: list[int],
+        concurrency: int | None = None,
+    ):
+        """Initialize the prefetcher; fetching starts on entering it."""
+        self.client = client
+        self.subject_ids = list(subject_ids)
+        self.concurrency = max(
+            1, settings.prefetch_concurrency if concurrency is None else concurrency
+        )
+        self.schedules: dict[int, dict[str, Any]] = {}
+        self.failed: dict[int, Exception] = {}
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._started = 0.0
+
+    async def __aenter__(self) -> "SchedulePrefetcher":
+        """Start fetching every subject in the background."""
+        self._started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self._tasks = [
+            asyncio.create_task(self._fetch(subject_id, semaphore))
+            for subject_id in self.subject_ids
+        ]
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        """Cancel fetches that are still pending."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _fetch(self, subject_id: int, semaphore: asyncio.Semaphore) -> None:
+        try:
+            async with semaphore:
+                self.schedules[subject_id] = await self.client.get_schedule(subject_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Subj {subject_id}: schedule prefetch failed: {e}")
+            self.failed[subject_id] = e
+        self._queue.put_nowait(subject_id)
+        if len(self.schedules) + len(self.failed) == len(self.subject_ids):
+            logger.info(
+                f"Prefetched {len(self.schedules)}/{len(self.subject_ids)} "
+                f"schedule(s) in {(time.perf_counter() - self._started) * 1000:.0f}ms"
+            )
+
+    async def ready(self) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        """Yield ``(subject_id, schedule)`` as soon as each fetch completes.
+
+        Subjects whose fetch failed are skipped.
+        """
+        for _ in self.subject_ids:
+            subject_id = await self._queue.get()
+            if subject_id in self.schedules:
+                yield subject_id, self.schedules[subject_id]
+
+    async def gather(self) -> dict[int, dict[str, Any]]:
+        """Wait for every fetch and return the schedules that succeeded."""
+        await asyncio.gather(*self._tasks)
+        return {
+            sid: self.schedules[sid]
+            for sid in self.subject_ids
+            if sid in self.schedules
+        }
@@ -0,0 +1,117 @@
+"""Seat-scarcity scoring of planned subjects.
+
+This module provides:
+- SubjectPriority: how contested the chosen groups of a subject are.
+- score_subject: scores one subject from its ``get_schedule`` payload.
+- prioritize: fetches the schedules of a plan and ranks its subjects.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from config.settings import settings
+from src.api.client import WSPAsyncClient
+from src.utils.storage import plan_alternatives
+
+# Weights of the lesson fill ratio, of the closeness to the last seat and of
+# the lack of alternative streams in the scarcity score.
+_FILL_WEIGHT = 0.5
+_TIGHT_WEIGHT = 0.3
+_STREAM_WEIGHT = 0.2
+
+
+@dataclass(frozen=True, slots=True)
+class SubjectPriority:
+    """Scarcity score of a planned subject, driven by its tightest lesson.
+
+    Attributes:
+        subject_id: Subject the score belongs to.
+        name: Subject name from the schedule payload.
+        score: Scarcity between 0 (plenty of seats) and 1 (about to fill).
+        fill: ``studentCount / studentCountMax`` of the tightest lesson, None
+            if its capacity is unknown.
+        remaining: Seats left in the tightest lesson, None if its capacity
+            is unknown.
+        streams: Number of streams competing for the subject's students.
+        lesson_id: ID of the tightest chosen lesson.
+    """
+
+    subject_id: int
+    name: str
+    score: float
+    fill: float | None
+    remaining: int | None
+    streams: int
+    lesson_id: int | None
+
+    @property
+    def weight(self) -> float:
+        """Share of the request budget relative to an uncontested subject."""
+        return 1.0 + 3.0 * self.score
+
+
+def score_subject(
+    subject_id: int, schedule: dict[str, Any], lesson_ids: list[int]
+) -> SubjectPriority:
+    """Score how likely the chosen groups are to fill first.
+
+    Parameters:
+        subject_id: Subject being scored.
+        schedule: Payload returned by ``WSPAsyncClient.get_schedule``.
+        lesson_ids: Lessons selected for the subject in the plan.
+
+    A lesson without a positive ``studentCountMax`` has an unknown capacity:
+    only its stream term counts, as the seat watcher never reports such a
+    lesson full either.
+    """
+    name = schedule.get("SEMESTER_SUBJECT", {}).get("name", str(subject_id))
+    lessons = schedule.get("SCHEDULES", [])
+    streams = len({lesson.get("stream") for lesson in lessons}) or 1
+    chosen = [lesson for lesson in lessons if lesson.get("id") in lesson_ids]
+
+    best = SubjectPriority(subject_id, name, 0.0, None, None, streams, None)
+    for lesson in chosen:
+        capacity = int(lesson.get("studentCountMax") or 0)
+        taken = int(lesson.get("studentCount") or 0)
+        score = _STREAM_WEIGHT / streams
+        fill: float | None = None
+        remaining: int | None = None
+        if capacity > 0:
+            fill = min(1.0, taken / capacity)
+            remaining = max(0, capacity - taken)
+            score += _FILL_WEIGHT * fill + _TIGHT_WEIGHT / (1 + remaining)
+        if best.lesson_id is None or score > best.score:
+            best = SubjectPriority(
+                subject_id, name, score, fill, remaining, streams, lesson.get("id")
+            )
+    return best
+
+
+async def prioritize(
+    client: WSPAsyncClient, registration_plan: dict[int, list]
+) -> list[SubjectPriority]:
+    """Fetch the schedule of every planned subject and rank them.
+
+    Subjects are scored by their preferred alternative. Subjects whose
+    schedule cannot be fetched get a neutral score of 0.
+
+    Returns:
+        Priorities sorted from the most to the least contested subject.
+    """
+
+    async def fetch(subject_id: int) -> SubjectPriority:
+        try:
+            schedule = await client.get_schedule(subject_id, settings.cache_seats_ttl)
+        except Exception as e:
+            logger.warning(f"Subj {subject_id}: schedule unavailable for scoring: {e}")
+            return SubjectPriority(
+                subject_id, str(subject_id), 0.0, None, None, 1, None
+            )
+        preferred = plan_alternatives(registration_plan[subject_id])[0]
+        return score_subject(subject_id, schedule, preferred)
+
+    priorities = await asyncio.gather(*(fetch(sid) for sid in registration_plan))
+    return sorted(priorities, key=lambda p: p.score, reverse=True)
@@ -6,12 +6,21 @@ This module provides:
 """
 
 import asyncio
+import contextlib
+import time
 from typing import Any
 
 from loguru import logger
 
 from config.settings import settings
 from src.api.client import WSPAsyncClient
+from src.api.prepared import PreparedRequest
+from src.core.dispatch import DispatchRecord, log_dispatch_report
+from src.core.firelog import AttemptLog
+from src.core.plan import CompiledPlan
+from src.core.retry import Outcome, RetryPolicy
+from src.utils.helpers import get_lesson_short_code
+from src.utils.storage import make_plan_entry, plan_alternatives
 
 
 class RegistrationLogic:
@@ -23,8 +32,14 @@ class RegistrationLogic:
         Parse a formula string into lesson type counts.
     validate_selection(selection_codes, stream_code_map, required_counts)
         -> tuple[bool, str]: Validate that selected lessons match required counts.
-    execute_sniper_attack(client, registration_plan) -> None
-        Execute registration attempts for all subjects in the plan.
+    validate_payload(schedule_data, lesson_ids) -> tuple[bool, str]
+        Validate a list of lesson IDs against a subject's schedule.
+    validate_plan(plan, schedules) -> dict[int, list]
+        Drop the plan alternatives that no longer fit their schedules.
+    execute_sniper_attack(client, plan) -> list[DispatchRecord]
+        Execute registration attempts for all subjects in the compiled plan
+        at their scheduled offsets, retrying according to
+        ``RetryPolicy.from_settings()``.
     """
 
     @staticmethod
@@ -87,66 +102,336 @@ class RegistrationLogic:
         )
         return False, msg
 
+    @staticmethod
+    def validate_payload(
+        schedule_data: dict[str, Any], lesson_ids: list[int]
+    ) -> tuple[bool, str]:
+        """Validate a list of lesson IDs against a subject's schedule.
+
+        Parameters
+        ----------
+        schedule_data : dict[str, Any]
+            Payload returned by ``WSPAsyncClient.get_schedule``.
+        lesson_ids : list[int]
+            Lessons of one plan alternative.
+
+        Returns:
+        -------
+        tuple[bool, str]
+            A tuple of (is_valid, message) indicating validation result.
+        """
+        lessons = {s["id"]: s for s in schedule_data.get("SCHEDULES", [])}
+        unknown = [i for i in lesson_ids if i not in lessons]
+        if unknown:
+            return False, f"Unknown lesson IDs: {unknown}."
+        selected = [lessons[i] for i in lesson_ids]
+        if len({s.get("stream") for s in selected}) > 1:
+            return False, "All lessons must belong to the same stream."
+        code_map = {
+            f"{get_lesson_short_code(int(s.get('lessonTypeId', 0)))}{s.get('group')}": s
+            for s in selected
+        }
+        formula = schedule_data.get("SEMESTER_SUBJECT", {}).get("formula")
+        return RegistrationLogic.validate_selection(
+            list(code_map), code_map, RegistrationLogic.parse_formula(formula)
+        )
+
+    @staticmethod
+    def validate_plan(
+        plan: dict[int, list], schedules: dict[int, dict[str, Any]]
+    ) -> dict[int, list]:
+        """Drop the plan alternatives that no longer fit their schedules.
+
+        Meant for plans loaded from disk, which may predate schedule changes.
+        Subjects left without a valid alternative are dropped; subjects whose
+        schedule is unknown are kept as they are.
+
+        Parameters
+        ----------
+        plan : dict[int, list]
+            Plan entries by subject ID.
+        schedules : dict[int, dict[str, Any]]
+            Schedules by subject ID, as returned by ``get_schedule``.
+
+        Returns:
+        -------
+        dict[int, list]
+            The plan with only valid alternatives, in their original order.
+        """
+        validated = {}
+        for subject_id, entry in plan.items():
+            schedule = schedules.get(subject_id)
+            if schedule is None:
+                validated[subject_id] = entry
+                continue
+            valid = []
+            for rank, lesson_ids in enumerate(plan_alternatives(entry), 1):
+                is_valid, msg = RegistrationLogic.validate_payload(schedule, lesson_ids)
+                if is_valid:
+                    valid.append(lesson_ids)
+                else:
+                    logger.warning(
+                        f"Subj {subject_id}: saved alternative #{rank} dropped: {msg}"
+                    )
+            if valid:
+                validated[subject_id] = make_plan_entry(valid)
+            else:
+                logger.warning(f"Subj {subject_id}: no valid saved alternative left.")
+        return validated
+
     @staticmethod
     async def _attempt_registration(
-        client: WSPAsyncClient, subject_id: int, payload: list[int]
-    ):
-        """Attempt to register until successful.
+        client: WSPAsyncClient,
+        request: PreparedRequest,
+        policy: RetryPolicy,
+        attempt_log: AttemptLog | None = None,
+        stop: asyncio.Event | None = None,
+    ) -> Outcome:
+        """Attempt to register until success or until the policy gives up.
 
-        Ignores 504, 502, 500 and any network errors, retrying every 0.5 sec.
+        With an ``attempt_log``, attempts and retries are recorded there
+        instead of being logged one by one; final outcomes are still logged.
+        Setting ``stop`` ends the loop at the next retry pause with
+        ``Outcome.FULL``; a request already sent is always answered first.
+
+        Returns the outcome of the last attempt.
         """
-        attempt = 1
+        subject_id = request.subject_id
+        started = time.monotonic()
+        attempt = streak = 0
+        previous = None
         while True:
-            logger.info(f"Subj {subject_id}: Requesting... (Attempt #{attempt})")
-            status, text = await client.register_lessons(subject_id, payload)
-
-            if status == 200:
-                logger.success(f"Subj {subject_id}: ✅ SUCCESS! Response: {text}")
-                return
+            attempt += 1
+            if attempt_log is None:
+                logger.info(f"Subj {subject_id}: Requesting... (Attempt #{attempt})")
+            sent_ns = time.perf_counter_ns()
+            response = await client.register_lessons(request, attempt)
+            done_ns = time.perf_counter_ns()
+            outcome = policy.classify(response)
+            if attempt_log is not None:
+                attempt_log.record(
+                    subject_id, attempt, response.status, outcome, sent_ns, done_ns
+                )
+            else:
+                latency_ms = (done_ns - sent_ns) / 1e6
+                logger.bind(
+                    event="attempt",
+                    subject_id=subject_id,
+                    attempt=attempt,
+                    status=response.status,
+                    outcome=outcome.value,
+                    latency_ms=latency_ms,
+                ).debug(
+                    f"Subj {subject_id}: attempt #{attempt} -> {response.status} "
+                    f"({outcome.value}) in {latency_ms:.1f}ms"
+                )
+            streak = streak + 1 if outcome is previous else 1
+            previous = outcome
 
-            if status == 504:
-                logger.warning(
-                    f"Subj {subject_id}: ⚠️ 504 Gateway Time-out "
-                    f"(Server Busy). Retrying in 0.5s..."
+            if outcome is Outcome.SUCCESS:
+                logger.success(
+                    f"Subj {subject_id}: ✅ SUCCESS! Response: {response.text}"
                 )
-                await asyncio.sleep(0.5)
-                attempt += 1
+                return outcome
+            if outcome is Outcome.REGISTERED:
+                logger.success(
+                    f"Subj {subject_id}: ✅ Already registered, an earlier attempt "
+                    f"went through. Response: {response.text.strip()}"
+                )
+                return outcome
+
+            delay = policy.next_delay(
+                outcome,
+                streak,
+                attempt,
+                time.monotonic() - started,
+                response.retry_after,
+            )
+            if delay is not None and attempt_log is not None:
+                if await RegistrationLogic._pause(delay, stop):
+                    return Outcome.FULL
                 continue
 
-            if status == 500 and "Регистрация не началась" in text:
+            text = response.text
+            clean_text = "HTML Page" if "<html" in text.lower() else text.strip()
+            if delay is None and outcome is Outcome.TERMINAL:
+                logger.error(f"Subj {subject_id}: ⛔ {clean_text}. Giving up.")
+            elif delay is None and outcome is Outcome.FULL:
+                logger.error(f"Subj {subject_id}: 🈵 {clean_text}.")
+            elif delay is None:
+                logger.error(
+                    f"Subj {subject_id}: ❌ Failed [{response.status}] {clean_text}. "
+                    f"Retry limit reached after {attempt} attempt(s)."
+                )
+            elif outcome is Outcome.TOO_EARLY:
                 logger.warning(f"Subj {subject_id}: ⏳ Too early. Retry #{attempt}...")
-                await asyncio.sleep(settings.retry_delay)
-                attempt += 1
+            elif outcome is Outcome.OVERLOADED:
+                logger.warning(
+                    f"Subj {subject_id}: ⚠️ {response.status} (Server Busy). "
+                    f"Retrying in {delay:.2f}s..."
+                )
+            else:
+                logger.error(
+                    f"Subj {subject_id}: ❌ Failed [{response.status}] {clean_text}. "
+                    f"Retrying in {delay:.2f}s..."
+                )
+
+            if delay is None:
+                return outcome
+            if await RegistrationLogic._pause(delay, stop):
+                return Outcome.FULL
+
+    @staticmethod
+    async def _pause(delay: float, stop: asyncio.Event | None) -> bool:
+        """Sleep ``delay`` seconds; return True early if ``stop`` gets set."""
+        if stop is None:
+            await asyncio.sleep(delay)
+            return False
+        try:
+            await asyncio.wait_for(stop.wait(), delay)
+        except TimeoutError:
+            return False
+        return True
+
+    @staticmethod
+    async def _watch_seats(client: WSPAsyncClient, request: PreparedRequest) -> None:
+        """Return once a schedule poll shows a chosen lesson without seats.
+
+        Lessons without a positive ``studentCountMax`` have no known capacity
+        and are never reported full, nor are lessons marked
+        ``studentRegistered``: their last seat may be the one our own save
+        request just took.
+        """
+        while True:
+            await asyncio.sleep(settings.seat_poll_interval)
+            try:
+                schedule = await client.poll_schedule(request.subject_id)
+            except Exception as e:
+                logger.debug(f"Subj {request.subject_id}: seat poll failed: {e}")
                 continue
+            for lesson in schedule.get("SCHEDULES", []):
+                if lesson.get("id") not in request.payload or lesson.get(
+                    "studentRegistered"
+                ):
+                    continue
+                capacity = lesson.get("studentCountMax") or 0
+                taken = lesson.get("studentCount") or 0
+                if capacity > 0 and taken >= capacity:
+                    logger.warning(
+                        f"Subj {request.subject_id}: 🈵 seat poll shows lesson "
+                        f"{lesson.get('id')} full ({taken}/{capacity})."
+                    )
+                    return
 
-            clean_text = "HTML Page" if "<html" in text.lower() else text.strip()
+    @staticmethod
+    async def _register_subject(
+        client: WSPAsyncClient,
+        alternatives: tuple[PreparedRequest, ...],
+        policy: RetryPolicy,
+        attempt_log: AttemptLog | None = None,
+    ) -> tuple[Outcome, int]:
+        """Try the ranked alternatives of a subject in order.
 
-            logger.error(
-                f"Subj {subject_id}: ❌ Failed [{status}] {clean_text}. "
-                f"Retrying in 0.5s..."
-            )
+        The next alternative is used as soon as the server reports the group
+        full or, while attempts are still retrying, a seat poll shows one of
+        the chosen lessons without free seats. In the latter case the attempt
+        is stopped at its next retry pause, never while a save request is
+        waiting for its answer, so a save that went through is not followed
+        by a fallback.
 
-            await asyncio.sleep(0.5)
-            attempt += 1
+        Returns:
+            Outcome of the last attempt and the 1-based rank of its payload.
+        """
+        outcome = Outcome.FULL
+        for rank, request in enumerate(alternatives, start=1):
+            if rank > 1:
+                logger.warning(
+                    f"Subj {request.subject_id}: ↪ switching to alternative #{rank} "
+                    f"{list(request.payload)}"
+                )
+            stop = asyncio.Event()
+            attempt = asyncio.create_task(
+                RegistrationLogic._attempt_registration(
+                    client, request, policy, attempt_log, stop
+                )
+            )
+            if rank == len(alternatives) or settings.seat_poll_interval <= 0:
+                outcome = await attempt
+            else:
+                watcher = asyncio.create_task(
+                    RegistrationLogic._watch_seats(client, request)
+                )
+                await asyncio.wait({attempt, watcher}, return_when="FIRST_COMPLETED")
+                watcher.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await watcher
+                stop.set()
+                outcome = await attempt
+            if outcome is not Outcome.FULL:
+                return outcome, rank
+        return outcome, len(alternatives)
 
     @staticmethod
     async def execute_sniper_attack(
-        client: WSPAsyncClient, registration_plan: dict[int, list[int]]
-    ) -> None:
+        client: WSPAsyncClient, plan: CompiledPlan
+    ) -> list[DispatchRecord]:
         """Execute registration attempts for all subjects in the plan.
 
+        Every subject starts at its own absolute deadline, ``plan.offsets``
+        after the call, so a slow start of one subject does not delay the
+        others. In the ``buffered`` fire log mode, attempts are logged in
+        full once every subject is done.
+
         Parameters
         ----------
         client : WSPAsyncClient
             The async client used to make registration requests.
-        registration_plan : dict[int, list[int]]
-            A mapping from subject IDs to lists of lesson IDs to register.
+        plan : CompiledPlan
+            Prepared requests built by ``compile_plan`` during arming.
+
+        Returns:
+        -------
+        list[DispatchRecord]
+            Planned and actual fire offset of every subject.
         """
-        tasks = []
-        for subject_id, payload in registration_plan.items():
-            task = asyncio.create_task(
-                RegistrationLogic._attempt_registration(client, subject_id, payload)
+        policy = RetryPolicy.from_settings()
+        attempt_log = AttemptLog.from_settings()
+        if client.budget:
+            for request, weight in zip(plan.requests, plan.weights, strict=True):
+                client.budget.weights[request.subject_id] = weight
+        launched_ns = time.perf_counter_ns()
+        records: list[DispatchRecord] = []
+
+        async def fire(
+            alternatives: tuple[PreparedRequest, ...], offset: float
+        ) -> None:
+            remaining = launched_ns + int(offset * 1e9) - time.perf_counter_ns()
+            if remaining > 0:
+                await asyncio.sleep(remaining / 1e9)
+            actual = (time.perf_counter_ns() - launched_ns) / 1e9
+            outcome, rank = await RegistrationLogic._register_subject(
+                client, alternatives, policy, attempt_log
+            )
+            subject_id = alternatives[0].subject_id
+            records.append(
+                DispatchRecord(subject_id, offset, actual, outcome.value, rank)
+            )
+
+        try:
+            await asyncio.gather(
+                *(
+                    fire((request, *fallbacks), offset)
+                    for request, fallbacks, offset in zip(
+                        plan.requests, plan.fallbacks, plan.offsets, strict=True
+                    )
+                )
             )
-            tasks.append(task)
-            await asyncio.sleep(settings.request_delay)
-        await asyncio.gather(*tasks)
+        finally:
+            if attempt_log:
+                attempt_log.flush()
+        log_dispatch_report(plan.strategy, records)
+        if client.tracer:
+            client.tracer.flush()
+        if client.budget:
+            logger.info(f"Request budget: {client.budget.stats}")
+        return records
@@ -0,0 +1,345 @@
+"""Post-run analysis of registration attempts.
+
+This module provides:
+- AttemptRecord: one registration request, as recorded by a run.
+- RunData: the attempts and target of a run.
+- load_trace: reads the last run of a ``WSP_TRACE_FILE`` timeline.
+- parse_log: reconstructs the last run from the text log, as a fallback.
+- SubjectSummary / RunReport: per-subject and run-wide statistics.
+- build_report: summarizes a run.
+"""
+
+import json
+import re
+import statistics
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+# Percentiles reported for request latencies.
+PERCENTILES = (50, 90, 99)
+
+_LOG_LINE = re.compile(
+    r"^(?P<time>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:\.\d+)?) \| (?P<level>\w+)\s*\| "
+    r"\S+ - (?P<message>.*)$"
+)
+_TARGET = re.compile(r"Local Target: .* \| UTC Timestamp: (?P<ts>[\d.]+)")
+_OFFSET = re.compile(r"NTP Sync successful\. Offset: (?P<offset>[-\d.]+)s")
+_ATTEMPT = re.compile(
+    r"Subj (?P<subject>\d+): attempt #(?P<attempt>\d+) -> (?P<status>\d+) "
+    r"\(\w+\) in (?P<latency>[\d.]+)ms(?: @ (?P<sent>[\d.]+))?"
+)
+_REQUESTING = re.compile(
+    r"Subj (?P<subject>\d+): Requesting\.\.\. \(Attempt #(?P<attempt>\d+)\)"
+)
+_SUCCESS = re.compile(r"Subj (?P<subject>\d+): ✅ SUCCESS")
+_FAILED = re.compile(
+    r"Subj (?P<subject>\d+): (?:❌ Failed|⚠\ufe0f?) \[?(?P<status>\d{3})\]?"
+)
+_TOO_EARLY = re.compile(r"Subj (?P<subject>\d+): ⏳ Too early")
+
+
+@dataclass(slots=True)
+class AttemptRecord:
+    """One registration request.
+
+    Attributes:
+        subject_id: Subject the request belongs to.
+        attempt: 1-based attempt number of the subject.
+        time: NTP-corrected wall-clock time the attempt started.
+        status: HTTP status code, 0 on a network error, None if unknown.
+        latency_ms: Time until the response was read, if known.
+        ttfb_ms: Time from writing the request to its response head, if known.
+        reused: Whether a pooled connection was used, if known.
+    """
+
+    subject_id: int
+    attempt: int
+    time: float
+    status: int | None
+    latency_ms: float | None = None
+    ttfb_ms: float | None = None
+    reused: bool | None = None
+
+    @property
+    def end(self) -> float:
+        """Time the response was read, or the start time if unknown."""
+        return self.time + (self.latency_ms or 0.0) / 1000
+
+
+@dataclass
+class RunData:
+    """Attempts of a single run.
+
+    Attributes:
+        source: File the run was read from.
+        target: NTP-corrected target timestamp, None if unknown.
+        attempts: Attempts in start order.
+    """
+
+    source: str
+    target: float | None
+    attempts: list[AttemptRecord]
+
+
+def load_trace(path: str) -> RunData | None:
+    """Read the last run of a JSONL trace timeline.
+
+    A run starts at an ``"event": "run"`` header. Returns None if the file
+    is missing or holds no attempt.
+    """
+    target = offset = None
+    attempts: list[AttemptRecord] = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return None
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get("event") == "run":
+            target, offset, attempts = record["target"], record["time_offset"], []
+            continue
+        attempts.append(
+            AttemptRecord(
+                record["subject_id"],
+                record["attempt"],
+                record["time"] + (offset or 0.0),
+                record["status"],
+                record.get("total_ms"),
+                record.get("ttfb_ms"),
+                record.get("reused"),
+            )
+        )
+    if not attempts:
+        return None
+    attempts.sort(key=lambda a: a.time)
+    return RunData(path, target, attempts)
+
+
+def parse_log(path: str) -> RunData | None:
+    """Reconstruct the last run from a ``logs/wsp_sniper.log`` text log.
+
+    The run starts at the last ``Local Target`` line. Structured ``attempt
+    #N -> status`` lines are used when present, timed by their ``@ start``
+    suffix if they were logged after the burst; older logs are read from the
+    ``Requesting...`` lines and the outcome lines that follow them.
+    Returns None if the file is missing or holds no attempt.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return None
+
+    target = None
+    offset = 0.0
+    structured: list[AttemptRecord] = []
+    legacy: list[AttemptRecord] = []
+    pending: dict[int, AttemptRecord] = {}
+    for line in lines:
+        match = _LOG_LINE.match(line.rstrip("\n"))
+        if not match:
+            continue
+        message = match["message"]
+        if m := _OFFSET.search(message):
+            offset = float(m["offset"])
+            continue
+        if m := _TARGET.search(message):
+            target = float(m["ts"])
+            structured, legacy, pending = [], [], {}
+            continue
+        logged = datetime.fromisoformat(match["time"]).timestamp() + offset
+        if m := _ATTEMPT.search(message):
+            latency = float(m["latency"])
+            sent = logged - latency / 1000
+            if m["sent"]:
+                sent = float(m["sent"]) + offset
+            structured.append(
+                AttemptRecord(
+                    int(m["subject"]),
+                    int(m["attempt"]),
+                    sent,
+                    int(m["status"]),
+                    latency,
+                )
+            )
+        elif m := _REQUESTING.search(message):
+            record = AttemptRecord(int(m["subject"]), int(m["attempt"]), logged, None)
+            pending[record.subject_id] = record
+            legacy.append(record)
+        elif m := _SUCCESS.search(message):
+            _settle(pending, int(m["subject"]), 200, logged)
+        elif m := _FAILED.search(message):
+            _settle(pending, int(m["subject"]), int(m["status"]), logged)
+        elif m := _TOO_EARLY.search(message):
+            _settle(pending, int(m["subject"]), 500, logged)
+
+    attempts = structured or legacy
+    if not attempts:
+        return None
+    attempts.sort(key=lambda a: a.time)
+    return RunData(path, target, attempts)
+
+
+def _settle(
+    pending: dict[int, AttemptRecord], subject_id: int, status: int, logged: float
+) -> None:
+    record = pending.pop(subject_id, None)
+    if record is not None:
+        record.status = status
+        record.latency_ms = (logged - record.time) * 1000
+
+
+def status_class(status: int | None) -> str:
+    """Group a status code: ``2xx``..``5xx``, ``network`` or ``unknown``."""
+    if status is None:
+        return "unknown"
+    if status == 0:
+        return "network"
+    return f"{status // 100}xx"
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    if len(values) < 2:
+        return {f"p{p}": values[0] for p in PERCENTILES}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {f"p{p}": cuts[p - 1] for p in PERCENTILES}
+
+
+@dataclass
+class SubjectSummary:
+    """Attempts of one subject.
+
+    Attributes:
+        subject_id: Subject ID.
+        attempts: Number of requests sent.
+        first_request_ms: Start of the first request after the target.
+        success_ms: End of the first successful request after the target,
+            None if none succeeded.
+        classes: Number of responses per status class.
+    """
+
+    subject_id: int
+    attempts: int
+    first_request_ms: float | None
+    success_ms: float | None
+    classes: dict[str, int]
+
+
+@dataclass
+class RunReport:
+    """Summary of a run, serializable with ``to_dict``.
+
+    Attributes:
+        source: File the run was read from.
+        target: NTP-corrected target timestamp, None if unknown.
+        requests: Number of requests sent.
+        duration_s: Time from the first request start to the last response.
+        latency_ms: Request latency percentiles.
+        ttfb_ms: Time to first byte percentiles, if traced.
+        reused: Share of requests sent on a pooled connection, if traced.
+        rate: Requests started per bin, as ``{"t": offset_s, "requests": n}``;
+            offsets count from the target (or the first request).
+        bin_s: Width of a rate bin, in seconds.
+        subjects: Per-subject summaries, in subject order.
+    """
+
+    source: str
+    target: float | None
+    requests: int
+    duration_s: float
+    latency_ms: dict[str, float]
+    ttfb_ms: dict[str, float]
+    reused: float | None
+    rate: list[dict[str, float]]
+    bin_s: float
+    subjects: list[SubjectSummary] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        """Number of subjects with a successful request."""
+        return sum(s.success_ms is not None for s in self.subjects)
+
+    @property
+    def peak_rate(self) -> float:
+        """Highest request rate of a bin, in requests per second."""
+        return max((b["requests"] for b in self.rate), default=0) / self.bin_s
+
+    def to_dict(self) -> dict[str, Any]:
+        """Machine-readable form, e.g. for ``json.dump``."""
+        return {
+            "source": self.source,
+            "target": self.target,
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "duration_s": self.duration_s,
+            "peak_rate": self.peak_rate,
+            "latency_ms": self.latency_ms,
+            "ttfb_ms": self.ttfb_ms,
+            "reused": self.reused,
+            "bin_s": self.bin_s,
+            "rate": self.rate,
+            "subjects": [s.__dict__ for s in self.subjects],
+        }
+
+
+def build_report(run: RunData, bin_s: float = 1.0) -> RunReport:
+    """Summarize a run.
+
+    Parameters:
+        run: Attempts loaded by ``load_trace`` or ``parse_log``.
+        bin_s: Width of the request rate bins, in seconds.
+    """
+    attempts = run.attempts
+    origin = run.target if run.target is not None else attempts[0].time
+    bin_s = bin_s if bin_s > 0 else 1.0
+
+    def since(t: float) -> float:
+        return (t - origin) * 1000
+
+    by_subject: dict[int, list[AttemptRecord]] = {}
+    for attempt in attempts:
+        by_subject.setdefault(attempt.subject_id, []).append(attempt)
+    subjects = []
+    for subject_id, records in sorted(by_subject.items()):
+        success = next((r for r in records if r.status == 200), None)
+        subjects.append(
+            SubjectSummary(
+                subject_id,
+                len(records),
+                since(records[0].time),
+                since(success.end) if success else None,
+                dict(Counter(status_class(r.status) for r in records)),
+            )
+        )
+
+    bins = Counter(int((a.time - origin) // bin_s) for a in attempts)
+    first, last = min(bins), max(bins)
+    rate = [
+        {"t": round(i * bin_s, 6), "requests": bins.get(i, 0)}
+        for i in range(first, last + 1)
+    ]
+    traced = [a.reused for a in attempts if a.reused is not None]
+    return RunReport(
+        source=run.source,
+        target=run.target,
+        requests=len(attempts),
+        duration_s=max(a.end for a in attempts) - attempts[0].time,
+        latency_ms=_percentiles(
+            sorted(a.latency_ms for a in attempts if a.latency_ms is not None)
+        ),
+        ttfb_ms=_percentiles(
+            sorted(a.ttfb_ms for a in attempts if a.ttfb_ms is not None)
+        ),
+        reused=sum(traced) / len(traced) if traced else None,
+        rate=rate,
+        bin_s=bin_s,
+        subjects=subjects,
+    )
@@ -0,0 +1,220 @@
+"""Retry policy for registration requests.
+
+This module provides:
+- Outcome: classification of a registration response.
+- classify: maps a response onto an Outcome.
+- Backoff: capped exponential backoff curve with jitter.
+- RetryPolicy: per-outcome backoff with attempt and deadline limits.
+- parse_retry_after: converts a ``Retry-After`` header into seconds.
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import StrEnum
+
+from config.settings import settings
+from src.api.transport import RegistrationResponse
+
+NOT_STARTED_MARKER = "Регистрация не началась"
+OVERLOADED_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class Outcome(StrEnum):
+    """Kind of answer received for a registration request."""
+
+    SUCCESS = "success"
+    # An earlier attempt went through even if its response was lost.
+    REGISTERED = "registered"
+    TOO_EARLY = "too_early"
+    OVERLOADED = "overloaded"
+    NETWORK = "network"
+    FULL = "full"
+    TERMINAL = "terminal"
+    ERROR = "error"
+
+
+def classify(
+    response: RegistrationResponse,
+    terminal_markers: list[str],
+    full_markers: list[str] | None = None,
+    registered_markers: list[str] | None = None,
+) -> Outcome:
+    """Classify a registration response.
+
+    Parameters:
+        response: Answer returned by ``WSPAsyncClient.register_lessons``.
+        terminal_markers: Substrings of messages that no retry can fix.
+        full_markers: Substrings of messages saying a chosen group is full.
+        registered_markers: Substrings of messages saying the subject is
+            already registered.
+    """
+    status, text = response.status, response.text
+    if status == 200:
+        return Outcome.SUCCESS
+    if status == 0:
+        return Outcome.NETWORK
+    if status == 500 and NOT_STARTED_MARKER in text:
+        return Outcome.TOO_EARLY
+    if status in OVERLOADED_STATUSES:
+        return Outcome.OVERLOADED
+    lowered = text.lower()
+    if any(marker.lower() in lowered for marker in registered_markers or []):
+        return Outcome.REGISTERED
+    if any(marker.lower() in lowered for marker in full_markers or []):
+        return Outcome.FULL
+    if any(marker.lower() in lowered for marker in terminal_markers):
+        return Outcome.TERMINAL
+    return Outcome.ERROR
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Convert a ``Retry-After`` header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """Delay curve ``initial * factor ** (n - 1)`` capped at ``cap``.
+
+    Attributes:
+        initial: Delay before the first retry, in seconds.
+        factor: Growth per consecutive retry of the same outcome.
+        cap: Upper bound of the delay, in seconds.
+        jitter: Share of the delay that is randomized away (0 to 1), so
+            subjects retrying together spread out.
+    """
+
+    initial: float
+    factor: float = 1.0
+    cap: float = float("inf")
+    jitter: float = 0.0
+
+    def delay(self, streak: int, rng: random.Random) -> float:
+        """Return the delay before retry number ``streak`` (1-based)."""
+        base = min(self.cap, self.initial * self.factor ** (streak - 1))
+        return base * (1 - self.jitter * rng.random())
+
+
+@dataclass
+class RetryPolicy:
+    """Decides whether and when to retry a registration request.
+
+    Outcomes without a backoff (``SUCCESS``, ``REGISTERED`` and, in the
+    adaptive preset, ``FULL`` and ``TERMINAL``) end the attempt loop.
+
+    Attributes:
+        backoffs (dict[Outcome, Backoff]): Delay curve per retryable outcome.
+        max_attempts (int): Attempts per subject, 0 for unlimited.
+        deadline (float): Seconds after the first attempt to give up, 0 for
+            never.
+        retry_after_cap (float): Longest ``Retry-After`` that is honoured.
+        terminal_markers (list[str]): Messages classified as ``TERMINAL``.
+        full_markers (list[str]): Messages classified as ``FULL``.
+        registered_markers (list[str]): Messages classified as ``REGISTERED``.
+
+    Methods:
+        from_settings() -> RetryPolicy: Builds the preset chosen by
+            ``WSP_RETRY_POLICY``.
+        next_delay(outcome, streak, attempt, elapsed, retry_after) -> float | None:
+            Returns the delay before the next attempt, None to stop.
+    """
+
+    backoffs: dict[Outcome, Backoff]
+    max_attempts: int = 0
+    deadline: float = 0.0
+    retry_after_cap: float = 0.0
+    terminal_markers: list[str] = field(default_factory=list)
+    full_markers: list[str] = field(default_factory=list)
+    registered_markers: list[str] = field(default_factory=list)
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    @classmethod
+    def legacy(cls) -> "RetryPolicy":
+        """The original loop: retry everything every 0.5 s, forever.
+
+        Only a response saying the subject is already registered ends it.
+        """
+        fixed = Backoff(0.5)
+        done = (Outcome.SUCCESS, Outcome.REGISTERED)
+        backoffs: dict[Outcome, Backoff] = {o: fixed for o in Outcome if o not in done}
+        backoffs[Outcome.TOO_EARLY] = Backoff(settings.retry_delay)
+        return cls(backoffs, registered_markers=settings.already_registered_markers)
+
+    @classmethod
+    def adaptive(cls) -> "RetryPolicy":
+        """Outcome-aware backoff configured from settings."""
+        base, cap = settings.retry_backoff_base, settings.retry_backoff_cap
+        factor, jitter = settings.retry_backoff_factor, settings.retry_jitter
+        return cls(
+            backoffs={
+                Outcome.TOO_EARLY: Backoff(settings.retry_delay, jitter=jitter / 5),
+                Outcome.OVERLOADED: Backoff(base, factor, cap, jitter),
+                Outcome.NETWORK: Backoff(base, factor, cap, jitter),
+                Outcome.ERROR: Backoff(settings.retry_delay, factor, cap * 2, jitter),
+            },
+            max_attempts=settings.retry_max_attempts,
+            deadline=settings.retry_deadline,
+            retry_after_cap=settings.retry_after_cap,
+            terminal_markers=settings.retry_terminal_markers,
+            full_markers=settings.group_full_markers,
+            registered_markers=settings.already_registered_markers,
+        )
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build the policy selected by ``WSP_RETRY_POLICY``."""
+        if settings.retry_policy == "legacy":
+            return cls.legacy()
+        return cls.adaptive()
+
+    def classify(self, response: RegistrationResponse) -> Outcome:
+        """Classify a response using this policy's markers."""
+        return classify(
+            response,
+            self.terminal_markers,
+            self.full_markers,
+            self.registered_markers,
+        )
+
+    def next_delay(
+        self,
+        outcome: Outcome,
+        streak: int,
+        attempt: int,
+        elapsed: float,
+        retry_after: str | None = None,
+    ) -> float | None:
+        """Return the delay before the next attempt.
+
+        Parameters:
+            outcome: Classification of the last response.
+            streak: Consecutive attempts that ended with this outcome.
+            attempt: Attempts made so far.
+            elapsed: Seconds since the first attempt.
+            retry_after: Raw ``Retry-After`` header of the last response.
+
+        Returns:
+            Seconds to wait, or None if the loop should stop.
+        """
+        backoff = self.backoffs.get(outcome)
+        if backoff is None:
+            return None
+        if self.max_attempts and attempt >= self.max_attempts:
+            return None
+
+        delay = backoff.delay(streak, self.rng)
+        hint = parse_retry_after(retry_after) if self.retry_after_cap else None
+        if hint is not None:
+            delay = max(delay, min(hint, self.retry_after_cap))
+        if self.deadline and elapsed + delay > self.deadline:
+            return None
+        return delay
@@ -8,52 +8,107 @@ import asyncio
 import time
 from datetime import datetime
 
-import ntplib  # type: ignore[import-untyped]  # ty: ignore[unused-ignore-comment]
 from loguru import logger
 
 from config.settings import settings
+from src.core.ntp import AsyncNTPClient, NTPEstimate
+from src.core.waiter import HybridWaiter, OvershootStats
+
+# Minimum time between syncs before a correction is trusted as drift.
+_MIN_DRIFT_WINDOW = 60.0
+# Drift beyond this (500 ppm) means a clock step, not a rate error.
+_MAX_DRIFT = 500e-6
 
 
 class TimeScheduler:
     """Handles NTP synchronization and high-precision waiting for target times.
 
+    Corrected time is kept on a timeline anchored to the monotonic clock
+    (``perf_counter_ns``), so wall clock steps from chrony or a VM resume do
+    not move the launch instant. Every NTP sync re-anchors the timeline and
+    refines the estimated drift of the monotonic clock.
+
     Attributes:
         time_offset (float): The offset between system time and NTP time in seconds.
+        drift (float): Estimated rate error of the monotonic clock (s/s).
+        ntp_estimate (NTPEstimate | None): Details of the last successful sync.
+        waiter (HybridWaiter): Sleep/spin waiter used for the final approach.
 
     Methods:
-        sync_ntp() -> None: Synchronizes with NTP server and calculates time offset.
+        sync_ntp() -> None: Samples several NTP servers in parallel and
+            re-anchors the timeline, logging the correction it applied.
         get_corrected_time() -> float: Returns the current time corrected by
             the NTP offset.
+        time_at(mono_ns: int) -> float: Converts a ``perf_counter_ns``
+            reading into corrected time.
         get_target_timestamp() -> float: Parses the target time from settings
             and returns UTC timestamp.
-        wait_until_target(target_timestamp: float) -> None: High-precision
-            busy-wait loop until the target timestamp.
+        wait_until_target(target_timestamp: float) -> None: Waits on the
+            monotonic clock until the target, re-syncing periodically and
+            finishing with a calibrated sleep/spin approach.
     """
 
     def __init__(self):
         """Initialize the TimeScheduler with zero time offset."""
         self.time_offset = 0.0
-
-    def sync_ntp(self) -> None:
+        self.drift = 0.0
+        self.ntp_estimate: NTPEstimate | None = None
+        self.waiter = HybridWaiter()
+        self._anchor_time = time.time()
+        self._anchor_ns = time.perf_counter_ns()
+        self._synced_ns: int | None = None
+
+    def time_at(self, mono_ns: int) -> float:
+        """Convert a ``perf_counter_ns`` reading into corrected UNIX time."""
+        elapsed = (mono_ns - self._anchor_ns) / 1e9
+        return self._anchor_time + elapsed * (1 + self.drift)
+
+    def _deadline_ns(self, timestamp: float) -> int:
+        """Convert a corrected UNIX timestamp into a ``perf_counter_ns`` value."""
+        elapsed = (timestamp - self._anchor_time) / (1 + self.drift)
+        return self._anchor_ns + int(elapsed * 1e9)
+
+    async def sync_ntp(self) -> None:
         """Calculates offset between system time and NTP time."""
         try:
-            client = ntplib.NTPClient()
-            response = client.request("pool.ntp.org", version=3)
-            ntp_time = response.tx_time
-            system_time = time.time()
-            self.time_offset = ntp_time - system_time
-            logger.info(f"NTP Sync successful. Offset: {self.time_offset:.4f}s")
+            estimate = await AsyncNTPClient().estimate()
         except Exception as e:
-            logger.warning(f"NTP Sync failed: {e}. Using system time.")
-            self.time_offset = 0.0
+            logger.warning(f"NTP Sync failed: {e}. Keeping current time base.")
+            return
+
+        now_ns = time.perf_counter_ns()
+        measured = time.time() + estimate.offset
+        correction = measured - self.time_at(now_ns)
+
+        if self._synced_ns is not None:
+            elapsed = (now_ns - self._synced_ns) / 1e9
+            rate = correction / elapsed if elapsed else 0.0
+            if elapsed >= _MIN_DRIFT_WINDOW and abs(rate) <= _MAX_DRIFT:
+                self.drift = max(-_MAX_DRIFT, min(_MAX_DRIFT, self.drift + rate / 2))
+            logger.info(
+                f"Clock correction: {correction * 1000:+.2f}ms after "
+                f"{elapsed:.0f}s, drift {self.drift * 1e6:+.1f}ppm"
+            )
+
+        self._anchor_time = measured
+        self._anchor_ns = now_ns
+        self._synced_ns = now_ns
+        self.ntp_estimate = estimate
+        self.time_offset = estimate.offset
+        logger.info(
+            f"NTP Sync successful. Offset: {estimate.offset:.4f}s "
+            f"± {estimate.error * 1000:.1f}ms (best RTT {estimate.delay * 1000:.1f}ms, "
+            f"{estimate.samples} samples) via {', '.join(estimate.servers)}"
+        )
 
     def get_corrected_time(self) -> float:
         """Return the current time corrected by the NTP offset.
 
         Returns:
-            float: The current system time adjusted by the NTP time offset.
+            float: The current NTP-corrected time, derived from the monotonic
+            clock and the last sync anchor.
         """
-        return time.time() + self.time_offset
+        return self.time_at(time.perf_counter_ns())
 
     def get_target_timestamp(self) -> float:
         """Parses the LOCAL target time string from settings.
@@ -86,23 +141,59 @@ class TimeScheduler:
         return target_timestamp
 
     async def wait_until_target(self, target_timestamp: float) -> None:
-        """High-precision busy-wait loop for the last few seconds."""
+        """High-precision wait on the monotonic clock.
+
+        While far from the target the offset is re-estimated every
+        ``settings.ntp_resync_interval`` seconds and the deadline recomputed.
+        The last two seconds are handed to the calibrated ``HybridWaiter``.
+        """
         wait_seconds = target_timestamp - self.get_corrected_time()
         if wait_seconds > 0:
             logger.info(f"Waiting for {wait_seconds:.2f} seconds...")
         else:
             logger.warning("Target time has already passed! engaging immediately.")
+            return
 
+        if self.waiter.calibration is None and wait_seconds > 1:
+            await self.waiter.calibrate()
+        self.waiter.overshoots = []
+
+        resync_ns = int(settings.ntp_resync_interval * 1e9)
+        last_sync = self._synced_ns or self._anchor_ns
+        deadline = self._deadline_ns(target_timestamp)
         while True:
-            current_corrected = self.get_corrected_time()
-            remaining = target_timestamp - current_corrected
+            now = time.perf_counter_ns()
+            remaining = (deadline - now) / 1e9
 
             if remaining <= 0:
                 break
 
+            if resync_ns > 0 and remaining > settings.ntp_resync_guard:
+                if now - last_sync >= resync_ns:
+                    last_sync = now
+                    await self.sync_ntp()
+                    new_deadline = self._deadline_ns(target_timestamp)
+                    if new_deadline != deadline:
+                        logger.info(
+                            f"Target re-computed: moved by "
+                            f"{(new_deadline - deadline) / 1e6:+.2f}ms"
+                        )
+                        deadline = new_deadline
+                    continue
+                next_sync = (last_sync + resync_ns - now) / 1e9
+                await asyncio.sleep(
+                    min(next_sync, remaining - settings.ntp_resync_guard) + 0.001
+                )
+                continue
+
             if remaining > 2:
                 await asyncio.sleep(remaining - 1)
-            elif remaining > 0.1:
-                await asyncio.sleep(0.05)
-            else:
-                await asyncio.sleep(0.001)
+                continue
+
+            error_ns = await self.waiter.sleep_until(deadline)
+            overshoot = OvershootStats.from_samples(self.waiter.overshoots)
+            logger.info(
+                f"Wake-up error: {error_ns / 1000:+.1f}µs. "
+                f"Sleep overshoot this run: {overshoot}"
+            )
+            break
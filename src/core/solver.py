@@ -0,0 +1,378 @@
+"""Automatic timetable construction across all subjects.
+
+This module provides:
+- SolverPreferences: soft preferences that rank valid timetables.
+- Candidate: one valid lesson selection of a single subject.
+- Timetable: one complete, clash-free selection for every solvable subject.
+- subject_candidates: enumerates the valid selections of a subject.
+- TimetableSolver: branch-and-bound search for the best timetables.
+- plan_from_timetables: turns ranked timetables into a registration plan
+  with fallback alternatives.
+"""
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from config.settings import settings
+from src.core.registration import RegistrationLogic
+from src.utils.storage import make_plan_entry
+
+# Lesson types in formula order: lectures, labs, practicals.
+_LESSON_TYPES = (1, 2, 3)
+
+Slot = tuple[str, float, float]
+
+
+def _slot(lesson: dict[str, Any]) -> Slot | None:
+    begin, end = lesson.get("beginTime"), lesson.get("endTime")
+    if begin is None or end is None:
+        return None
+    return str(lesson.get("weekDay")), float(begin), float(end)
+
+
+def _clashes(a: tuple[Slot, ...], b: tuple[Slot, ...]) -> bool:
+    return any(
+        day_a == day_b and begin_a < end_b and begin_b < end_a
+        for day_a, begin_a, end_a in a
+        for day_b, begin_b, end_b in b
+    )
+
+
+@dataclass(frozen=True)
+class SolverPreferences:
+    """Soft preferences used to rank timetables; lower cost is better.
+
+    Attributes:
+        seat_weight: Cost of a completely filled lesson, scaled by its fill.
+        preferred_teachers: Substrings of teacher names to favour.
+        avoided_teachers: Substrings of teacher names to avoid.
+        teacher_weight: Bonus or penalty per matching lesson.
+        earliest: Hour before which lessons are penalized, None to ignore.
+        latest: Hour after which lessons are penalized, None to ignore.
+        time_weight: Penalty per hour outside ``[earliest, latest]``.
+        allow_full: Keep selections containing lessons without free seats.
+    """
+
+    seat_weight: float = 1.0
+    preferred_teachers: tuple[str, ...] = ()
+    avoided_teachers: tuple[str, ...] = ()
+    teacher_weight: float = 1.0
+    earliest: float | None = None
+    latest: float | None = None
+    time_weight: float = 0.5
+    allow_full: bool = False
+
+    @classmethod
+    def from_settings(cls) -> "SolverPreferences":
+        """Build the preferences configured by ``WSP_SOLVER_*``."""
+        return cls(
+            preferred_teachers=tuple(settings.solver_preferred_teachers),
+            avoided_teachers=tuple(settings.solver_avoided_teachers),
+            earliest=settings.solver_earliest,
+            latest=settings.solver_latest,
+        )
+
+    def lesson_cost(self, lesson: dict[str, Any]) -> float:
+        """Return the cost contributed by a single lesson.
+
+        A lesson without a positive ``studentCountMax`` has an unknown
+        capacity and adds no seat cost, as in the priority score.
+        """
+        capacity = int(lesson.get("studentCountMax") or 0)
+        taken = int(lesson.get("studentCount") or 0)
+        cost = self.seat_weight * min(1.0, taken / capacity) if capacity > 0 else 0.0
+
+        teacher = str(lesson.get("teacher") or "").lower()
+        if any(t.lower() in teacher for t in self.preferred_teachers):
+            cost -= self.teacher_weight
+        if any(t.lower() in teacher for t in self.avoided_teachers):
+            cost += self.teacher_weight
+
+        begin, end = lesson.get("beginTime"), lesson.get("endTime")
+        if self.earliest is not None and begin is not None:
+            cost += self.time_weight * max(0.0, self.earliest - float(begin))
+        if self.latest is not None and end is not None:
+            cost += self.time_weight * max(0.0, float(end) - self.latest)
+        return cost
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """A formula-satisfying, internally clash-free selection of one subject.
+
+    Attributes:
+        subject_id: Subject the selection belongs to.
+        stream: Stream all selected lessons belong to.
+        lesson_ids: Selected lesson IDs, sorted.
+        slots: ``(weekDay, beginTime, endTime)`` of the selected lessons.
+        cost: Sum of the lesson costs under the solver preferences.
+    """
+
+    subject_id: int
+    stream: str
+    lesson_ids: tuple[int, ...]
+    slots: tuple[Slot, ...]
+    cost: float
+
+
+@dataclass(frozen=True)
+class Timetable:
+    """A complete selection, one candidate per solvable subject.
+
+    Attributes:
+        cost: Total cost of the selection.
+        choices: Chosen candidate per subject ID.
+    """
+
+    cost: float
+    choices: dict[int, Candidate] = field(compare=False)
+
+
+def subject_candidates(
+    subject_id: int,
+    schedule_data: dict[str, Any],
+    preferences: SolverPreferences | None = None,
+) -> list[Candidate]:
+    """Enumerate the valid selections of a subject, cheapest first.
+
+    A selection takes, within a single stream, exactly as many lectures,
+    labs and practicals as the subject formula requires. With an unknown
+    formula one lesson of every type present in the stream is taken.
+    """
+    preferences = preferences or SolverPreferences()
+    formula = schedule_data.get("SEMESTER_SUBJECT", {}).get("formula")
+    required = RegistrationLogic.parse_formula(formula)
+
+    streams: dict[str, list[dict[str, Any]]] = {}
+    for lesson in schedule_data.get("SCHEDULES", []):
+        if not preferences.allow_full:
+            capacity = lesson.get("studentCountMax")
+            if capacity and (lesson.get("studentCount") or 0) >= capacity:
+                continue
+        streams.setdefault(str(lesson.get("stream", "N/A")), []).append(lesson)
+
+    candidates = []
+    for stream, lessons in streams.items():
+        by_type = {
+            t: [s for s in lessons if s.get("lessonTypeId") == t] for t in _LESSON_TYPES
+        }
+        if required[0] == -1:
+            counts = tuple(1 if by_type[t] else 0 for t in _LESSON_TYPES)
+        else:
+            counts = required
+        choices = [
+            itertools.combinations(by_type[t], n)
+            for t, n in zip(_LESSON_TYPES, counts, strict=True)
+        ]
+        for combo in itertools.product(*choices):
+            selected = [lesson for group in combo for lesson in group]
+            if not selected:
+                continue
+            slots = [_slot(lesson) for lesson in selected]
+            known = tuple(s for s in slots if s is not None)
+            if any(
+                _clashes(known[i : i + 1], known[i + 1 :]) for i in range(len(known))
+            ):
+                continue
+            candidates.append(
+                Candidate(
+                    subject_id,
+                    stream,
+                    tuple(sorted(lesson["id"] for lesson in selected)),
+                    known,
+                    sum(preferences.lesson_cost(lesson) for lesson in selected),
+                )
+            )
+    return sorted(candidates, key=lambda c: c.cost)
+
+
+class TimetableSolver:
+    """Branch-and-bound search for the cheapest clash-free timetables.
+
+    Every candidate gets a bit, numbered so that each subject's candidates
+    are in cost order, and a bitmask of the candidates of other subjects it
+    does not clash with. The domain of a subject is a bitmask too, so
+    filtering all remaining domains after an assignment is one AND per
+    subject. Subjects are assigned in order of fewest remaining candidates,
+    and a branch is abandoned as soon as a subject runs out of candidates or
+    the cheapest possible completion cannot beat the worst of the ``top_k``
+    timetables found so far.
+
+    Attributes:
+        candidates (dict[int, list[Candidate]]): Valid selections per subject.
+        unsolvable (list[int]): Subjects without any valid selection; they
+            are left out of the timetables.
+        top_k (int): Number of timetables to return.
+        node_limit (int): Search nodes to expand before returning the best
+            timetables found so far, 0 for no limit.
+        nodes (int): Search nodes expanded by the last solve().
+        exhausted (bool): Whether the last solve() explored the whole tree.
+
+    Methods:
+        solve() -> list[Timetable]: Returns up to ``top_k`` timetables,
+            cheapest first.
+    """
+
+    def __init__(
+        self,
+        schedules: dict[int, dict[str, Any]],
+        preferences: SolverPreferences | None = None,
+        top_k: int | None = None,
+        node_limit: int | None = None,
+    ):
+        """Enumerate the candidates of every subject and their clashes.
+
+        Parameters:
+            schedules: ``get_schedule`` payload per subject ID.
+            preferences: Ranking preferences, from settings if omitted.
+            top_k: Timetables to return, ``WSP_SOLVER_TOP_K`` if omitted.
+            node_limit: Search budget, ``WSP_SOLVER_NODE_LIMIT`` if omitted.
+        """
+        preferences = preferences or SolverPreferences.from_settings()
+        self.top_k = max(1, settings.solver_top_k if top_k is None else top_k)
+        self.node_limit = (
+            settings.solver_node_limit if node_limit is None else node_limit
+        )
+        self.candidates = {
+            subject_id: subject_candidates(subject_id, schedule, preferences)
+            for subject_id, schedule in schedules.items()
+        }
+        self.unsolvable = [sid for sid, cands in self.candidates.items() if not cands]
+        self.nodes = 0
+        self.exhausted = True
+        self._best: list[tuple[float, int, tuple[int, ...]]] = []
+        self._sequence = itertools.count()
+        self._index: list[Candidate] = [
+            c for cands in self.candidates.values() for c in cands
+        ]
+        self._domains: dict[int, int] = {}
+        for position, candidate in enumerate(self._index):
+            bit = 1 << position
+            sid = candidate.subject_id
+            self._domains[sid] = self._domains.get(sid, 0) | bit
+        self._compatible = self._compatibility()
+
+    def _compatibility(self) -> list[int]:
+        compatible = [0] * len(self._index)
+        for i, a in enumerate(self._index):
+            days_a = {slot[0] for slot in a.slots}
+            for j in range(i + 1, len(self._index)):
+                b = self._index[j]
+                if a.subject_id == b.subject_id:
+                    continue
+                if days_a.isdisjoint(slot[0] for slot in b.slots) or not _clashes(
+                    a.slots, b.slots
+                ):
+                    compatible[i] |= 1 << j
+                    compatible[j] |= 1 << i
+        return compatible
+
+    def solve(self) -> list[Timetable]:
+        """Search for the cheapest clash-free timetables."""
+        started = time.perf_counter()
+        self.nodes = 0
+        self.exhausted = True
+        self._best = []
+        if self._domains:
+            self._search(dict(self._domains), [], 0.0)
+        timetables = sorted(
+            (
+                Timetable(
+                    -neg_cost,
+                    {self._index[i].subject_id: self._index[i] for i in chosen},
+                )
+                for neg_cost, _, chosen in self._best
+            ),
+            key=lambda t: t.cost,
+        )
+        logger.info(
+            f"Timetable solver: {len(timetables)} timetable(s) for "
+            f"{len(self._domains)} subject(s) over {len(self._index)} "
+            f"candidate(s) in {self.nodes} node(s), "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms"
+            + ("" if self.exhausted else " (node limit reached)")
+        )
+        for subject_id in self.unsolvable:
+            logger.warning(f"Subj {subject_id}: no valid selection, left out.")
+        return timetables
+
+    def _bound(self) -> float:
+        if len(self._best) < self.top_k:
+            return float("inf")
+        return -self._best[0][0]
+
+    def _cheapest(self, domain: int) -> Candidate:
+        return self._index[(domain & -domain).bit_length() - 1]
+
+    def _search(self, domains: dict[int, int], chosen: list[int], cost: float) -> None:
+        if self.node_limit and self.nodes >= self.node_limit:
+            self.exhausted = False
+            return
+        self.nodes += 1
+        if not domains:
+            entry = (-cost, next(self._sequence), tuple(chosen))
+            if len(self._best) < self.top_k:
+                heapq.heappush(self._best, entry)
+            else:
+                heapq.heappushpop(self._best, entry)
+            return
+
+        floors = {sid: self._cheapest(d).cost for sid, d in domains.items()}
+        remaining = sum(floors.values())
+        if cost + remaining >= self._bound():
+            return
+
+        subject_id = min(domains, key=lambda sid: domains[sid].bit_count())
+        rest_floor = remaining - floors[subject_id]
+        domain = domains[subject_id]
+        while domain:
+            lowest = domain & -domain
+            domain ^= lowest
+            position = lowest.bit_length() - 1
+            candidate = self._index[position]
+            if cost + candidate.cost + rest_floor >= self._bound():
+                break
+            compatible = self._compatible[position]
+            pruned = {}
+            for sid, other in domains.items():
+                if sid == subject_id:
+                    continue
+                kept = other & compatible
+                if not kept:
+                    break
+                pruned[sid] = kept
+            else:
+                chosen.append(position)
+                self._search(pruned, chosen, cost + candidate.cost)
+                chosen.pop()
+
+
+def plan_from_timetables(
+    timetables: list[Timetable], alternatives: int | None = None
+) -> dict[int, list]:
+    """Build a registration plan from ranked timetables.
+
+    The best timetable provides the preferred payload of every subject; the
+    distinct payloads of the following timetables become its fallbacks.
+
+    Parameters:
+        timetables: Solver output, cheapest first.
+        alternatives: Payloads kept per subject, ``WSP_SOLVER_ALTERNATIVES``
+            if omitted.
+    """
+    limit = max(
+        1, settings.solver_alternatives if alternatives is None else alternatives
+    )
+    ranked: dict[int, list[list[int]]] = {}
+    for timetable in timetables:
+        for subject_id, candidate in timetable.choices.items():
+            payloads = ranked.setdefault(subject_id, [])
+            payload = list(candidate.lesson_ids)
+            if payload not in payloads and len(payloads) < limit:
+                payloads.append(payload)
+    return {sid: make_plan_entry(payloads) for sid, payloads in ranked.items()}
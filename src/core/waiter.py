@@ -0,0 +1,113 @@
+"""Calibrated hybrid sleep/spin waiting.
+
+This module provides:
+- OvershootStats: distribution of how late ``asyncio.sleep`` wakes up.
+- HybridWaiter: sleeps coarsely until a calibrated guard band before the
+  deadline, then spins on ``perf_counter_ns`` for the remainder.
+"""
+
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+
+from config.settings import settings
+
+_MIN_GUARD = 0.0005
+_MAX_GUARD = 0.05
+
+
+@dataclass(frozen=True)
+class OvershootStats:
+    """Percentiles of sleep overshoot, in seconds."""
+
+    samples: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> "OvershootStats":
+        """Summarize raw overshoot samples."""
+        if len(samples) < 2:
+            value = samples[0] if samples else 0.0
+            return cls(len(samples), value, value, value, value)
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+        return cls(len(samples), cuts[49], cuts[89], cuts[98], max(samples))
+
+    def __str__(self) -> str:
+        """Format the percentiles in microseconds."""
+        return (
+            f"p50 {self.p50 * 1e6:.0f}µs, p90 {self.p90 * 1e6:.0f}µs, "
+            f"p99 {self.p99 * 1e6:.0f}µs, max {self.max * 1e6:.0f}µs "
+            f"({self.samples} samples)"
+        )
+
+
+class HybridWaiter:
+    """Waits for a monotonic deadline with sub-millisecond accuracy.
+
+    Attributes:
+        guard (float): Seconds before the deadline where sleeping stops and
+            spinning starts.
+        calibration (OvershootStats | None): Result of the last calibrate().
+        overshoots (list[float]): Overshoot of every coarse sleep taken by
+            sleep_until() since the last calibration.
+
+    Methods:
+        calibrate() -> OvershootStats: Measures how late ``asyncio.sleep``
+            wakes up on this host and derives the guard band.
+        sleep_until(deadline_ns) -> int: Waits for a ``perf_counter_ns``
+            deadline and returns the wake-up error in nanoseconds.
+    """
+
+    def __init__(self, samples: int | None = None, margin: float | None = None):
+        """Initialize the waiter with an uncalibrated, conservative guard."""
+        self.samples = samples or settings.waiter_samples
+        self.margin = settings.waiter_margin if margin is None else margin
+        self.guard = 0.005
+        self.calibration: OvershootStats | None = None
+        self.overshoots: list[float] = []
+
+    async def calibrate(self) -> OvershootStats:
+        """Measure the overshoot of short ``asyncio.sleep`` calls.
+
+        Returns:
+            The measured overshoot distribution.
+        """
+        samples = []
+        for i in range(self.samples):
+            requested = 0.001 if i % 2 else 0.002
+            started = time.perf_counter_ns()
+            await asyncio.sleep(requested)
+            samples.append((time.perf_counter_ns() - started) / 1e9 - requested)
+
+        stats = OvershootStats.from_samples(samples)
+        self.calibration = stats
+        self.guard = min(_MAX_GUARD, max(_MIN_GUARD, stats.p99 + self.margin))
+        self.overshoots = []
+        logger.info(f"Sleep overshoot: {stats}. Spin guard: {self.guard * 1000:.2f}ms")
+        return stats
+
+    async def sleep_until(self, deadline_ns: int) -> int:
+        """Wait until ``perf_counter_ns()`` reaches ``deadline_ns``.
+
+        Returns:
+            Wake-up error in nanoseconds (positive means late).
+        """
+        guard_ns = int(self.guard * 1e9)
+        while True:
+            remaining = deadline_ns - time.perf_counter_ns()
+            if remaining <= guard_ns:
+                break
+            requested = (remaining - guard_ns) / 1e9
+            started = time.perf_counter_ns()
+            await asyncio.sleep(requested)
+            self.overshoots.append((time.perf_counter_ns() - started) / 1e9 - requested)
+
+        while (now := time.perf_counter_ns()) < deadline_ns:
+            pass
+        return now - deadline_ns
@@ -0,0 +1,261 @@
+"""Out-of-process execution of a sniper attack.
+
+This module provides:
+- LaunchEvent: a structured progress event published by the worker.
+- run_attack: worker process entry point running the whole launch sequence.
+- LaunchWorker: starts the worker process and collects its events.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from config.settings import settings
+from src.api.client import WSPAsyncClient
+from src.core.arming import WarmPool
+from src.core.critical import CriticalSection, event_loop_factory
+from src.core.latency import plan_launch
+from src.core.plan import compile_plan
+from src.core.priority import prioritize
+from src.core.registration import RegistrationLogic
+from src.core.scheduler import TimeScheduler
+from src.utils.logging import setup_logger
+
+
+@dataclass(frozen=True, slots=True)
+class LaunchEvent:
+    """Progress event sent from the worker to the dashboard.
+
+    Attributes:
+        kind: ``status`` (launch stage), ``log`` (log message), ``attempt``
+            (one registration request), ``dispatch`` (first attempt of a
+            subject), ``done`` or ``error``.
+        message: Human-readable text.
+        time: Wall-clock time the event was created.
+        data: Structured payload, e.g. ``subject_id``, ``status`` and
+            ``latency_ms`` of an attempt.
+    """
+
+    kind: str
+    message: str
+    time: float = field(default_factory=time.time)
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class _QueueSink:
+    """Loguru sink turning log records into events on an IPC queue.
+
+    ``multiprocessing.Queue.put`` only appends to a buffer flushed by a
+    feeder thread, so logging never waits for the dashboard.
+    """
+
+    def __init__(self, events: multiprocessing.Queue):
+        self.events = events
+
+    def write(self, message):
+        record = message.record
+        extra = record["extra"]
+        if "event" in extra:
+            data = {k: v for k, v in extra.items() if k != "event"}
+            self.events.put(LaunchEvent(extra["event"], record["message"], data=data))
+        elif record["level"].no >= logger.level("INFO").no:
+            self.events.put(
+                LaunchEvent(
+                    "log", record["message"], data={"level": record["level"].name}
+                )
+            )
+
+
+async def _attack(
+    username: str, password: str, plan: dict[int, list], events: multiprocessing.Queue
+) -> None:
+    def status(message: str) -> None:
+        events.put(LaunchEvent("status", message))
+
+    scheduler = TimeScheduler()
+    async with WSPAsyncClient(username, password) as client:
+        status("🔐 Logging in...")
+        await client.login()
+        status("🔌 Arming connection pool...")
+        critical = CriticalSection.from_settings()
+        try:
+            async with WarmPool(client, len(plan)) as pool:
+                priorities = await prioritize(client, plan)
+                ranking = ", ".join(f"{p.name} ({p.score:.2f})" for p in priorities)
+                status(f"📊 Dispatch priority: {ranking}")
+                fire_plan = compile_plan(client, plan, priorities)
+                status("⏳ Synchronizing Time...")
+                await scheduler.sync_ntp()
+                target_ts = scheduler.get_target_timestamp()
+
+                status(f"🎯 Target Timestamp: {target_ts}")
+                status("📡 Measuring network latency...")
+                launch_ts = await plan_launch(client, scheduler, target_ts)
+                status("⏳ Holding for launch time...")
+
+                await pool.hold(scheduler, launch_ts, critical)
+
+            status("🚀 LAUNCHING REQUESTS!")
+            records = await RegistrationLogic.execute_sniper_attack(client, fire_plan)
+        finally:
+            if critical:
+                critical.exit()
+
+    for record in records:
+        events.put(
+            LaunchEvent(
+                "dispatch",
+                f"Subj {record.subject_id}: {record.outcome}",
+                data={
+                    "subject_id": record.subject_id,
+                    "planned_ms": record.planned * 1000,
+                    "actual_ms": record.actual * 1000,
+                    "outcome": record.outcome,
+                    "alternative": record.alternative,
+                },
+            )
+        )
+
+
+def run_attack(
+    username: str,
+    password: str,
+    plan: dict[int, list],
+    overrides: dict[str, Any],
+    events: multiprocessing.Queue,
+) -> None:
+    """Worker process entry point: run the launch sequence with its own loop.
+
+    Parameters:
+        username: WSP login; the worker logs in with its own session.
+        password: WSP password.
+        plan: Registration plan, as stored by ``save_plan_to_disk``.
+        overrides: Settings changed at runtime by the parent, e.g. the
+            target time set in the sidebar.
+        events: Queue receiving ``LaunchEvent`` objects.
+    """
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    # The dashboard's live attempts table is built from per-attempt events,
+    # which the buffered fire log would only emit after the burst.
+    settings.fire_log_mode = "verbose"
+    setup_logger()
+    logger.add(_QueueSink(events), format="{message}", level="DEBUG")
+    try:
+        asyncio.run(
+            _attack(username, password, plan, events),
+            loop_factory=event_loop_factory(),
+        )
+    except BaseException as e:
+        logger.exception(e)
+        events.put(LaunchEvent("error", f"Critical Error: {e}"))
+        raise
+    else:
+        events.put(LaunchEvent("done", "Operation Complete"))
+    finally:
+        logger.complete()
+
+
+class LaunchWorker:
+    """Handle of a sniper attack running in a separate process.
+
+    The worker is started with the ``spawn`` method, so it shares no threads
+    or sockets with the Streamlit server, and keeps running when the page
+    that started it is reloaded or closed. Events are drained from the queue
+    on demand by ``poll``; a stage and a per-subject summary are kept so a
+    new page can render the state without replaying every event.
+
+    Attributes:
+        process (multiprocessing.Process): The worker process.
+        events (deque[LaunchEvent]): Most recent status and log events.
+        attempts (dict[int, LaunchEvent]): Latest attempt of every subject.
+        dispatch (dict[int, LaunchEvent]): First-attempt report per subject.
+        stage (str): Latest status message.
+        result (LaunchEvent | None): The ``done`` or ``error`` event, once
+            received.
+        started_at (float): Wall-clock time the worker was started.
+
+    Methods:
+        poll() -> list[LaunchEvent]: Collects the events published since the
+            previous call.
+        stop() -> None: Terminates the worker.
+        running -> bool: Whether the worker process is still alive.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        plan: dict[int, list],
+        history: int = 500,
+    ):
+        """Start the worker process."""
+        context = multiprocessing.get_context("spawn")
+        self._queue: multiprocessing.Queue = context.Queue()
+        self.events: deque[LaunchEvent] = deque(maxlen=history)
+        self.attempts: dict[int, LaunchEvent] = {}
+        self.dispatch: dict[int, LaunchEvent] = {}
+        self.stage = "Starting worker..."
+        self.result: LaunchEvent | None = None
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.process = context.Process(
+            target=run_attack,
+            args=(username, password, plan, settings.model_dump(), self._queue),
+            name=f"wsp-launch-{username}",
+            daemon=True,
+        )
+        self.process.start()
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker process is still alive."""
+        return self.process.is_alive()
+
+    def poll(self) -> list[LaunchEvent]:
+        """Drain the queue without blocking and update the summary.
+
+        Safe to call from several sessions watching the same worker.
+        """
+        with self._lock:
+            return self._drain()
+
+    def _drain(self) -> list[LaunchEvent]:
+        new = []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            new.append(event)
+            if event.kind == "attempt":
+                self.attempts[event.data["subject_id"]] = event
+                continue
+            if event.kind == "dispatch":
+                self.dispatch[event.data["subject_id"]] = event
+                continue
+            if event.kind == "status":
+                self.stage = event.message
+            elif event.kind in ("done", "error"):
+                self.result = event
+            self.events.append(event)
+        if self.result is None and not new and not self.running:
+            self.result = LaunchEvent(
+                "error", f"Worker exited with code {self.process.exitcode}"
+            )
+        return new
+
+    def stop(self) -> None:
+        """Terminate the worker process."""
+        if self.running:
+            self.process.terminate()
+            self.process.join(5)
+        if self.result is None:
+            self.result = LaunchEvent("error", "Stopped by user")
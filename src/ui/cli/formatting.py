@@ -37,4 +37,43 @@ def create_schedule_table() -> Table:
     table.add_column("Day")
     table.add_column("Time")
     table.add_column("Limit", justify="right")
+    table.add_column("Clash", style="red")
+    return table
+
+
+def create_priority_table() -> Table:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("#", style="cyan", justify="right")
+    table.add_column("Subject", style="green")
+    table.add_column("Score", justify="right")
+    table.add_column("Fill", justify="right")
+    table.add_column("Seats left", justify="right")
+    table.add_column("Streams", justify="right")
+    return table
+
+
+def create_timetable_table(costs: list[float]) -> Table:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Subject", style="green")
+    for rank, cost in enumerate(costs, start=1):
+        table.add_column(f"#{rank} ({cost:.2f})")
+    return table
+
+
+def create_report_table(title: str) -> Table:
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Subject", style="cyan")
+    table.add_column("First req (ms)", justify="right")
+    table.add_column("Success (ms)", justify="right")
+    table.add_column("Attempts", justify="right")
+    table.add_column("Outcomes")
+    return table
+
+
+def create_rate_table() -> Table:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Offset (s)", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Rate (/s)", justify="right")
+    table.add_column("", style="green")
     return table
@@ -2,18 +2,42 @@ from typing import Any
 
 from rich.prompt import Confirm, Prompt
 
+from src.core.intervals import IntervalIndex
+from src.core.priority import SubjectPriority
 from src.core.registration import RegistrationLogic
-from src.ui.cli.formatting import console, create_schedule_table, print_header
+from src.core.solver import Timetable, plan_from_timetables
+from src.ui.cli.formatting import (
+    console,
+    create_priority_table,
+    create_schedule_table,
+    create_timetable_table,
+    print_header,
+)
 from src.utils.helpers import format_time, get_lesson_short_code, get_lesson_type_name
 from src.utils.storage import SAVE_FILE, load_saved_plan, save_plan_to_disk
 
 
 class CLI:
-    def get_user_confirmation(self, plan: dict) -> bool:
+    def get_user_confirmation(
+        self, plan: dict, priorities: list[SubjectPriority] | None = None
+    ) -> bool:
         console.print_json(data=plan)
+        if priorities:
+            print_header("Dispatch priority (most contested first)")
+            table = create_priority_table()
+            for rank, p in enumerate(priorities, start=1):
+                table.add_row(
+                    str(rank),
+                    p.name,
+                    f"{p.score:.2f}",
+                    "?" if p.fill is None else f"{p.fill:.0%}",
+                    "?" if p.remaining is None else str(p.remaining),
+                    str(p.streams),
+                )
+            console.print(table)
         return Confirm.ask("[bold yellow]Confirm registration blueprint?[/bold yellow]")
 
-    def ask_to_load_plan(self) -> dict[int, list[int]]:
+    def ask_to_load_plan(self) -> dict[int, list]:
         """Interactively asks to load the plan if it exists."""
         loaded_plan = load_saved_plan()
         if not loaded_plan:
@@ -27,7 +51,7 @@ class CLI:
             return loaded_plan
         return {}
 
-    def save_plan(self, plan: dict[int, list[int]]):
+    def save_plan(self, plan: dict[int, list]):
         """Saves plan with CLI feedback."""
         if save_plan_to_disk(plan):
             console.print(
@@ -36,7 +60,61 @@ class CLI:
         else:
             console.print("[red]Warning: Failed to save plan.[/red]")
 
-    def interactive_subject_selection(self, subject_data: dict[str, Any]) -> list[int]:
+    def ask_to_use_solver(self) -> bool:
+        """Asks whether the timetable should be built automatically."""
+        return Confirm.ask("Build a clash-free timetable automatically?", default=True)
+
+    def choose_timetable(
+        self, timetables: list[Timetable], schedules: dict[int, dict[str, Any]]
+    ) -> dict[int, list]:
+        """Shows the solver's timetables and builds a plan from the chosen one.
+
+        The timetables ranked after the chosen one provide the fallbacks.
+        Returns an empty plan if the user prefers manual selection.
+        """
+        if not timetables:
+            console.print("[red]No clash-free timetable exists.[/red]")
+            return {}
+
+        print_header("Suggested timetables (lower cost is better)")
+        table = create_timetable_table([t.cost for t in timetables])
+        for subject_id, schedule in schedules.items():
+            lessons = {s["id"]: s for s in schedule.get("SCHEDULES", [])}
+            cells = []
+            for timetable in timetables:
+                candidate = timetable.choices.get(subject_id)
+                if candidate is None:
+                    cells.append("-")
+                    continue
+                codes = " ".join(
+                    get_lesson_short_code(int(lessons[i].get("lessonTypeId", 0)))
+                    + str(lessons[i].get("group"))
+                    for i in candidate.lesson_ids
+                )
+                cells.append(f"S{candidate.stream}: {codes}")
+            name = schedule.get("SEMESTER_SUBJECT", {}).get("name", str(subject_id))
+            table.add_row(name, *cells)
+        console.print(table)
+
+        choices = [str(i) for i in range(len(timetables) + 1)]
+        choice = int(
+            Prompt.ask("Pick a timetable (0 to select manually)", choices=choices)
+        )
+        if not choice:
+            return {}
+        return plan_from_timetables(timetables[choice - 1 :])
+
+    def interactive_subject_selection(
+        self,
+        subject_data: dict[str, Any],
+        index: IntervalIndex | None = None,
+        subject_id: int | None = None,
+    ) -> list[list[int]]:
+        """Prompts for the ranked alternatives of a subject.
+
+        With an index of the lessons already planned for other subjects,
+        time clashes are shown next to every lesson and confirmed on entry.
+        """
         subject = subject_data.get("SEMESTER_SUBJECT", {})
         schedules = subject_data.get("SCHEDULES", [])
 
@@ -73,6 +151,7 @@ class CLI:
 
                 time_rng = f"{format_time(s['beginTime'])}-{format_time(s['endTime'])}"
                 limit = f"{s['studentCount']}/{s['studentCountMax']}"
+                clashes = index.conflicts(s, subject_id) if index else []
 
                 table.add_row(
                     sel_code,
@@ -83,9 +162,36 @@ class CLI:
                     s.get("weekDay", "N/A"),
                     time_rng,
                     limit,
+                    ", ".join(f"Subj {c.subject_id}" for c in clashes),
                 )
             console.print(table)
 
+        req_counts = RegistrationLogic.parse_formula(subject.get("formula"))
+        alternatives: list[list[int]] = []
+        while True:
+            if alternatives:
+                console.print(
+                    f"[bold]Fallback alternative #{len(alternatives) + 1}[/bold]"
+                )
+            ids = self._select_lessons(
+                streams, sorted_stream_ids, req_counts, index, subject_id
+            )
+            if ids and ids not in alternatives:
+                alternatives.append(ids)
+            if not alternatives or not Confirm.ask(
+                "Add a fallback alternative in case these groups fill up?",
+                default=False,
+            ):
+                return alternatives
+
+    def _select_lessons(
+        self,
+        streams: dict[str, list[dict[str, Any]]],
+        sorted_stream_ids: list[str],
+        req_counts: tuple[int, int, int],
+        index: IntervalIndex | None = None,
+        subject_id: int | None = None,
+    ) -> list[int]:
         selected_stream = Prompt.ask(
             "Select Stream ID", choices=sorted_stream_ids, show_choices=True
         )
@@ -97,8 +203,6 @@ class CLI:
             code = f"{short_code}{s.get('group')}"
             current_stream_map[code] = s
 
-        req_counts = RegistrationLogic.parse_formula(subject.get("formula"))
-
         while True:
             console.print(
                 f"[bold]Selected Stream {selected_stream}. "
@@ -116,10 +220,39 @@ class CLI:
             )
             if is_valid:
                 console.print("[green]Selection Validated.[/green]")
-                break
+                if self._accept_clashes(
+                    [current_stream_map[c] for c in chosen_codes], index, subject_id
+                ):
+                    break
             else:
                 console.print(f"[red]Validation Error:[/red] {msg}")
                 if not Confirm.ask("Retry selection? (no to abort subject)"):
                     return []
 
         return sorted([current_stream_map[c]["id"] for c in chosen_codes])
+
+    def _accept_clashes(
+        self,
+        lessons: list[dict[str, Any]],
+        index: IntervalIndex | None,
+        subject_id: int | None,
+    ) -> bool:
+        """Reports clashes with other planned subjects and asks to keep them."""
+        if index is None:
+            return True
+        clashes = [
+            (lesson, other)
+            for lesson in lessons
+            for other in index.conflicts(lesson, subject_id)
+        ]
+        if not clashes:
+            return True
+        for lesson, other in clashes:
+            console.print(
+                f"[red]Time clash:[/red] {lesson.get('weekDay')} "
+                f"{format_time(lesson.get('beginTime'))}-"
+                f"{format_time(lesson.get('endTime'))} overlaps "
+                f"{format_time(other.begin)}-{format_time(other.end)} "
+                f"of Subj {other.subject_id}"
+            )
+        return Confirm.ask("Keep this selection despite the clash?", default=False)
@@ -1,21 +1,17 @@
-import asyncio
+import time
 
 import streamlit as st
 from loguru import logger
 
-from src.api.client import WSPAsyncClient
-from src.core.registration import RegistrationLogic
-from src.core.scheduler import TimeScheduler
+from src.core.worker import LaunchWorker
+from src.ui.web.logs import append_log
+from src.ui.web.runtime import get_launches, get_runtime
 from src.ui.web.scheduler import render_web_scheduler
 
-
-class StatusSink:
-    def __init__(self, status_container):
-        self.status = status_container
-
-    def write(self, message):
-        text = message.record["message"]
-        self.status.write(f"👉 {text}")
+# Seconds between two polls of the launch worker's event queue.
+_POLL_INTERVAL = 0.5
+# Status and log events shown in the progress box.
+_VISIBLE_EVENTS = 50
 
 
 def render_dashboard():
@@ -27,51 +23,114 @@ def render_dashboard():
     render_web_scheduler()
     st.divider()
 
+    username = st.session_state.get("username", "")
+    worker = get_launches().get(username)
     plan = st.session_state.get("plan", {})
-    if not plan:
+    if not plan and worker is None:
         st.warning("Plan is empty. Select subjects above.")
         return
 
     st.subheader("🚀 Launch Control")
-    col1, col2 = st.columns([2, 1])
-    with col1:
-        st.json(plan, expanded=False)
-    with col2:
-        st.markdown("Ready to engage?")
-        if st.button("START SNIPER ATTACK", type="primary", use_container_width=True):
-            _launch_sequence(plan)
-
-
-def _launch_sequence(plan):
-    status_container = st.status("Sniper Operation In Progress...", expanded=True)
-
-    sink_id = logger.add(StatusSink(status_container), format="{message}", level="INFO")
-
-    async def attack_flow():
-        scheduler = TimeScheduler()
-
-        status_container.write("⏳ Synchronizing Time...")
-        scheduler.sync_ntp()
-        target_ts = scheduler.get_target_timestamp()
-
-        status_container.write(f"🎯 Target Timestamp: {target_ts}")
-        status_container.write("⏳ Holding for launch time...")
-
-        await scheduler.wait_until_target(target_ts)
-
-        status_container.write("🚀 LAUNCHING REQUESTS!")
-        async with WSPAsyncClient() as client:
-            await client.login()
-            await RegistrationLogic.execute_sniper_attack(client, plan)
-
+    if worker is None or worker.result is not None:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.json(plan, expanded=False)
+        with col2:
+            st.markdown("Ready to engage?")
+            if st.button(
+                "START SNIPER ATTACK",
+                type="primary",
+                use_container_width=True,
+                disabled=not plan,
+            ):
+                _start_launch(username, plan)
+
+    if worker is not None:
+        _render_launch_progress(username)
+
+
+def _start_launch(username, plan):
     try:
-        asyncio.run(attack_flow())
-        status_container.update(label="Operation Complete", state="complete")
-        st.balloons()
-        st.success("Check detailed logs below.")
+        login, password = get_runtime().credentials(username)
     except Exception as e:
-        status_container.update(label="Operation Failed", state="error")
         st.error(f"Critical Error: {e}")
-        logger.exception(e)
-    finally:
-        logger.remove(sink_id)
+        return
+    worker = LaunchWorker(login, password, plan)
+    get_launches()[username] = worker
+    logger.info(f"Launch worker started (PID {worker.process.pid}).")
+    st.rerun()
+
+
+@st.fragment(run_every=_POLL_INTERVAL)
+def _render_launch_progress(username):
+    """Show the progress of the user's launch worker, polling it in place.
+
+    Only this fragment reruns on every poll, so the rest of the page stays
+    interactive while the attack runs in its own process.
+    """
+    launches = get_launches()
+    worker = launches.get(username)
+    if worker is None:
+        return
+    for event in worker.poll():
+        if event.kind == "log":
+            append_log(event.data["level"], event.message, event.time)
+
+    if worker.result is None:
+        label, state = worker.stage, "running"
+    elif worker.result.kind == "done":
+        label, state = "Operation Complete", "complete"
+    else:
+        label, state = "Operation Failed", "error"
+    elapsed = time.time() - worker.started_at
+    with st.status(f"{label} ({elapsed:.0f}s)", state=state, expanded=True):
+        for event in list(worker.events)[-_VISIBLE_EVENTS:]:
+            st.write(f"👉 {event.message}")
+
+    if worker.attempts:
+        st.dataframe(
+            [
+                {
+                    "Subject": subject_id,
+                    "Attempt": event.data["attempt"],
+                    "Status": event.data["status"],
+                    "Outcome": event.data["outcome"],
+                    "Latency (ms)": round(event.data["latency_ms"], 1),
+                }
+                for subject_id, event in sorted(worker.attempts.items())
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+    if worker.dispatch:
+        st.dataframe(
+            [
+                {
+                    "Subject": subject_id,
+                    "Planned (ms)": round(event.data["planned_ms"], 1),
+                    "Fired (ms)": round(event.data["actual_ms"], 1),
+                    "Outcome": event.data["outcome"],
+                    "Alternative": event.data["alternative"],
+                }
+                for subject_id, event in sorted(worker.dispatch.items())
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    if worker.result is None:
+        if st.button("🛑 Abort Attack", type="secondary"):
+            worker.stop()
+            st.rerun(scope="app")
+        return
+
+    if worker.result.kind == "done":
+        if st.session_state.get("celebrated_launch") != worker.started_at:
+            st.session_state.celebrated_launch = worker.started_at
+            st.balloons()
+        st.success("Registration finished, see the dispatch report above.")
+    else:
+        st.error(worker.result.message)
+    if st.button("Dismiss", type="secondary"):
+        launches.pop(username, None)
+        st.rerun(scope="app")
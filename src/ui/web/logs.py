@@ -1,22 +1,175 @@
+"""Operation log of the web UI.
+
+This module provides:
+- LogEntry: one log record with its sequence number.
+- LogRing: fixed-capacity ring buffer of log entries with cursor reads.
+- LogView: the visible, level-filtered tail of a ring, updated incrementally.
+- setup_web_logger: routes Loguru records into the session's ring.
+- append_log: adds a record received from elsewhere, e.g. a launch worker.
+- render_logs_widget: renders the session's log tail.
+"""
+
+import threading
+from collections import deque
+from datetime import datetime
+from typing import NamedTuple
+
 import streamlit as st
 from loguru import logger
 
+from config.settings import settings
+
+# Levels offered by the widget filter, lowest first.
+_LEVELS = ("DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR")
+# Seconds between two refreshes of the log widget.
+_REFRESH_INTERVAL = 1.0
+
+
+class LogEntry(NamedTuple):
+    """A log record.
+
+    Attributes:
+        seq: Sequence number, increasing by one per appended entry.
+        levelno: Numeric level, for filtering.
+        line: Formatted ``[HH:MM:SS] LEVEL | message`` text.
+    """
+
+    seq: int
+    levelno: int
+    line: str
+
+
+class LogRing:
+    """Fixed-capacity buffer keeping the most recent log entries.
+
+    Slots are preallocated and overwritten in place, so memory stays
+    constant however many records arrive. Readers keep a cursor, the
+    sequence number after the last entry they saw, and ask for what was
+    appended since; entries overwritten before being read are skipped.
+
+    Attributes:
+        capacity (int): Number of entries kept.
+        next_seq (int): Sequence number of the next appended entry.
+
+    Methods:
+        append(levelno, line) -> None: Stores an entry, overwriting the oldest.
+        since(cursor, min_level) -> tuple[list[LogEntry], int]: Entries
+            appended after a cursor, and the new cursor.
+    """
+
+    def __init__(self, capacity: int):
+        """Initialize an empty ring of ``capacity`` entries."""
+        self.capacity = max(1, capacity)
+        self.next_seq = 0
+        self._slots: list[LogEntry | None] = [None] * self.capacity
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.next_seq, self.capacity)
+
+    def append(self, levelno: int, line: str) -> None:
+        """Store an entry, overwriting the oldest one once full."""
+        with self._lock:
+            seq = self.next_seq
+            self._slots[seq % self.capacity] = LogEntry(seq, levelno, line)
+            self.next_seq = seq + 1
+
+    def since(self, cursor: int, min_level: int = 0) -> tuple[list[LogEntry], int]:
+        """Return the entries appended at or after ``cursor``.
+
+        Parameters:
+            cursor: Sequence number returned by a previous call, 0 at first.
+            min_level: Skip entries below this numeric level.
+
+        Returns:
+            The matching entries, oldest first, and the cursor for the next
+            call.
+        """
+        with self._lock:
+            end = self.next_seq
+            start = max(cursor, end - self.capacity)
+            entries = [self._slots[seq % self.capacity] for seq in range(start, end)]
+        return [e for e in entries if e is not None and e.levelno >= min_level], end
+
+
+class LogView:
+    """The visible tail of a ring for one level filter.
+
+    ``refresh`` only reads the entries appended since the previous call and
+    rebuilds the text when something changed, so an idle rerun does no work
+    and a busy one costs at most ``visible`` lines.
+
+    Attributes:
+        min_level (int): Numeric level filter.
+        text (str): Visible lines, joined.
+
+    Methods:
+        refresh(ring) -> bool: Pulls new entries, True if the text changed.
+    """
+
+    def __init__(self, min_level: int, visible: int):
+        """Initialize an empty view."""
+        self.min_level = min_level
+        self.text = ""
+        self._lines: deque[str] = deque(maxlen=max(1, visible))
+        self._cursor = 0
+
+    def refresh(self, ring: LogRing) -> bool:
+        """Append the entries logged since the previous refresh."""
+        entries, self._cursor = ring.since(self._cursor, self.min_level)
+        if not entries:
+            return False
+        self._lines.extend(entry.line for entry in entries)
+        self.text = "\n".join(self._lines)
+        return True
+
 
 class StreamlitSink:
+    """Loguru sink appending records to a session's ring.
+
+    The ring is bound when the sink is created rather than looked up in
+    ``st.session_state`` on every write, because records also come from the
+    runtime loop thread, which has no script context.
+    """
+
+    def __init__(self, ring: LogRing):
+        self.ring = ring
+
     def write(self, message):
         record = message.record
-        time = record["time"].strftime("%H:%M:%S")
-        level = record["level"].name
-        msg = record["message"]
-        entry = f"[{time}] {level} | {msg}"
-        if "logs" not in st.session_state:
-            st.session_state.logs = []
-        st.session_state.logs.append(entry)
+        level = record["level"]
+        self.ring.append(
+            level.no, _format_line(record["time"], level.name, record["message"])
+        )
+
+
+def _format_line(time: datetime, level: str, message: str) -> str:
+    return f"[{time.strftime('%H:%M:%S')}] {level} | {message}"
+
+
+def _session_ring() -> LogRing:
+    if "log_ring" not in st.session_state:
+        st.session_state.log_ring = LogRing(settings.web_log_capacity)
+    return st.session_state.log_ring
 
 
 def setup_web_logger():
     logger.remove()
-    logger.add(StreamlitSink(), format="{message}")
+    logger.add(StreamlitSink(_session_ring()), format="{message}", level="DEBUG")
+
+
+def append_log(level: str, message: str, timestamp: float) -> None:
+    """Add a record logged outside this process to the session's ring.
+
+    Parameters:
+        level: Loguru level name.
+        message: Log message.
+        timestamp: Wall-clock time of the record.
+    """
+    _session_ring().append(
+        logger.level(level).no,
+        _format_line(datetime.fromtimestamp(timestamp), level, message),
+    )
 
 
 def render_logs_widget():
@@ -38,9 +191,24 @@ def render_logs_widget():
         """,
         unsafe_allow_html=True,
     )
+    st.selectbox("Minimum level", _LEVELS, index=1, key="log_level")
+    _render_log_tail()
+
+
+@st.fragment(run_every=_REFRESH_INTERVAL)
+def _render_log_tail():
+    ring = _session_ring()
+    min_level = logger.level(st.session_state.get("log_level", "INFO")).no
+    view: LogView | None = st.session_state.get("log_view")
+    if view is None or view.min_level != min_level:
+        view = LogView(min_level, settings.web_log_visible)
+        st.session_state.log_view = view
+    view.refresh(ring)
+
     log_container = st.container(height=300)
     with log_container:
-        if "logs" in st.session_state and st.session_state.logs:
-            st.code("\n".join(st.session_state.logs), language="text")
+        if view.text:
+            st.code(view.text, language="text")
         else:
             st.info("System ready.")
+    st.caption(f"{len(ring)} of the last {ring.capacity} entries kept.")
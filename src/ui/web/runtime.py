@@ -0,0 +1,160 @@
+"""Long-lived asyncio runtime shared by every Streamlit session.
+
+This module provides:
+- WebRuntime: a background event loop thread owning one logged-in,
+  connection-pooled WSPAsyncClient per user.
+- get_runtime: the process-wide WebRuntime, created on first use.
+- get_launches: launch workers of this server process, by username.
+- call_with_client: runs a client coroutine for the session's user and
+  returns its result.
+- run: runs any coroutine on the shared loop and returns its result.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Coroutine
+from concurrent.futures import Future
+from typing import Any
+
+import aiohttp
+import streamlit as st
+from loguru import logger
+
+from src.api.client import WSPAsyncClient
+from src.core.worker import LaunchWorker
+
+# Statuses meaning the WSP session cookie expired and a new login is needed.
+_AUTH_STATUSES = frozenset({401, 403})
+
+
+class WebRuntime:
+    """Background event loop with a client per user.
+
+    Streamlit reruns scripts on a fresh thread for every interaction, so
+    calling ``asyncio.run`` there creates a new loop, session and login each
+    time. The runtime keeps one loop running in a daemon thread instead;
+    scripts submit coroutines to it and block on the returned futures.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): Loop running in the runtime thread.
+
+    Methods:
+        submit(coro) -> Future: Schedules a coroutine on the loop.
+        login(username, password) -> int: Opens (or reopens) a user's client.
+        with_client(username, fn) -> Any: Awaits ``fn(client)`` with the
+            user's client, logging in again once if the session expired.
+        logout(username) -> None: Closes a user's client.
+        credentials(username) -> tuple[str, str]: Login of a user's client.
+    """
+
+    def __init__(self):
+        """Start the loop thread."""
+        self.loop = asyncio.new_event_loop()
+        self._clients: dict[str, WSPAsyncClient] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="wsp-web-loop", daemon=True
+        )
+        self._thread.start()
+
+    def submit[T](self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule a coroutine on the runtime loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def _lock(self, username: str) -> asyncio.Lock:
+        return self._locks.setdefault(username, asyncio.Lock())
+
+    async def login(self, username: str, password: str) -> int:
+        """Open a client for the user, replacing an existing one.
+
+        Returns:
+            The WSP user ID.
+        """
+        async with self._lock(username):
+            await self._close(username)
+            client = WSPAsyncClient(username, password)
+            await client.__aenter__()
+            try:
+                user_id = await client.login()
+            except BaseException:
+                await client.__aexit__(None, None, None)
+                raise
+            self._clients[username] = client
+            return user_id
+
+    async def with_client[T](
+        self, username: str, fn: Callable[[WSPAsyncClient], Awaitable[T]]
+    ) -> T:
+        """Await ``fn`` with the user's client.
+
+        Raises:
+            Exception: If the user has not logged in through this runtime.
+        """
+        client = self._clients.get(username)
+        if client is None:
+            raise Exception("Not logged in. Please login via the sidebar.")
+        try:
+            return await fn(client)
+        except aiohttp.ClientResponseError as e:
+            if e.status not in _AUTH_STATUSES:
+                raise
+            logger.info(f"WSP session of {username} expired, logging in again.")
+            async with self._lock(username):
+                await client.login()
+            return await fn(client)
+
+    async def _close(self, username: str) -> None:
+        client = self._clients.pop(username, None)
+        if client is not None:
+            await client.__aexit__(None, None, None)
+
+    async def logout(self, username: str) -> None:
+        """Close the user's client."""
+        async with self._lock(username):
+            await self._close(username)
+
+    def credentials(self, username: str) -> tuple[str, str]:
+        """Return the username and password the user logged in with.
+
+        Raises:
+            Exception: If the user has not logged in through this runtime.
+        """
+        client = self._clients.get(username)
+        if client is None:
+            raise Exception("Not logged in. Please login via the sidebar.")
+        return client.username, client._password
+
+
+@st.cache_resource
+def get_runtime() -> WebRuntime:
+    """Return the runtime shared by every session of this server process."""
+    return WebRuntime()
+
+
+@st.cache_resource
+def get_launches() -> dict[str, LaunchWorker]:
+    """Return the launch workers of this server process, by username.
+
+    Kept outside session state so a running attack is found again after a
+    page reload.
+    """
+    return {}
+
+
+def call_with_client[T](
+    fn: Callable[[WSPAsyncClient], Awaitable[T]], timeout: float | None = None
+) -> T:
+    """Run ``fn(client)`` with the session user's client and wait for it.
+
+    Parameters:
+        fn: Coroutine function receiving the logged-in client.
+        timeout: Seconds to wait for the result, None for no limit.
+    """
+    username = st.session_state.get("username", "")
+    runtime = get_runtime()
+    return runtime.submit(runtime.with_client(username, fn)).result(timeout)
+
+
+def run(coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+    """Run a coroutine on the shared loop and wait for its result."""
+    return get_runtime().submit(coro).result(timeout)
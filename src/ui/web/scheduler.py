@@ -1,12 +1,27 @@
 import asyncio
+import hashlib
+import json
 from typing import Any
 
 import pandas as pd
 import streamlit as st
 
-from src.api.client import WSPAsyncClient
+from src.core.intervals import IntervalIndex, lessons_by_id
+from src.core.registration import RegistrationLogic
+from src.core.solver import TimetableSolver, plan_from_timetables
+from src.ui.web.runtime import call_with_client
 from src.utils.helpers import format_time, get_lesson_type_name
-from src.utils.storage import load_saved_plan, save_plan_to_disk
+from src.utils.storage import (
+    load_saved_plan,
+    make_plan_entry,
+    plan_alternatives,
+    save_plan_to_disk,
+)
+
+# Schedules whose display frames are kept in memory, across all sessions.
+_FRAME_CACHE_ENTRIES = 128
+# Columns of the subject editor that are never edited.
+_READ_ONLY_COLUMNS = ["id", "Code", "Type", "Day", "Time", "Teacher", "Seats", "Clash"]
 
 
 def _parse_subject_identity(subject_data: dict) -> tuple[str, str]:
@@ -43,6 +58,8 @@ def render_web_scheduler():
     plan = st.session_state.plan
 
     st.info(f"User ID: {user_id} | Planned Subjects: {len(plan)}")
+    if st.button("🔄 Refresh seat counts"):
+        _refresh_seats(subjects)
 
     with st.expander("📚 Subject Selection & Scheduling", expanded=True):
         if not subjects:
@@ -57,70 +74,236 @@ def render_web_scheduler():
             icon = "✅" if is_planned else "⬜"
 
             if st.checkbox(f"{icon} {s_name} ({s_code})", key=f"chk_{s_id}"):
-                _render_subject_details(user_id, s_id, s_name, s_code, plan)
+                _render_subject_details(s_id, s_name, s_code, plan)
+
+    with st.expander("🧩 Automatic Timetable", expanded=False):
+        _render_solver(subjects, plan)
+
+
+def _refresh_seats(subjects):
+    """Revalidates the loaded schedules; everything else stays cached."""
+    loaded = [
+        int(s.get("id"))
+        for s in subjects
+        if f"schedule_{int(s.get('id'))}" in st.session_state
+    ]
+    if not loaded:
+        st.toast("No schedules loaded yet.")
+        return
+
+    try:
+        with st.spinner("Refreshing seat counts..."):
+            fresh = call_with_client(
+                lambda client: client.refresh_seats(loaded, max_age=0)
+            )
+    except Exception as e:
+        st.error(f"Failed to refresh: {e}")
+        return
+    for sid, data in fresh.items():
+        _store_schedule(sid, data)
+    st.toast(f"Seat counts refreshed for {len(fresh)} subject(s)")
+
+
+def _store_schedule(sid, data):
+    """Stores a fetched schedule together with its content digest."""
+    st.session_state[f"schedule_{sid}"] = data
+    st.session_state[f"schedule_digest_{sid}"] = _digest(data)
+
+
+def _digest(data) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+@st.cache_resource(max_entries=_FRAME_CACHE_ENTRIES)
+def _stream_frames(
+    digest: str, s_code: str, _schedule_data: dict[str, Any]
+) -> dict[str, tuple[list[dict[str, Any]], pd.DataFrame]]:
+    """Groups a schedule into streams and builds their display frames.
+
+    Cached by the schedule's content digest, so reruns reuse the frames until
+    the schedule changes. The frames are shared and must not be modified;
+    the plan-dependent ``Select`` and ``Clash`` columns are added to copies.
+    """
+    streams: dict[str, list[dict[str, Any]]] = {}
+    for s in _schedule_data.get("SCHEDULES", []):
+        streams.setdefault(str(s.get("stream", "N/A")), []).append(s)
+
+    frames = {}
+    for stream_id, lessons in streams.items():
+        rows = []
+        for lesson in lessons:
+            begin = format_time(lesson.get("beginTime"))
+            end = format_time(lesson.get("endTime"))
+            count = lesson.get("studentCount")
+            max_count = lesson.get("studentCountMax")
+            rows.append(
+                {
+                    "id": lesson["id"],
+                    "Code": s_code,
+                    "Type": get_lesson_type_name(lesson.get("lessonTypeId")),
+                    "Day": lesson.get("weekDay"),
+                    "Time": f"{begin}-{end}",
+                    "Teacher": lesson.get("teacher"),
+                    "Seats": f"{count}/{max_count}",
+                }
+            )
+        frames[stream_id] = (lessons, pd.DataFrame(rows))
+    return frames
+
+
+def _plan_index(plan) -> IntervalIndex:
+    """Returns the session's clash index, indexing newly loaded subjects."""
+    index = st.session_state.get("plan_index")
+    if index is None:
+        index = st.session_state.plan_index = IntervalIndex()
+    for s_id, entry in plan.items():
+        schedule_data = st.session_state.get(f"schedule_{s_id}")
+        if s_id not in index.subjects and schedule_data and entry:
+            preferred = plan_alternatives(entry)[0]
+            index.replace_subject(s_id, lessons_by_id(schedule_data, preferred))
+    return index
+
+
+def _render_solver(subjects, plan):
+    if not subjects:
+        return
+    subject_ids = [int(s.get("id")) for s in subjects]
+
+    if st.button("Build clash-free timetables"):
+        missing = [
+            sid for sid in subject_ids if f"schedule_{sid}" not in st.session_state
+        ]
+        try:
+            with st.spinner("Loading schedules..."):
+
+                async def fetch(client):
+                    return await asyncio.gather(
+                        *(client.get_schedule(sid) for sid in missing)
+                    )
+
+                fetched = call_with_client(fetch)
+                for sid, data in zip(missing, fetched, strict=True):
+                    _store_schedule(sid, data)
+        except Exception as e:
+            st.error(f"Failed to load: {e}")
+            return
+        schedules = {sid: st.session_state[f"schedule_{sid}"] for sid in subject_ids}
+        solver = TimetableSolver(schedules)
+        st.session_state.timetables = solver.solve()
+        st.session_state.timetable_unsolvable = solver.unsolvable
 
+    timetables = st.session_state.get("timetables")
+    if timetables is None:
+        return
+    for sid in st.session_state.get("timetable_unsolvable", []):
+        st.warning(f"Subject {sid} has no valid selection and is left out.")
+    if not timetables:
+        st.error("No clash-free timetable exists.")
+        return
+
+    names = {int(s.get("id")): _parse_subject_identity(s)[0] for s in subjects}
+    rows = []
+    for sid in subject_ids:
+        lessons = {
+            s["id"]: s for s in st.session_state[f"schedule_{sid}"].get("SCHEDULES", [])
+        }
+        row = {"Subject": names[sid]}
+        for rank, timetable in enumerate(timetables, start=1):
+            candidate = timetable.choices.get(sid)
+            row[f"#{rank}"] = (
+                "-"
+                if candidate is None
+                else f"S{candidate.stream}: "
+                + ", ".join(
+                    f"{get_lesson_type_name(lessons[i].get('lessonTypeId'))} "
+                    f"{lessons[i].get('weekDay')} "
+                    f"{format_time(lessons[i].get('beginTime'))}"
+                    for i in candidate.lesson_ids
+                )
+            )
+        rows.append(row)
+    st.dataframe(pd.DataFrame(rows), hide_index=True)
+    st.caption(
+        "Costs: "
+        + ", ".join(f"#{i + 1} {t.cost:.2f}" for i, t in enumerate(timetables))
+    )
+
+    rank = st.selectbox(
+        "Timetable to apply (the following ones become fallbacks)",
+        range(1, len(timetables) + 1),
+        format_func=lambda r: f"#{r}",
+    )
+    if st.button("✅ Apply timetable", type="primary"):
+        applied = plan_from_timetables(timetables[rank - 1 :])
+        plan.update(applied)
+        index = _plan_index(plan)
+        for sid, entry in applied.items():
+            preferred = plan_alternatives(entry)[0]
+            schedule_data = st.session_state[f"schedule_{sid}"]
+            index.replace_subject(sid, lessons_by_id(schedule_data, preferred))
+        st.session_state.plan = plan
+        save_plan_to_disk(plan)
+        st.toast(f"Applied timetable #{rank}")
+        st.rerun()
 
-def _render_subject_details(user_id, s_id, s_name, s_code, plan):
+
+def _render_subject_details(s_id, s_name, s_code, plan):
     cache_key = f"schedule_{s_id}"
 
     if cache_key not in st.session_state:
         try:
             with st.spinner(f"Loading schedule for {s_name}..."):
-
-                async def fetch():
-                    async with WSPAsyncClient() as client:
-                        client.user_id = user_id
-                        await client.login()
-                        return await client.get_schedule(s_id)
-
-                st.session_state[cache_key] = asyncio.run(fetch())
+                _store_schedule(
+                    s_id, call_with_client(lambda client: client.get_schedule(s_id))
+                )
         except Exception as e:
             st.error(f"Failed to load: {e}")
             return
 
     schedule_data = st.session_state[cache_key]
-    schedules = schedule_data.get("SCHEDULES", [])
-
-    if not schedules:
+    if not schedule_data.get("SCHEDULES"):
         st.warning("No schedule available.")
         return
 
-    streams: dict[str, list[dict[str, Any]]] = {}
-    for s in schedules:
-        streams.setdefault(str(s.get("stream", "N/A")), []).append(s)
+    digest_key = f"schedule_digest_{s_id}"
+    if digest_key not in st.session_state:
+        st.session_state[digest_key] = _digest(schedule_data)
+    streams = _stream_frames(st.session_state[digest_key], s_code, schedule_data)
 
-    with st.form(f"form_{s_id}"):
+    index = _plan_index(plan)
+    alternatives = plan_alternatives(plan.get(s_id, []))
+    labels = [f"#{i + 1}" for i in range(len(alternatives))] or ["#1"]
+    if alternatives:
+        labels.append("➕ New fallback")
+    choice = st.radio(
+        "Alternative (tried in order when a group fills up)",
+        labels,
+        horizontal=True,
+        key=f"alt_{s_id}",
+    )
+    alt_index = labels.index(choice)
+    current_selection = alternatives[alt_index] if alt_index < len(alternatives) else []
+
+    with st.form(f"form_{s_id}_{alt_index}"):
         all_dfs = {}
-        current_selection = plan.get(s_id, [])
 
-        for stream_id, lessons in streams.items():
+        for stream_id, (lessons, frame) in streams.items():
             st.markdown(f"**Stream {stream_id}**")
-            rows = []
-            for lesson in lessons:
-                l_id = lesson["id"]
-                begin = format_time(lesson.get("beginTime"))
-                end = format_time(lesson.get("endTime"))
-                count = lesson.get("studentCount")
-                max_count = lesson.get("studentCountMax")
-                rows.append(
-                    {
-                        "id": l_id,
-                        "Select": l_id in current_selection,
-                        "Code": s_code,
-                        "Type": get_lesson_type_name(lesson.get("lessonTypeId")),
-                        "Day": lesson.get("weekDay"),
-                        "Time": f"{begin}-{end}",
-                        "Teacher": lesson.get("teacher"),
-                        "Seats": f"{count}/{max_count}",
-                    }
+            df = frame.copy()
+            df.insert(1, "Select", df["id"].isin(current_selection))
+            df["Clash"] = [
+                ", ".join(
+                    f"Subj {c.subject_id} {format_time(c.begin)}"
+                    for c in index.conflicts(lesson, exclude_subject=s_id)
                 )
-
-            df = pd.DataFrame(rows)
+                for lesson in lessons
+            ]
             all_dfs[stream_id] = st.data_editor(
                 df,
-                key=f"ed_{s_id}_{stream_id}",
+                key=f"ed_{s_id}_{alt_index}_{stream_id}",
                 hide_index=True,
-                disabled=["id", "Code", "Type", "Day", "Time", "Teacher", "Seats"],
+                disabled=_READ_ONLY_COLUMNS,
                 column_config={"id": None},
             )
 
@@ -130,18 +313,51 @@ def _render_subject_details(user_id, s_id, s_name, s_code, plan):
                 final_ids.extend(df[df["Select"]]["id"].tolist())
 
             if final_ids:
-                plan[s_id] = final_ids
+                is_valid, msg = RegistrationLogic.validate_payload(
+                    schedule_data, final_ids
+                )
+                if not is_valid:
+                    st.error(f"Validation Error: {msg}")
+                    return
+                alternatives[alt_index : alt_index + 1] = [final_ids]
+                plan[s_id] = make_plan_entry(alternatives)
                 st.session_state.plan = plan
+                index.replace_subject(
+                    s_id, lessons_by_id(schedule_data, alternatives[0])
+                )
 
                 save_plan_to_disk(plan)
-                st.toast(f"Saved {s_name}")
-                st.rerun()
-            else:
-                if s_id in plan:
-                    del plan[s_id]
-                    st.session_state.plan = plan
-                    save_plan_to_disk(plan)
-                    st.toast(f"Removed {s_name} from plan")
+                st.toast(f"Saved {s_name} (alternative #{alt_index + 1})")
+                clashes = [
+                    (lesson, other)
+                    for lesson in lessons_by_id(schedule_data, final_ids)
+                    for other in index.conflicts(lesson, exclude_subject=s_id)
+                ]
+                if not clashes:
                     st.rerun()
+                for lesson, other in clashes:
+                    st.warning(
+                        f"Time clash: {lesson.get('weekDay')} "
+                        f"{format_time(lesson.get('beginTime'))} overlaps "
+                        f"Subj {other.subject_id} "
+                        f"{format_time(other.begin)}-{format_time(other.end)}"
+                    )
+            elif alt_index < len(alternatives):
+                del alternatives[alt_index]
+                if alternatives:
+                    plan[s_id] = make_plan_entry(alternatives)
+                    st.toast(f"Removed alternative #{alt_index + 1} of {s_name}")
                 else:
-                    st.warning("No lessons selected.")
+                    del plan[s_id]
+                    st.toast(f"Removed {s_name} from plan")
+                index.replace_subject(
+                    s_id,
+                    lessons_by_id(schedule_data, alternatives[0])
+                    if alternatives
+                    else [],
+                )
+                st.session_state.plan = plan
+                save_plan_to_disk(plan)
+                st.rerun()
+            else:
+                st.warning("No lessons selected.")
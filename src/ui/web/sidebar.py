@@ -1,10 +1,8 @@
-import asyncio
-
 import streamlit as st
 
 from config.settings import settings
-from src.api.client import WSPAsyncClient
 from src.core.scheduler import TimeScheduler
+from src.ui.web.runtime import call_with_client, get_runtime, run
 
 
 def render_sidebar():
@@ -18,9 +16,10 @@ def render_sidebar():
 def _render_auth_section():
     st.subheader("Authentication")
     if st.session_state.get("logged_in"):
-        st.success(f"Logged in as: **{settings.username}**")
+        st.success(f"Logged in as: **{st.session_state.get('username')}**")
         st.info(f"User ID: {st.session_state.get('user_id')}")
         if st.button("Logout", type="secondary"):
+            run(get_runtime().logout(st.session_state.get("username", "")))
             st.session_state.clear()
             st.rerun()
         return
@@ -29,21 +28,14 @@ def _render_auth_section():
     password = st.text_input("Password", type="password", value=settings.password)
 
     if st.button("Login & Fetch Subjects", type="primary"):
-
-        async def login_flow():
-            async with WSPAsyncClient() as client:
-                uid = await client.login()
-                subjects = await client.get_accruals()
-                return uid, subjects
-
         try:
             with st.spinner("Authenticating..."):
-                uid, subjects = asyncio.run(login_flow())
+                uid = run(get_runtime().login(username, password))
+                st.session_state.username = username
+                subjects = call_with_client(lambda client: client.get_accruals())
                 st.session_state.user_id = uid
                 st.session_state.raw_subjects = subjects
                 st.session_state.logged_in = True
-                settings.username = username
-                settings.password = password
                 st.toast(f"Welcome, ID {uid}!")
                 st.rerun()
         except Exception as e:
@@ -54,7 +46,7 @@ def _render_timer_section():
     st.subheader("Time Synchronization")
     if st.button("Sync NTP"):
         scheduler = TimeScheduler()
-        scheduler.sync_ntp()
+        run(scheduler.sync_ntp())
         st.session_state.time_offset = scheduler.time_offset
         st.toast(f"NTP Offset: {scheduler.time_offset:.4f}s")
 
@@ -0,0 +1,155 @@
+"""Persistent on-disk cache of WSP API responses.
+
+This module provides:
+- CacheEntry: a cached payload with its age and revalidation validators.
+- ResponseCache: per-user JSON files with size-bounded LRU eviction.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from config.settings import settings
+
+
+@dataclass
+class CacheEntry:
+    """A cached response.
+
+    Attributes:
+        data: Decoded JSON payload.
+        stored_at: Wall-clock time the payload was last confirmed current.
+        etag: ``ETag`` of the response, for ``If-None-Match``.
+        last_modified: ``Last-Modified`` of the response, for
+            ``If-Modified-Since``.
+    """
+
+    data: Any
+    stored_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the payload was last confirmed current."""
+        return time.time() - self.stored_at
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """JSON files under ``directory``, one per user, kind and key.
+
+    Reads refresh a file's modification time, so eviction, which runs after
+    every write once the directory exceeds ``max_bytes``, drops the least
+    recently used entries first. Writes go through a temporary file and
+    ``os.replace`` so concurrent CLI and web sessions never read a torn file.
+
+    Attributes:
+        directory (str): Cache directory.
+        max_bytes (int): Size the directory is trimmed back to.
+
+    Methods:
+        from_settings() -> ResponseCache | None: Cache configured by
+            ``WSP_CACHE_*``, None if disabled.
+        get(user_id, kind, key) -> CacheEntry | None: Reads an entry.
+        put(user_id, kind, key, entry) -> None: Writes an entry.
+        touch(user_id, kind, key, entry) -> None: Marks an entry as current.
+        clear() -> None: Deletes every entry.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """Initialize the cache; the directory is created on first write."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache | None":
+        """Build the cache configured by ``WSP_CACHE_*``, None if disabled."""
+        if not settings.cache_dir or settings.cache_max_bytes <= 0:
+            return None
+        return cls(settings.cache_dir, settings.cache_max_bytes)
+
+    def _path(self, user_id: int | None, kind: str, key: Any) -> str:
+        return os.path.join(self.directory, f"{user_id}_{kind}_{key}.json")
+
+    def get(self, user_id: int | None, kind: str, key: Any) -> CacheEntry | None:
+        """Read an entry, or None if it is missing or unreadable."""
+        path = self._path(user_id, kind, key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = CacheEntry(**json.load(f))
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Dropping unreadable cache entry {path}: {e}")
+            return None
+
+    def put(self, user_id: int | None, kind: str, key: Any, entry: CacheEntry) -> None:
+        """Write an entry and trim the directory to ``max_bytes``."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry.__dict__, f, ensure_ascii=False)
+            os.replace(tmp, self._path(user_id, kind, key))
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry: {e}")
+            return
+        self._evict()
+
+    def touch(
+        self, user_id: int | None, kind: str, key: Any, entry: CacheEntry
+    ) -> None:
+        """Mark an entry as confirmed current, e.g. after a 304."""
+        entry.stored_at = time.time()
+        self.put(user_id, kind, key, entry)
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        for path, _, _ in self._files():
+            os.remove(path)
+
+    def _files(self) -> list[tuple[str, float, int]]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        files = []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((path, stat.st_mtime, stat.st_size))
+        return files
+
+    def _evict(self) -> None:
+        files = self._files()
+        total = sum(size for _, _, size in files)
+        if total <= self.max_bytes:
+            return
+        for path, _, size in sorted(files, key=lambda f: f[1]):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -30,7 +30,7 @@ def setup_logger(level: str = "INFO", log_file: str = "logs/wsp_sniper.log"):
 
     if log_file:
         file_format = (
-            "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | "
+            "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | "
             "{name}:{function}:{line} - {message}"
         )
         logger.add(
@@ -6,9 +6,57 @@ from loguru import logger
 SAVE_FILE = "saved_plan.json"
 
 
+def plan_alternatives(entry: list) -> list[list[int]]:
+    """Returns the ranked alternative payloads of a plan entry.
+
+    An entry is either a flat list of lesson IDs (a single payload, the
+    original format) or a list of such lists, best alternative first.
+    """
+    if not entry:
+        return []
+    if isinstance(entry[0], list):
+        return [list(alternative) for alternative in entry if alternative]
+    return [list(entry)]
+
+
+def make_plan_entry(alternatives: list[list[int]]) -> list:
+    """Builds a plan entry, keeping the flat format for a single payload."""
+    alternatives = [a for a in alternatives if a]
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return alternatives
+
+
+def _is_payload(alternative: object) -> bool:
+    return (
+        isinstance(alternative, list)
+        and bool(alternative)
+        and all(type(i) is int for i in alternative)
+    )
+
+
+def _sanitize_entry(subject_id: int, entry: object) -> list | None:
+    """Keeps the well-formed alternatives of a loaded entry, None if none is."""
+    if isinstance(entry, list) and entry and isinstance(entry[0], list):
+        alternatives = entry
+    else:
+        alternatives = [entry]
+    valid = [a for a in alternatives if _is_payload(a)]
+    if len(valid) < len(alternatives):
+        logger.warning(
+            f"Saved plan: subject {subject_id} has "
+            f"{len(alternatives) - len(valid)} empty or malformed alternative(s)"
+            + ("" if valid else ", skipped")
+            + "."
+        )
+    return make_plan_entry(valid) if valid else None
+
+
 def load_saved_plan() -> dict:
     """Loads the saved plan from disk.
-    Converts JSON string keys back to integers (Subject IDs).
+    Converts JSON string keys back to integers (Subject IDs) and drops
+    alternatives that are empty or not lists of lesson IDs, so every entry
+    left has at least one payload.
     """
     if not os.path.exists(SAVE_FILE):
         return {}
@@ -16,7 +64,12 @@ def load_saved_plan() -> dict:
     try:
         with open(SAVE_FILE, encoding="utf-8") as f:
             data = json.load(f)
-            return {int(k): v for k, v in data.items()}
+        plan = {}
+        for key, entry in data.items():
+            sanitized = _sanitize_entry(int(key), entry)
+            if sanitized is not None:
+                plan[int(key)] = sanitized
+        return plan
     except Exception as e:
         logger.error(f"Failed to load saved plan: {e}")
         return {}
@@ -0,0 +1,11 @@
+"""Shared test setup.
+
+``config.settings`` is instantiated on import and requires the WSP
+credentials, so placeholders are provided before any test module loads it.
+"""
+
+import os
+
+os.environ.setdefault("WSP_BASE_URL", "http://wsp.test")
+os.environ.setdefault("WSP_USERNAME", "student")
+os.environ.setdefault("WSP_PASSWORD", "secret")
@@ -0,0 +1,57 @@
+"""Tests of the request budget."""
+
+import asyncio
+
+import pytest
+
+from src.api.budget import RequestBudget
+
+
+def test_burst_is_granted_without_waiting():
+    async def run():
+        budget = RequestBudget(rate=10, burst=3, adaptive=False)
+        return [await budget.acquire(1) for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.0, 0.0, 0.0]
+
+
+def test_higher_priority_is_granted_first():
+    async def run():
+        budget = RequestBudget(rate=100, burst=1, adaptive=False)
+        await budget.acquire(1)
+        order = []
+
+        async def request(subject_id, priority):
+            await budget.acquire(subject_id, priority)
+            order.append(subject_id)
+
+        await asyncio.gather(request(1, 0), request(2, -1), request(3, 1))
+        return order
+
+    assert asyncio.run(run()) == [3, 1, 2]
+
+
+def test_cancelled_grant_passes_its_token_on():
+    async def run():
+        budget = RequestBudget(rate=5, burst=1, adaptive=False)
+        await budget.acquire(1)
+        first = asyncio.create_task(budget.acquire(1))
+        second = asyncio.create_task(budget.acquire(2))
+        await asyncio.sleep(0)
+
+        # Cancel the first waiter right after the dispatch granted it.
+        dispatch = budget._dispatch
+
+        def dispatch_then_cancel():
+            dispatch()
+            first.cancel()
+
+        budget._dispatch = dispatch_then_cancel  # type: ignore[method-assign]
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # Without the refund the next token would take another 0.2 s.
+        await asyncio.wait_for(second, 0.1)
+        return budget
+
+    budget = asyncio.run(run())
+    assert budget._granted == {1: 1, 2: 1}
@@ -0,0 +1,37 @@
+"""Tests of the dispatch schedule of first attempts."""
+
+import pytest
+
+from src.core.dispatch import DISPATCH_STRATEGIES, fire_offsets
+
+
+def test_stagger_spaces_subjects_by_delay():
+    assert fire_offsets(4, "stagger", 0.05, 1.0) == pytest.approx(
+        (0.0, 0.05, 0.1, 0.15)
+    )
+
+
+def test_burst_fires_everything_at_once():
+    assert fire_offsets(3, "burst", 0.05, 1.0) == (0.0, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("strategy", ["spread", "priority"])
+def test_window_strategies_spread_over_the_window(strategy):
+    assert fire_offsets(5, strategy, 0.05, 0.2) == pytest.approx(
+        (0.0, 0.05, 0.1, 0.15, 0.2)
+    )
+
+
+@pytest.mark.parametrize("strategy", DISPATCH_STRATEGIES)
+def test_first_subject_fires_at_launch(strategy):
+    assert fire_offsets(1, strategy, 0.05, 0.2) == (0.0,)
+    assert fire_offsets(0, strategy, 0.05, 0.2) == ()
+
+
+def test_priority_with_zero_window_is_a_burst():
+    assert fire_offsets(3, "priority", 0.05, 0.0) == (0.0, 0.0, 0.0)
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown dispatch strategy"):
+        fire_offsets(2, "random", 0.05, 0.2)
@@ -0,0 +1,145 @@
+"""Tests of the time-clash index."""
+
+import itertools
+import random
+
+import pytest
+
+from src.core.intervals import IntervalIndex, lessons_by_id
+
+
+def lesson(lesson_id: int, day: str, begin: float, end: float):
+    return {"id": lesson_id, "weekDay": day, "beginTime": begin, "endTime": end}
+
+
+def ids(slots) -> set[int]:
+    return {slot.lesson_id for slot in slots}
+
+
+def test_conflicts_on_the_same_day_only():
+    index = IntervalIndex()
+    index.insert(1, lesson(11, "MON", 9, 10.5))
+    index.insert(1, lesson(12, "TUE", 9, 10.5))
+    assert ids(index.conflicts(lesson(21, "MON", 10, 11))) == {11}
+    assert ids(index.conflicts(lesson(22, "WED", 10, 11))) == set()
+
+
+def test_touching_lessons_do_not_conflict():
+    index = IntervalIndex()
+    index.insert(1, lesson(11, "MON", 9, 10.5))
+    assert index.conflicts(lesson(21, "MON", 10.5, 12)) == []
+    assert index.conflicts(lesson(22, "MON", 7.5, 9)) == []
+
+
+def test_long_lesson_starting_early_is_found():
+    index = IntervalIndex()
+    index.insert(1, lesson(11, "MON", 8, 14))
+    index.insert(1, lesson(12, "MON", 9, 9.5))
+    assert ids(index.conflicts(lesson(21, "MON", 13, 15))) == {11}
+
+
+def test_conflicts_exclude_subject_and_the_lesson_itself():
+    index = IntervalIndex()
+    index.insert(1, lesson(11, "MON", 9, 10.5))
+    index.insert(2, lesson(21, "MON", 9, 10.5))
+    assert ids(index.conflicts(lesson(11, "MON", 9, 10.5))) == {21}
+    assert ids(index.conflicts(lesson(31, "MON", 9, 10), exclude_subject=2)) == {11}
+
+
+def test_lessons_without_time_are_ignored():
+    index = IntervalIndex()
+    assert index.insert(1, {"id": 11, "weekDay": "MON"}) is None
+    assert len(index) == 0
+    assert index.conflicts({"id": 21, "weekDay": "MON"}) == []
+
+
+def test_remove_and_reinsert():
+    index = IntervalIndex()
+    index.insert(1, lesson(11, "MON", 9, 10.5))
+    index.insert(1, lesson(11, "TUE", 9, 10.5))
+    assert len(index) == 1
+    assert index.conflicts(lesson(21, "MON", 9, 10)) == []
+    index.remove(11)
+    index.remove(11)
+    assert 11 not in index
+    assert index.subjects == {}
+
+
+def test_replace_subject():
+    index = IntervalIndex()
+    index.replace_subject(1, [lesson(11, "MON", 9, 10.5), lesson(12, "TUE", 9, 10)])
+    index.replace_subject(1, [lesson(13, "WED", 9, 10)])
+    assert ids(index.subjects[1]) == {13}
+    assert 11 not in index
+    assert 12 not in index
+
+
+def test_clashes_pairs_different_subjects():
+    index = IntervalIndex()
+    index.insert(1, lesson(11, "MON", 9, 10.5))
+    index.insert(1, lesson(12, "MON", 10, 11))
+    index.insert(2, lesson(21, "MON", 10.25, 12))
+    index.insert(3, lesson(31, "TUE", 10, 11))
+    assert {(a.lesson_id, b.lesson_id) for a, b in index.clashes()} == {
+        (11, 21),
+        (12, 21),
+    }
+
+
+def test_from_plan_indexes_the_preferred_alternative():
+    schedules = {
+        1: {"SCHEDULES": [lesson(11, "MON", 9, 10), lesson(12, "TUE", 9, 10)]},
+        2: {"SCHEDULES": [lesson(21, "MON", 9, 10)]},
+    }
+    plan = {1: [[11], [12]], 2: [21], 3: [31]}
+    index = IntervalIndex.from_plan(plan, schedules)
+    assert ids(index.subjects[1]) == {11}
+    assert ids(index.subjects[2]) == {21}
+    assert 3 not in index.subjects
+    assert len(index.clashes()) == 1
+
+
+def test_lessons_by_id():
+    data = {"SCHEDULES": [lesson(11, "MON", 9, 10), lesson(12, "TUE", 9, 10)]}
+    assert lessons_by_id(data, [12, 99]) == [data["SCHEDULES"][1]]
+    assert lessons_by_id({}, [11]) == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_a_linear_scan(seed):
+    rng = random.Random(seed)
+    days = ("MON", "TUE")
+    index = IntervalIndex()
+    indexed = {}
+    for lesson_id in range(60):
+        begin = rng.randint(16, 40) / 2
+        data = lesson(lesson_id, rng.choice(days), begin, begin + rng.randint(1, 8) / 2)
+        subject_id = rng.randint(1, 6)
+        index.insert(subject_id, data)
+        indexed[lesson_id] = (subject_id, data)
+        if rng.random() < 0.2:
+            removed = rng.choice(list(indexed))
+            index.remove(removed)
+            del indexed[removed]
+
+    def overlap(a, b):
+        return (
+            a["weekDay"] == b["weekDay"]
+            and a["beginTime"] < b["endTime"]
+            and b["beginTime"] < a["endTime"]
+        )
+
+    for _ in range(50):
+        begin = rng.randint(16, 40) / 2
+        query = lesson(-1, rng.choice(days), begin, begin + rng.randint(1, 6) / 2)
+        expected = {i for i, (_, data) in indexed.items() if overlap(query, data)}
+        assert ids(index.conflicts(query)) == expected
+
+    expected_pairs = {
+        frozenset((a, b))
+        for (a, (sa, da)), (b, (sb, db)) in itertools.combinations(indexed.items(), 2)
+        if sa != sb and overlap(da, db)
+    }
+    assert {
+        frozenset((a.lesson_id, b.lesson_id)) for a, b in index.clashes()
+    } == expected_pairs
@@ -0,0 +1,51 @@
+"""Tests of the seat-scarcity score of planned subjects."""
+
+import pytest
+
+from src.core.priority import score_subject
+
+
+def lesson(lesson_id, taken, capacity, stream="1"):
+    return {
+        "id": lesson_id,
+        "stream": stream,
+        "studentCount": taken,
+        "studentCountMax": capacity,
+    }
+
+
+def schedule(*lessons):
+    return {"SEMESTER_SUBJECT": {"name": "Physics"}, "SCHEDULES": list(lessons)}
+
+
+def test_tightest_chosen_lesson_drives_the_score():
+    data = schedule(lesson(1, 5, 30), lesson(2, 28, 30), lesson(3, 30, 30))
+    priority = score_subject(7, data, [1, 2])
+    assert priority.lesson_id == 2
+    assert priority.fill == pytest.approx(28 / 30)
+    assert priority.remaining == 2
+    assert priority.name == "Physics"
+
+
+def test_alternative_streams_lower_the_score():
+    single = score_subject(7, schedule(lesson(1, 10, 30)), [1])
+    several = score_subject(
+        7, schedule(lesson(1, 10, 30), lesson(2, 10, 30, stream="2")), [1]
+    )
+    assert several.score < single.score
+
+
+def test_unknown_capacity_is_neutral():
+    unknown = score_subject(7, schedule(lesson(1, 12, 0)), [1])
+    roomy = score_subject(7, schedule(lesson(1, 0, 30)), [1])
+    assert unknown.fill is None
+    assert unknown.remaining is None
+    assert unknown.score <= roomy.score
+    assert unknown.weight < score_subject(7, schedule(lesson(1, 29, 30)), [1]).weight
+
+
+def test_known_capacity_wins_over_unknown():
+    data = schedule(lesson(1, 5, None), lesson(2, 20, 30))
+    priority = score_subject(7, data, [1, 2])
+    assert priority.lesson_id == 2
+    assert priority.remaining == 10
@@ -0,0 +1,163 @@
+"""Tests of plan validation and of the failover between plan alternatives."""
+
+import asyncio
+import time
+
+import pytest
+
+from config.settings import settings
+from src.api.prepared import PreparedRequest
+from src.api.transport import RegistrationResponse
+from src.core.registration import RegistrationLogic
+from src.core.retry import NOT_STARTED_MARKER, Backoff, Outcome, RetryPolicy
+
+
+def lesson(lesson_id: int, lesson_type: int, stream: str = "1", group: int = 1):
+    return {
+        "id": lesson_id,
+        "lessonTypeId": lesson_type,
+        "stream": stream,
+        "group": group,
+    }
+
+
+SCHEDULE = {
+    "SEMESTER_SUBJECT": {"formula": "1/0/1"},
+    "SCHEDULES": [
+        lesson(1, 1),
+        lesson(2, 3),
+        lesson(3, 3, group=2),
+        lesson(4, 1, stream="2"),
+        lesson(5, 3, stream="2"),
+    ],
+}
+
+
+def test_validate_payload():
+    assert RegistrationLogic.validate_payload(SCHEDULE, [1, 2]) == (True, "OK")
+    valid, message = RegistrationLogic.validate_payload(SCHEDULE, [1, 99])
+    assert not valid
+    assert "99" in message
+    valid, message = RegistrationLogic.validate_payload(SCHEDULE, [1, 5])
+    assert not valid
+    assert "same stream" in message
+    valid, message = RegistrationLogic.validate_payload(SCHEDULE, [1])
+    assert not valid
+    assert "mismatch" in message
+
+
+def test_validate_payload_with_unknown_formula():
+    schedule = {**SCHEDULE, "SEMESTER_SUBJECT": {"formula": None}}
+    assert RegistrationLogic.validate_payload(schedule, [1])[0]
+
+
+def test_validate_plan_keeps_valid_alternatives_in_order():
+    plan = {10: [[4, 5], [1, 99], [1, 3]], 11: [1, 2]}
+    schedules = {10: SCHEDULE, 11: SCHEDULE}
+    assert RegistrationLogic.validate_plan(plan, schedules) == {
+        10: [[4, 5], [1, 3]],
+        11: [1, 2],
+    }
+
+
+def test_validate_plan_collapses_a_single_survivor_to_the_flat_format():
+    plan = {10: [[1, 99], [1, 2]]}
+    assert RegistrationLogic.validate_plan(plan, {10: SCHEDULE}) == {10: [1, 2]}
+
+
+def test_validate_plan_drops_subjects_without_valid_alternatives():
+    plan = {10: [[1], [1, 5]], 11: [1, 2]}
+    schedules = {10: SCHEDULE, 11: SCHEDULE}
+    assert RegistrationLogic.validate_plan(plan, schedules) == {11: [1, 2]}
+
+
+def test_validate_plan_keeps_subjects_without_schedule():
+    plan = {10: [[1, 99]], 12: [7, 8]}
+    assert RegistrationLogic.validate_plan(plan, {10: SCHEDULE}) == {12: [7, 8]}
+
+
+OK = RegistrationResponse(200, "Saved")
+NOT_STARTED = RegistrationResponse(500, NOT_STARTED_MARKER)
+NO_SEATS = RegistrationResponse(400, "No free seats")
+
+
+class FakeClient:
+    """Answers save requests from a script and seat polls from a schedule.
+
+    Attributes:
+        answers: Responses per payload, consumed in order; the last one
+            repeats.
+        lessons: Lessons returned by every seat poll.
+        latency: Seconds a save request waits for its answer.
+        sent: Payloads of the save requests, in sending order.
+    """
+
+    def __init__(self, answers, lessons, latency=0.0):
+        self.answers = {tuple(k): list(v) for k, v in answers.items()}
+        self.lessons = lessons
+        self.latency = latency
+        self.sent: list[tuple[int, ...]] = []
+
+    async def register_lessons(self, request, attempt=1):
+        self.sent.append(request.payload)
+        await asyncio.sleep(self.latency)
+        answers = self.answers[request.payload]
+        return answers.pop(0) if len(answers) > 1 else answers[0]
+
+    async def poll_schedule(self, subject_id):
+        return {"SCHEDULES": self.lessons}
+
+
+def seats(lesson_id, taken, capacity, registered=False):
+    return {
+        "id": lesson_id,
+        "studentCount": taken,
+        "studentCountMax": capacity,
+        "studentRegistered": registered,
+    }
+
+
+@pytest.fixture
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(settings, "seat_poll_interval", 0.01)
+
+
+def register(client, *payloads, retry_delay=0.01):
+    policy = RetryPolicy(
+        {Outcome.TOO_EARLY: Backoff(retry_delay)}, full_markers=["no free seats"]
+    )
+    alternatives = tuple(
+        PreparedRequest.build("http://wsp.test", 1, 10, list(p)) for p in payloads
+    )
+    return asyncio.run(
+        RegistrationLogic._register_subject(client, alternatives, policy)
+    )
+
+
+def test_server_full_answer_fails_over(fast_polls):
+    client = FakeClient({(1,): [NO_SEATS], (2,): [OK]}, [])
+    assert register(client, [1], [2]) == (Outcome.SUCCESS, 2)
+    assert client.sent == [(1,), (2,)]
+
+
+def test_full_seat_poll_stops_retries_and_fails_over(fast_polls):
+    client = FakeClient({(1,): [NOT_STARTED], (2,): [OK]}, [seats(1, 30, 30)])
+    started = time.monotonic()
+    assert register(client, [1], [2], retry_delay=10.0) == (Outcome.SUCCESS, 2)
+    assert time.monotonic() - started < 5.0
+    assert client.sent == [(1,), (2,)]
+
+
+def test_save_in_flight_is_answered_before_failing_over(fast_polls):
+    # The poll shows the lesson full while the first save is still pending.
+    client = FakeClient({(1,): [OK], (2,): [OK]}, [seats(1, 30, 30)], latency=0.1)
+    assert register(client, [1], [2]) == (Outcome.SUCCESS, 1)
+    assert client.sent == [(1,)]
+
+
+def test_seat_poll_ignores_registered_and_unknown_capacity(fast_polls):
+    lessons = [seats(1, 30, 30, registered=True), seats(2, 5, 0), seats(9, 1, 1)]
+    answers = {(1, 2): [NOT_STARTED] * 5 + [OK], (3,): [OK]}
+    client = FakeClient(answers, lessons)
+    assert register(client, [1, 2], [3]) == (Outcome.SUCCESS, 1)
+    assert (3,) not in client.sent
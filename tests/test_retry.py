@@ -0,0 +1,124 @@
+"""Tests of response classification and the retry policy."""
+
+import random
+
+import pytest
+
+from src.api.transport import RegistrationResponse
+from src.core.retry import (
+    NOT_STARTED_MARKER,
+    Backoff,
+    Outcome,
+    RetryPolicy,
+    classify,
+    parse_retry_after,
+)
+
+TERMINAL = ["not allowed"]
+FULL = ["no free seats"]
+REGISTERED = ["already registered"]
+
+
+def outcome(status: int, text: str = "") -> Outcome:
+    return classify(RegistrationResponse(status, text), TERMINAL, FULL, REGISTERED)
+
+
+@pytest.mark.parametrize(
+    ("status", "text", "expected"),
+    [
+        (200, "", Outcome.SUCCESS),
+        (0, "Connection reset", Outcome.NETWORK),
+        (500, f"Error: {NOT_STARTED_MARKER}", Outcome.TOO_EARLY),
+        (500, "Internal error", Outcome.ERROR),
+        (429, "", Outcome.OVERLOADED),
+        (502, "", Outcome.OVERLOADED),
+        (503, "", Outcome.OVERLOADED),
+        (504, "", Outcome.OVERLOADED),
+        (400, "You are ALREADY REGISTERED", Outcome.REGISTERED),
+        (400, "No free seats in group 2", Outcome.FULL),
+        (403, "Not allowed for your program", Outcome.TERMINAL),
+        (400, "Unexpected", Outcome.ERROR),
+    ],
+)
+def test_classify(status, text, expected):
+    assert outcome(status, text) is expected
+
+
+def test_classify_checks_registered_before_full_and_terminal():
+    assert outcome(400, "already registered, no free seats") is Outcome.REGISTERED
+    assert outcome(400, "no free seats, not allowed") is Outcome.FULL
+
+
+def test_classify_without_optional_markers():
+    response = RegistrationResponse(400, "already registered")
+    assert classify(response, []) is Outcome.ERROR
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Mon, 01 Sep 2025 04:00:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_backoff_grows_up_to_cap():
+    backoff = Backoff(0.1, factor=2.0, cap=0.5)
+    rng = random.Random(0)
+    delays = [backoff.delay(streak, rng) for streak in range(1, 6)]
+    assert delays == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+
+def test_backoff_jitter_only_shortens():
+    backoff = Backoff(1.0, jitter=0.25)
+    rng = random.Random(0)
+    delays = [backoff.delay(1, rng) for _ in range(200)]
+    assert all(0.75 <= d <= 1.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def policy(**kwargs) -> RetryPolicy:
+    backoffs = {
+        Outcome.TOO_EARLY: Backoff(0.1),
+        Outcome.OVERLOADED: Backoff(0.2, factor=2.0, cap=1.0),
+    }
+    return RetryPolicy(backoffs, rng=random.Random(0), **kwargs)
+
+
+def test_next_delay_stops_on_outcomes_without_backoff():
+    retry = policy()
+    for final in (Outcome.SUCCESS, Outcome.REGISTERED, Outcome.FULL):
+        assert retry.next_delay(final, 1, 1, 0.0) is None
+    assert retry.next_delay(Outcome.OVERLOADED, 3, 3, 0.0) == pytest.approx(0.8)
+
+
+def test_next_delay_respects_max_attempts():
+    retry = policy(max_attempts=3)
+    assert retry.next_delay(Outcome.TOO_EARLY, 2, 2, 0.0) == pytest.approx(0.1)
+    assert retry.next_delay(Outcome.TOO_EARLY, 3, 3, 0.0) is None
+
+
+def test_next_delay_respects_deadline():
+    retry = policy(deadline=5.0)
+    assert retry.next_delay(Outcome.TOO_EARLY, 1, 1, 4.85) == pytest.approx(0.1)
+    assert retry.next_delay(Outcome.TOO_EARLY, 1, 1, 4.95) is None
+
+
+def test_next_delay_honours_capped_retry_after():
+    assert policy().next_delay(Outcome.OVERLOADED, 1, 1, 0.0, "3") == 0.2
+    retry = policy(retry_after_cap=2.0)
+    assert retry.next_delay(Outcome.OVERLOADED, 1, 1, 0.0, "1") == 1.0
+    assert retry.next_delay(Outcome.OVERLOADED, 1, 1, 0.0, "30") == 2.0
+    # A hint shorter than the backoff never shortens it.
+    assert retry.next_delay(Outcome.OVERLOADED, 1, 1, 0.0, "0") == 0.2
+
+
+def test_legacy_retries_everything_but_success_and_registered():
+    retry = RetryPolicy.legacy()
+    assert retry.classify(RegistrationResponse(400, "Already registered")) is (
+        Outcome.REGISTERED
+    )
+    assert retry.next_delay(Outcome.REGISTERED, 1, 1, 0.0) is None
+    assert retry.next_delay(Outcome.SUCCESS, 1, 1, 0.0) is None
+    for retried in (Outcome.FULL, Outcome.TERMINAL, Outcome.ERROR, Outcome.NETWORK):
+        assert retry.next_delay(retried, 50, 50, 3600.0) == 0.5
@@ -0,0 +1,216 @@
+"""Tests of the timetable solver."""
+
+import itertools
+import random
+
+import pytest
+
+from src.core.solver import (
+    SolverPreferences,
+    TimetableSolver,
+    plan_from_timetables,
+    subject_candidates,
+)
+
+
+def lesson(
+    lesson_id: int,
+    lesson_type: int,
+    day: str,
+    begin: float,
+    stream: str = "1",
+    taken: int = 0,
+    capacity: int = 30,
+    teacher: str = "",
+):
+    return {
+        "id": lesson_id,
+        "lessonTypeId": lesson_type,
+        "stream": stream,
+        "group": lesson_id,
+        "weekDay": day,
+        "beginTime": begin,
+        "endTime": begin + 1.5,
+        "studentCount": taken,
+        "studentCountMax": capacity,
+        "teacher": teacher,
+    }
+
+
+def schedule(formula: str | None, *lessons):
+    return {"SEMESTER_SUBJECT": {"formula": formula}, "SCHEDULES": list(lessons)}
+
+
+def solver(schedules, top_k=3, node_limit=0, **preferences):
+    return TimetableSolver(
+        schedules, SolverPreferences(**preferences), top_k, node_limit
+    )
+
+
+def test_candidates_follow_formula_within_one_stream():
+    data = schedule(
+        "1/0/1",
+        lesson(1, 1, "MON", 9),
+        lesson(2, 3, "MON", 11),
+        lesson(3, 3, "TUE", 9),
+        lesson(4, 1, "WED", 9, stream="2"),
+    )
+    ids = {c.lesson_ids for c in subject_candidates(7, data)}
+    assert ids == {(1, 2), (1, 3)}
+
+
+def test_candidates_skip_full_lessons_and_internal_clashes():
+    data = schedule(
+        "1/0/1",
+        lesson(1, 1, "MON", 9),
+        lesson(2, 3, "MON", 10),  # overlaps the lecture
+        lesson(3, 3, "TUE", 9, taken=30),  # full
+        lesson(4, 3, "TUE", 11),
+    )
+    assert [c.lesson_ids for c in subject_candidates(7, data)] == [(1, 4)]
+    allowed = SolverPreferences(allow_full=True)
+    assert {c.lesson_ids for c in subject_candidates(7, data, allowed)} == {
+        (1, 3),
+        (1, 4),
+    }
+
+
+def test_candidates_with_unknown_formula_take_one_lesson_per_type():
+    data = schedule(None, lesson(1, 1, "MON", 9), lesson(2, 2, "TUE", 9))
+    assert [c.lesson_ids for c in subject_candidates(7, data)] == [(1, 2)]
+
+
+def test_candidates_are_sorted_by_cost():
+    data = schedule(
+        "1/0/0",
+        lesson(1, 1, "MON", 9, taken=25),
+        lesson(2, 1, "TUE", 9, taken=5),
+        lesson(3, 1, "WED", 9, teacher="Dr. Avoided"),
+    )
+    preferences = SolverPreferences(avoided_teachers=("avoided",))
+    candidates = subject_candidates(7, data, preferences)
+    assert [c.lesson_ids for c in candidates] == [(2,), (1,), (3,)]
+    assert [c.cost for c in candidates] == sorted(c.cost for c in candidates)
+
+
+def test_unknown_capacity_adds_no_seat_cost():
+    preferences = SolverPreferences()
+    unknown = lesson(1, 1, "MON", 9, taken=12, capacity=0)
+    assert preferences.lesson_cost(unknown) == 0.0
+    assert preferences.lesson_cost({**unknown, "studentCountMax": None}) == 0.0
+    assert preferences.lesson_cost(lesson(2, 1, "MON", 9, taken=15)) == 0.5
+    data = schedule("1/0/0", lesson(1, 1, "MON", 9, taken=10), unknown | {"id": 3})
+    assert [c.lesson_ids for c in subject_candidates(7, data)] == [(3,), (1,)]
+
+
+def test_solver_avoids_cross_subject_clashes():
+    schedules = {
+        1: schedule("1/0/0", lesson(11, 1, "MON", 9), lesson(12, 1, "TUE", 9)),
+        2: schedule("1/0/0", lesson(21, 1, "MON", 9, taken=0)),
+    }
+    best = solver(schedules).solve()[0]
+    assert best.choices[1].lesson_ids == (12,)
+    assert best.choices[2].lesson_ids == (21,)
+
+
+def test_solver_leaves_out_unsolvable_subjects():
+    schedules = {
+        1: schedule("1/0/0", lesson(11, 1, "MON", 9)),
+        2: schedule("1/0/0", lesson(21, 1, "MON", 9, taken=30)),
+    }
+    search = solver(schedules)
+    timetables = search.solve()
+    assert search.unsolvable == [2]
+    assert [set(t.choices) for t in timetables] == [{1}]
+
+
+def test_solver_without_solution():
+    schedules = {
+        1: schedule("1/0/0", lesson(11, 1, "MON", 9)),
+        2: schedule("1/0/0", lesson(21, 1, "MON", 10)),
+    }
+    assert solver(schedules).solve() == []
+
+
+def brute_force(search: TimetableSolver, top_k: int) -> list[float]:
+    subjects = [cands for cands in search.candidates.values() if cands]
+    costs = []
+    for combo in itertools.product(*subjects):
+        if all(
+            not any(
+                day_a == day_b and begin_a < end_b and begin_b < end_a
+                for day_a, begin_a, end_a in a.slots
+                for day_b, begin_b, end_b in b.slots
+            )
+            for a, b in itertools.combinations(combo, 2)
+        ):
+            costs.append(sum(c.cost for c in combo))
+    return sorted(costs)[:top_k]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solver_matches_brute_force(seed):
+    rng = random.Random(seed)
+    days = ("MON", "TUE", "WED")
+    schedules = {}
+    lesson_id = 0
+    for subject_id in range(5):
+        lessons = []
+        for lesson_type in (1, 3):
+            for _ in range(rng.randint(1, 3)):
+                lesson_id += 1
+                lessons.append(
+                    lesson(
+                        lesson_id,
+                        lesson_type,
+                        rng.choice(days),
+                        rng.choice((8, 9, 10.5, 12, 13)),
+                        taken=rng.randint(0, 29),
+                    )
+                )
+        schedules[subject_id] = schedule("1/0/1", *lessons)
+
+    search = solver(schedules, top_k=4)
+    timetables = search.solve()
+    assert search.exhausted
+    assert [t.cost for t in timetables] == pytest.approx(brute_force(search, 4))
+    for timetable in timetables:
+        chosen = list(timetable.choices.values())
+        assert all(
+            not any(
+                x[0] == y[0] and x[1] < y[2] and y[1] < x[2]
+                for x in a.slots
+                for y in b.slots
+            )
+            for a, b in itertools.combinations(chosen, 2)
+        )
+
+
+def test_node_limit_stops_the_search():
+    schedules = {
+        sid: schedule(
+            "1/0/0", *(lesson(sid * 10 + i, 1, "MON", 8 + 2 * i) for i in range(4))
+        )
+        for sid in range(4)
+    }
+    search = solver(schedules, node_limit=3)
+    search.solve()
+    assert not search.exhausted
+    assert search.nodes == 3
+
+
+def test_plan_from_timetables_ranks_distinct_alternatives():
+    schedules = {
+        1: schedule(
+            "1/0/0",
+            lesson(11, 1, "MON", 9),
+            lesson(12, 1, "TUE", 9, taken=10),
+            lesson(13, 1, "WED", 9, taken=20),
+        ),
+        2: schedule("1/0/0", lesson(21, 1, "THU", 9)),
+    }
+    timetables = solver(schedules).solve()
+    assert plan_from_timetables(timetables, alternatives=2) == {
+        1: [[11], [12]],
+        2: [21],
+    }
@@ -0,0 +1,85 @@
+"""Tests of the plan format helpers and the saved plan loader."""
+
+import json
+
+import pytest
+
+from src.utils import storage
+from src.utils.storage import load_saved_plan, make_plan_entry, plan_alternatives
+
+
+@pytest.mark.parametrize(
+    ("entry", "expected"),
+    [
+        ([], []),
+        ([1, 2, 3], [[1, 2, 3]]),
+        ([[1, 2], [3, 4]], [[1, 2], [3, 4]]),
+        ([[1, 2], [], [3]], [[1, 2], [3]]),
+    ],
+)
+def test_plan_alternatives(entry, expected):
+    assert plan_alternatives(entry) == expected
+
+
+def test_plan_alternatives_returns_copies():
+    entry = [[1, 2]]
+    plan_alternatives(entry)[0].append(3)
+    assert entry == [[1, 2]]
+
+
+@pytest.mark.parametrize(
+    ("alternatives", "expected"),
+    [
+        ([[1, 2]], [1, 2]),
+        ([[1, 2], [3]], [[1, 2], [3]]),
+        ([[], [1, 2], []], [1, 2]),
+    ],
+)
+def test_make_plan_entry(alternatives, expected):
+    assert make_plan_entry(alternatives) == expected
+
+
+def test_entries_round_trip():
+    for alternatives in ([[1, 2]], [[1, 2], [3, 4]]):
+        assert plan_alternatives(make_plan_entry(alternatives)) == alternatives
+
+
+@pytest.fixture
+def saved_plan(tmp_path, monkeypatch):
+    path = tmp_path / "saved_plan.json"
+    monkeypatch.setattr(storage, "SAVE_FILE", str(path))
+    return path
+
+
+def test_load_without_saved_plan(saved_plan):
+    assert load_saved_plan() == {}
+
+
+def test_load_round_trips_saved_plan(saved_plan):
+    plan = {101: [1, 2], 102: [[3, 4], [5, 6]]}
+    assert storage.save_plan_to_disk(plan)
+    assert load_saved_plan() == plan
+
+
+def test_load_drops_empty_and_malformed_alternatives(saved_plan):
+    saved_plan.write_text(
+        json.dumps(
+            {
+                "1": [],
+                "2": [[], [5, 6]],
+                "3": [[1, "x"], []],
+                "4": [[7, 8], [9], [True]],
+                "5": 3,
+                "6": [[]],
+            }
+        ),
+        encoding="utf-8",
+    )
+    plan = load_saved_plan()
+    assert plan == {2: [5, 6], 4: [[7, 8], [9]]}
+    assert all(plan_alternatives(entry) for entry in plan.values())
+
+
+def test_load_of_unreadable_file(saved_plan):
+    saved_plan.write_text("{not json", encoding="utf-8")
+    assert load_saved_plan() == {}
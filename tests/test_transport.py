@@ -0,0 +1,106 @@
+"""Tests of the HTTP/1.1 response parser of the raw transport."""
+
+import asyncio
+
+from src.api.transport import _read_response
+
+HELLO = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello"
+
+
+def read_all(raw: bytes, head: bool = False, limit: int = 1024, count: int = 1):
+    """Parse ``count`` consecutive responses out of ``raw``."""
+
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return [await _read_response(reader, head, limit) for _ in range(count)]
+
+    return asyncio.run(read())
+
+
+def read_one(raw: bytes, head: bool = False, limit: int = 1024):
+    return read_all(raw, head, limit)[0]
+
+
+def test_content_length():
+    response = read_one(
+        b"HTTP/1.1 201 Created\r\n"
+        b"Content-Length: 5\r\n"
+        b"Date: Mon, 01 Sep 2025 04:00:00 GMT\r\n"
+        b"Retry-After: 2\r\n"
+        b"\r\n"
+        b"hello"
+    )
+    assert response.status == 201
+    assert response.body == b"hello"
+    assert response.keep_alive
+    assert response.date == "Mon, 01 Sep 2025 04:00:00 GMT"
+    assert response.retry_after == "2"
+
+
+def test_header_names_are_case_insensitive():
+    response = read_one(b"HTTP/1.1 200 OK\r\ncontent-LENGTH:  3\r\n\r\nabc")
+    assert response.body == b"abc"
+
+
+def test_connection_header_controls_keep_alive():
+    assert not read_one(
+        b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"
+    ).keep_alive
+    assert not read_one(b"HTTP/1.0 200 OK\r\nContent-Length: 0\r\n\r\n").keep_alive
+    assert read_one(
+        b"HTTP/1.0 200 OK\r\nConnection: Keep-Alive\r\nContent-Length: 0\r\n\r\n"
+    ).keep_alive
+
+
+def test_chunked_with_extensions_and_trailers():
+    response = read_one(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"\r\n"
+        b"5;name=value\r\nhello\r\n"
+        b"6\r\n world\r\n"
+        b"0\r\n"
+        b"X-Trailer: 1\r\n"
+        b"\r\n"
+    )
+    assert response.body == b"hello world"
+    assert response.keep_alive
+
+
+def test_chunked_body_is_truncated_but_fully_consumed():
+    chunked = (
+        b"HTTP/1.1 500 Internal Server Error\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"\r\n"
+        b"a\r\n0123456789\r\n"
+        b"a\r\nabcdefghij\r\n"
+        b"0\r\n\r\n"
+    )
+    first, second = read_all(chunked + HELLO, limit=12, count=2)
+    assert first.body == b"0123456789ab"
+    assert second.body == b"hello"
+
+
+def test_content_length_body_is_truncated_but_fully_consumed():
+    long = b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 10\r\n\r\n0123456789"
+    first, second = read_all(long + HELLO, limit=5, count=2)
+    assert first.body == b"01234"
+    assert second.body == b"hello"
+
+
+def test_body_without_framing_runs_until_close():
+    response = read_one(b"HTTP/1.1 200 OK\r\n\r\nuntil the end")
+    assert response.body == b"until the end"
+    assert not response.keep_alive
+
+
+def test_responses_without_body():
+    head = read_all(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n" + HELLO, head=True)[
+        0
+    ]
+    assert head.body == b""
+    no_content = read_all(b"HTTP/1.1 204 No Content\r\n\r\n" + HELLO, count=2)
+    assert [r.status for r in no_content] == [204, 200]
+    assert no_content[0].body == b""